@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ConnectionsConfig(AppConfig):
+    name = "connections"
+
+    def ready(self):
+        from . import signals  # noqa: F401
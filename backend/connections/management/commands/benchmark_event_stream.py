@@ -0,0 +1,171 @@
+"""
+Load harness for the event stream: holds many SSE connections open and
+measures connect time, idle database load and event delivery latency.
+Usage: python manage.py benchmark_event_stream [--clients 5000] [--events 200]
+           [--idle 10]
+
+Clients are driven in-process against the ASGI application, so no server
+has to be running; each one subscribes as its own (synthetic) user id.
+Events go through Postgres NOTIFY like real ones.
+"""
+import asyncio
+import random
+import resource
+import statistics
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from sapan.event_stream import TICKET_SALT
+from sapan.events import event_bus, publish
+
+# Far above real user ids, so no real stream receives the test events
+FIRST_USER_ID = 10**12
+
+
+class StreamClient:
+    def __init__(self, app, user_id, host):
+        self.app = app
+        self.user_id = user_id
+        self.host = host
+        self.ready = asyncio.Event()
+        self.closed = asyncio.Event()
+        self.received = {}
+
+    async def run(self):
+        ticket = signing.dumps(self.user_id, salt=TICKET_SALT)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/api/events/stream/",
+            "raw_path": b"/api/events/stream/",
+            "root_path": "",
+            "query_string": f"ticket={ticket}".encode(),
+            "headers": [(b"host", self.host.encode())],
+            "client": ("127.0.0.1", 0),
+            "server": (self.host, 80),
+        }
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await self.closed.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start" and message["status"] != 200:
+                raise CommandError(f"Stream answered {message['status']}")
+            if message["type"] != "http.response.body":
+                return
+            now = time.perf_counter()
+            for line in message.get("body", b"").decode().splitlines():
+                if line == "event: ready":
+                    self.ready.set()
+                elif line.startswith('data: {"seq": '):
+                    self.received[int(line[14:].split("}")[0])] = now
+
+        await self.app(scope, receive, send)
+
+
+class Command(BaseCommand):
+    help = "Holds many event streams open and measures load and latency"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=5000)
+        parser.add_argument("--events", type=int, default=200)
+        parser.add_argument(
+            "--idle",
+            type=float,
+            default=10,
+            help="Seconds to hold the idle streams before sending events",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("The event bus needs PostgreSQL.")
+        asyncio.run(self.run(options["clients"], options["events"], options["idle"]))
+        self.stdout.write(
+            self.style.SUCCESS("Successfully ran event stream benchmark!")
+        )
+
+    async def run(self, count, events, idle):
+        app = get_asgi_application()
+        host = next((h for h in settings.ALLOWED_HOSTS if h != "*"), "localhost")
+        clients = [StreamClient(app, FIRST_USER_ID + i, host) for i in range(count)]
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        backends_before, statements_before = await self.database_load()
+
+        start = time.perf_counter()
+        tasks = [asyncio.create_task(client.run()) for client in clients]
+        await asyncio.gather(*(client.ready.wait() for client in clients))
+        self.stdout.write(
+            f"  connected {count} streams in {time.perf_counter() - start:.2f} s "
+            f"({event_bus.subscription_count} subscriptions)"
+        )
+
+        await asyncio.sleep(idle)
+        backends, statements = await self.database_load()
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        self.stdout.write(
+            f"  idle {idle:.0f} s: {backends - backends_before:+d} database "
+            f"connections, {statements - statements_before} transactions, "
+            f"~{(rss - rss_before) / count:.1f} KiB per stream"
+        )
+
+        sent = {}
+        for seq in range(events):
+            user_id = random.choice(clients).user_id
+            sent[seq] = (user_id, time.perf_counter())
+            await sync_to_async(publish)([user_id], "benchmark", {"seq": seq})
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(1)
+
+        by_user = {client.user_id: client for client in clients}
+        latencies = [
+            (by_user[user_id].received[seq] - sent_at) * 1000
+            for seq, (user_id, sent_at) in sent.items()
+            if seq in by_user[user_id].received
+        ]
+        misdelivered = sum(
+            1
+            for client in clients
+            for seq in client.received
+            if sent[seq][0] != client.user_id
+        )
+        if latencies:
+            latencies.sort()
+            self.stdout.write(
+                f"  events: {len(latencies)}/{events} delivered, "
+                f"{misdelivered} misdelivered, latency p50 "
+                f"{statistics.median(latencies):.1f} ms, p95 "
+                f"{latencies[int(len(latencies) * 0.95) - 1]:.1f} ms, "
+                f"max {latencies[-1]:.1f} ms"
+            )
+
+        for client in clients:
+            client.closed.set()
+        await asyncio.gather(*tasks)
+        self.stdout.write(
+            f"  disconnected: {event_bus.subscription_count} subscriptions left"
+        )
+
+    @sync_to_async
+    def database_load(self):
+        """(open connections, committed transactions) for this database."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT numbackends, xact_commit FROM pg_stat_database "
+                "WHERE datname = current_database()"
+            )
+            return cursor.fetchone()
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('connections', '0003_add_intent_to_connection'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['from_user', '-created_at', 'id'], name='conn_from_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['to_user', '-created_at', 'id'], name='conn_to_created_idx'),
+        ),
+    ]
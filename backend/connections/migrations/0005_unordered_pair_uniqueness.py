@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:29
+
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Keep one request per unordered pair: an accepted one if any, else the newest
+DEDUPLICATE_SQL = """
+    DELETE FROM connections_connectionrequest WHERE id IN (
+        SELECT id FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY
+                    LEAST(from_user_id, to_user_id),
+                    GREATEST(from_user_id, to_user_id)
+                ORDER BY status = 'accepted' DESC, created_at DESC, id DESC
+            ) AS rank
+            FROM connections_connectionrequest
+        ) AS ranked
+        WHERE rank > 1
+    )
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('connections', '0004_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='connectionrequest',
+            unique_together=set(),
+        ),
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['to_user', 'status'], name='conn_to_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['from_user', 'status'], name='conn_from_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['status', 'responded_at'], name='conn_status_responded_idx'),
+        ),
+        migrations.RunSQL(
+            sql=DEDUPLICATE_SQL,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name='connectionrequest',
+            constraint=models.UniqueConstraint(django.db.models.functions.comparison.Least('from_user', 'to_user'), django.db.models.functions.comparison.Greatest('from_user', 'to_user'), name='unique_connection_pair'),
+        ),
+    ]
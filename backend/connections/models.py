@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Greatest, Least
 from django.conf import settings
 
 
@@ -33,7 +34,33 @@ class ConnectionRequest(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
-        unique_together = ["from_user", "to_user"]
+        constraints = [
+            # One request per pair of users, whichever way it was sent
+            models.UniqueConstraint(
+                Least("from_user", "to_user"),
+                Greatest("from_user", "to_user"),
+                name="unique_connection_pair",
+            ),
+        ]
+        indexes = [
+            # Keyset pagination of sent/received lists on (-created_at, id)
+            models.Index(
+                fields=["from_user", "-created_at", "id"],
+                name="conn_from_created_idx",
+            ),
+            models.Index(
+                fields=["to_user", "-created_at", "id"],
+                name="conn_to_created_idx",
+            ),
+            # Pending/accepted lookups per user, recent acceptances
+            models.Index(fields=["to_user", "status"], name="conn_to_status_idx"),
+            models.Index(
+                fields=["from_user", "status"], name="conn_from_status_idx"
+            ),
+            models.Index(
+                fields=["status", "responded_at"], name="conn_status_responded_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.from_user.email} → {self.to_user.email} ({self.status})"
@@ -1,11 +1,28 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from sapan.sparse_fields import SparseFieldsetSerializerMixin
 from .models import ConnectionRequest
+from .services.connection_graph import get_viewer_graph
+from .services.connection_requests import create_connection_request
 
 User = get_user_model()
 
 
+# What get_profile / get_profile_id read, for the values() fast path
+PROFILE_SOURCES = [
+    "user_type",
+    "founder_profile__id",
+    "founder_profile__startup_name",
+    "founder_profile__stage",
+    "founder_profile__industry__name",
+    "mentor_profile__id",
+    "mentor_profile__company",
+    "mentor_profile__role",
+    "mentor_profile__years_of_experience",
+]
+
+
 class UserConnectionSerializer(serializers.ModelSerializer):
     profile = serializers.SerializerMethodField()
     profile_id = serializers.SerializerMethodField()
@@ -23,6 +40,7 @@ class UserConnectionSerializer(serializers.ModelSerializer):
             "profile",
             "profile_id",
         ]
+        values_sources = {"profile": PROFILE_SOURCES, "profile_id": PROFILE_SOURCES}
 
     def get_profile(self, obj):
         if obj.user_type == "founder" and hasattr(obj, "founder_profile"):
@@ -51,7 +69,9 @@ class UserConnectionSerializer(serializers.ModelSerializer):
         return None
 
 
-class ConnectionRequestSerializer(serializers.ModelSerializer):
+class ConnectionRequestSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     from_user_detail = UserConnectionSerializer(source="from_user", read_only=True)
     to_user_detail = UserConnectionSerializer(source="to_user", read_only=True)
     intent_display = serializers.CharField(source="get_intent_display", read_only=True)
@@ -90,26 +110,60 @@ class ConnectionRequestCreateSerializer(serializers.ModelSerializer):
                 "This user has not completed their profile."
             )
         # Check for existing request in either direction
-        if ConnectionRequest.objects.filter(
-            from_user=request.user, to_user=value
-        ).exists():
+        graph = get_viewer_graph(request)
+        if graph.has_sent_to(value.pk):
             raise serializers.ValidationError(
                 "You have already sent a request to this user."
             )
-        if ConnectionRequest.objects.filter(
-            from_user=value, to_user=request.user
-        ).exists():
+        if graph.has_received_from(value.pk):
             raise serializers.ValidationError(
                 "This user has already sent you a request."
             )
         return value
 
     def create(self, validated_data):
-        validated_data["from_user"] = self.context["request"].user
-        return super().create(validated_data)
+        user = self.context["request"].user
+        connection_request, created = create_connection_request(
+            from_user=user, **validated_data
+        )
+        if not created:
+            # Lost a race with a concurrent send between the same pair
+            received = (
+                connection_request is not None
+                and connection_request.to_user_id == user.pk
+            )
+            if received:
+                message = "This user has already sent you a request."
+            else:
+                message = "You have already sent a request to this user."
+            raise serializers.ValidationError({"to_user": [message]})
+        return connection_request
+
+
+class SuggestedConnectionSerializer(serializers.Serializer):
+    """A second-degree contact: the user and how many connections they share."""
+
+    user = UserConnectionSerializer(read_only=True)
+    mutual_count = serializers.IntegerField(read_only=True)
+
+
+class BulkRespondSerializer(serializers.Serializer):
+    """Input for answering several received requests at once."""
 
+    MAX_IDS = 100
 
-class ConnectionSerializer(serializers.ModelSerializer):
+    action = serializers.ChoiceField(choices=["accept", "decline"])
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_IDS,
+    )
+
+    def validate_ids(self, value):
+        return list(dict.fromkeys(value))
+
+
+class ConnectionSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     connected_user = serializers.SerializerMethodField()
     connected_at = serializers.DateTimeField(source="responded_at")
 
@@ -177,14 +231,19 @@ class TownhallConnectionSerializer(serializers.ModelSerializer):
             base["profile_id"] = profile.id
         return base
 
-    def get_from_user_detail(self, obj):
+    def _shows_full_profiles(self):
+        # Set explicitly when prerendering the feed variants without a request
+        if "full_profiles" in self.context:
+            return self.context["full_profiles"]
         request = self.context.get("request")
-        if request and request.user and request.user.is_authenticated:
+        return bool(request and request.user and request.user.is_authenticated)
+
+    def get_from_user_detail(self, obj):
+        if self._shows_full_profiles():
             return self._get_full_profile(obj.from_user)
         return self._get_anonymous_profile(obj.from_user)
 
     def get_to_user_detail(self, obj):
-        request = self.context.get("request")
-        if request and request.user and request.user.is_authenticated:
+        if self._shows_full_profiles():
             return self._get_full_profile(obj.to_user)
         return self._get_anonymous_profile(obj.to_user)
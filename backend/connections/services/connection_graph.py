@@ -0,0 +1,188 @@
+"""
+Per-user connection graph.
+Each user's adjacency (accepted connections, pending requests in and out,
+declined requests) is cached as one entry keyed by the other user's id, so
+relationship checks are dictionary lookups instead of
+Q(from_user=...) | Q(to_user=...) queries against ConnectionRequest.
+
+Entries are built lazily on first use and dropped when one of the user's
+requests is saved or deleted (see connections.signals). Updates that bypass
+model signals (queryset.update, bulk_create) must call forget_requests() or
+forget_graphs(); CONNECTION_GRAPH_TIMEOUT bounds how long a missed update
+can be served. The cache must be shared by all workers (see CACHES).
+
+Forgetting a graph also stamps the user with a new version, and entries are
+stored with the version read before they were built. A build that read the
+database before a change committed may store its entry after the change
+dropped the old one; the version no longer matches, so readers ignore it.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from connections.models import ConnectionRequest
+
+CACHE_KEY = "connections:graph:{}"
+VERSION_KEY = "connections:graph:{}:version"
+
+
+class ConnectionGraph:
+    """
+    One user's connections: other user id -> (request id, status, outgoing),
+    where outgoing means the request was sent by this user.
+    """
+
+    def __init__(self, user_id, edges):
+        self.user_id = user_id
+        self.edges = edges
+
+    @classmethod
+    def build(cls, user_id):
+        return cls.build_many([user_id])[user_id]
+
+    @classmethod
+    def build_many(cls, user_ids):
+        """{user_id: graph} for `user_ids`, from one query."""
+        user_ids = set(user_ids)
+        rows = (
+            ConnectionRequest.objects.filter(
+                Q(from_user_id__in=user_ids) | Q(to_user_id__in=user_ids)
+            )
+            .order_by("created_at", "id")
+            .values_list("id", "from_user_id", "to_user_id", "status")
+        )
+        edges = {user_id: {} for user_id in user_ids}
+        for request_id, from_user_id, to_user_id, status in rows:
+            # The newest request between a pair wins
+            if from_user_id in edges:
+                edges[from_user_id][to_user_id] = (request_id, status, True)
+            if to_user_id in edges:
+                edges[to_user_id][from_user_id] = (request_id, status, False)
+        return {user_id: cls(user_id, edges[user_id]) for user_id in user_ids}
+
+    def status(self, user_id):
+        """Status of the request between this user and `user_id`, or None."""
+        edge = self.edges.get(user_id)
+        return edge[1] if edge else None
+
+    def is_connected(self, user_id) -> bool:
+        return self.status(user_id) == "accepted"
+
+    def has_sent_to(self, user_id) -> bool:
+        edge = self.edges.get(user_id)
+        return edge is not None and edge[2]
+
+    def has_received_from(self, user_id) -> bool:
+        edge = self.edges.get(user_id)
+        return edge is not None and not edge[2]
+
+    def user_ids(self, status, outgoing=None):
+        """Ids of users with a request in `status`, optionally one direction only."""
+        return {
+            other_id
+            for other_id, (_, edge_status, edge_outgoing) in self.edges.items()
+            if edge_status == status and outgoing in (None, edge_outgoing)
+        }
+
+    def request_ids(self, status):
+        return [
+            request_id
+            for request_id, edge_status, _ in self.edges.values()
+            if edge_status == status
+        ]
+
+    def mutual_count(self, other) -> int:
+        """Number of users both this user and `other` are connected to."""
+        # Walk the smaller adjacency, look up in the larger one
+        small, large = sorted((self, other), key=lambda graph: len(graph.edges))
+        return sum(
+            1
+            for other_id, (_, status, _) in small.edges.items()
+            if status == "accepted" and large.is_connected(other_id)
+        )
+
+    @property
+    def accepted(self):
+        return self.user_ids("accepted")
+
+    @property
+    def pending_in(self):
+        return self.user_ids("pending", outgoing=False)
+
+    @property
+    def pending_out(self):
+        return self.user_ids("pending", outgoing=True)
+
+    @property
+    def declined(self):
+        return self.user_ids("declined")
+
+
+def get_connection_graph(user_id):
+    """The user's graph from the shared cache, built on a miss."""
+    return get_connection_graphs([user_id])[user_id]
+
+
+def get_connection_graphs(user_ids):
+    """{user_id: graph} from the shared cache; misses are built in one query."""
+    user_ids = set(user_ids)
+    values = cache.get_many(
+        [CACHE_KEY.format(user_id) for user_id in user_ids]
+        + [VERSION_KEY.format(user_id) for user_id in user_ids]
+    )
+
+    graphs, missing = {}, {}
+    for user_id in user_ids:
+        entry = values.get(CACHE_KEY.format(user_id))
+        version = values.get(VERSION_KEY.format(user_id))
+        if entry is not None and entry[0] == version:
+            graphs[user_id] = ConnectionGraph(user_id, entry[1])
+        else:
+            missing[user_id] = version
+
+    if missing:
+        built = ConnectionGraph.build_many(missing)
+        cache.set_many(
+            {
+                CACHE_KEY.format(user_id): (missing[user_id], graph.edges)
+                for user_id, graph in built.items()
+            },
+            settings.CONNECTION_GRAPH_TIMEOUT,
+        )
+        graphs.update(built)
+    return graphs
+
+
+def get_viewer_graph(request):
+    """
+    The requesting user's graph, loaded once per request;
+    None without a request or for anonymous users.
+    """
+    if request is None or not request.user.is_authenticated:
+        return None
+    graph = getattr(request, "_connection_graph", None)
+    if graph is None:
+        graph = get_connection_graph(request.user.pk)
+        request._connection_graph = graph
+    return graph
+
+
+def forget_graphs(user_ids):
+    """Drop the users' cached graphs; call after their requests change."""
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    version = time.time_ns()
+    cache.set_many({VERSION_KEY.format(user_id): version for user_id in user_ids}, None)
+    cache.delete_many([CACHE_KEY.format(user_id) for user_id in user_ids])
+
+
+def forget_requests(connection_requests):
+    """Drop both users' cached graphs for saved or deleted requests."""
+    forget_graphs(
+        user_id
+        for request in connection_requests
+        for user_id in (request.from_user_id, request.to_user_id)
+    )
@@ -0,0 +1,83 @@
+"""
+Race-free creation of connection requests.
+A pair of users has at most one request between them, whichever way it was
+sent (the unique_connection_pair index on LEAST/GREATEST of the two ids).
+The insert claims the pair with INSERT ... ON CONFLICT DO NOTHING, so two
+concurrent sends, in the same or opposite directions, can't both succeed or
+fail with an IntegrityError.
+"""
+from django.db import connection, transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from connections.models import ConnectionRequest
+
+INSERT_SQL = """
+    INSERT INTO connections_connectionrequest
+        (from_user_id, to_user_id, message, intent, status, created_at)
+    VALUES (%s, %s, %s, %s, 'pending', %s)
+    ON CONFLICT (
+        (LEAST(from_user_id, to_user_id)), (GREATEST(from_user_id, to_user_id))
+    ) DO NOTHING
+    RETURNING id
+"""
+
+
+def connection_request_event(connection_request, event_type):
+    """(user ids, event type, data) announcing a change to `connection_request`."""
+    return (
+        [connection_request.from_user_id, connection_request.to_user_id],
+        event_type,
+        {
+            "id": connection_request.pk,
+            "from_user": connection_request.from_user_id,
+            "to_user": connection_request.to_user_id,
+            "status": connection_request.status,
+        },
+    )
+
+
+def create_connection_request(from_user, to_user, **fields):
+    """
+    Insert a pending request from `from_user` to `to_user`. Returns
+    (request, True), or (existing request between the pair, False).
+    """
+    connection_request = ConnectionRequest(
+        from_user=from_user,
+        to_user=to_user,
+        status="pending",
+        created_at=timezone.now(),
+        **fields,
+    )
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                INSERT_SQL,
+                [
+                    from_user.pk,
+                    to_user.pk,
+                    connection_request.message,
+                    connection_request.intent,
+                    connection_request.created_at,
+                ],
+            )
+            row = cursor.fetchone()
+
+        if row is None:
+            existing = ConnectionRequest.objects.filter(
+                from_user__in=[from_user, to_user], to_user__in=[from_user, to_user]
+            ).first()
+            return existing, False
+
+        connection_request.pk = row[0]
+        connection_request._state.adding = False
+        # The raw insert skips Model.save(); notify receivers as save() would
+        post_save.send(
+            sender=ConnectionRequest,
+            instance=connection_request,
+            created=True,
+            update_fields=None,
+            raw=False,
+            using=connection.alias,
+        )
+    return connection_request, True
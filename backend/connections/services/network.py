@@ -0,0 +1,93 @@
+"""
+Second-degree network over accepted connections.
+Mutual counts for a page of users come from one query: the page users'
+accepted connections, each checked against the viewer through the
+unique_connection_pair index. "People you may know" are set operations on
+the per-user connection graphs (see connection_graph), loaded in one cache
+round trip. Either way the cost depends on the page and on the adjacency
+sizes involved, not on the total number of connections.
+"""
+import heapq
+from collections import Counter
+
+from django.db.models import Exists, OuterRef, Q, Value
+from django.db.models.functions import Greatest, Least
+
+from connections.models import ConnectionRequest
+from connections.services.connection_graph import get_connection_graphs
+
+# Suggestions look at the connections of at most this many of the viewer's
+# (most recent) connections
+SUGGESTION_SOURCES = 200
+
+
+def _connected_to(user_id, field):
+    # Whether `user_id` and the outer row's `field` user are connected,
+    # written against the expressions unique_connection_pair indexes
+    return Exists(
+        ConnectionRequest.objects.alias(
+            low=Least("from_user_id", "to_user_id"),
+            high=Greatest("from_user_id", "to_user_id"),
+        ).filter(
+            low=Least(Value(user_id), OuterRef(field)),
+            high=Greatest(Value(user_id), OuterRef(field)),
+            status="accepted",
+        )
+    )
+
+
+def mutual_counts(graph, user_ids):
+    """{user_id: number of mutual connections with the viewer's `graph`}."""
+    counts = dict.fromkeys(user_ids, 0)
+    if graph is None or not graph.accepted:
+        return counts
+    page = set(user_ids) - {graph.user_id}
+    if not page:
+        return counts
+
+    viewer_id = graph.user_id
+    rows = (
+        ConnectionRequest.objects.filter(
+            Q(from_user_id__in=page) | Q(to_user_id__in=page), status="accepted"
+        )
+        .annotate(
+            from_connected=_connected_to(viewer_id, "from_user_id"),
+            to_connected=_connected_to(viewer_id, "to_user_id"),
+        )
+        .filter(Q(from_connected=True) | Q(to_connected=True))
+        .order_by()
+        .values_list("from_user_id", "to_user_id", "from_connected", "to_connected")
+    )
+    for from_user_id, to_user_id, from_connected, to_connected in rows:
+        # A request between two page users can count for both of them
+        if from_user_id in page and to_connected:
+            counts[from_user_id] += 1
+        if to_user_id in page and from_connected:
+            counts[to_user_id] += 1
+    return counts
+
+
+def suggested_connections(graph, limit):
+    """
+    Up to `limit` (user_id, mutual_count) pairs of second-degree contacts:
+    users the viewer has no request with, most mutual connections first.
+    """
+    sources = sorted(
+        (
+            (request_id, other_id)
+            for other_id, (request_id, status, _) in graph.edges.items()
+            if status == "accepted"
+        ),
+        reverse=True,
+    )[:SUGGESTION_SOURCES]
+
+    counts = Counter()
+    graphs = get_connection_graphs([other_id for _, other_id in sources])
+    for source in graphs.values():
+        counts.update(source.accepted)
+
+    # Already connected, pending or declined: nothing to suggest
+    for user_id in [graph.user_id, *graph.edges]:
+        counts.pop(user_id, None)
+    # Ties go to the lower (older) user id, so pages are stable
+    return heapq.nsmallest(limit, counts.items(), key=lambda item: (-item[1], item[0]))
@@ -0,0 +1,65 @@
+"""
+Answering many connection requests at once.
+The batch is one UPDATE ... RETURNING on the user's pending requests. That
+skips model signals, so the side effects of connections.signals (graph
+caches, townhall feed, events) are applied here, once per batch instead of
+once per row.
+"""
+from django.db import connection, transaction
+from django.utils import timezone
+
+from connections.models import ConnectionRequest
+from connections.services.connection_graph import forget_requests
+from connections.services.connection_requests import connection_request_event
+from connections.services.townhall import refresh_townhall_feed
+from sapan.events import publish_many
+
+RESPOND_SQL = """
+    UPDATE connections_connectionrequest
+    SET status = %s, responded_at = %s
+    WHERE to_user_id = %s AND status = 'pending' AND id = ANY(%s)
+    RETURNING id, from_user_id
+"""
+
+
+def respond_to_requests(user, ids, status):
+    """
+    Set `user`'s pending requests among `ids` to `status` ("accepted" or
+    "declined"). Returns {id: outcome}: `status` for the answered requests,
+    "already_<status>" for ones answered before, "not_found" for the rest.
+    """
+    responded_at = timezone.now()
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(RESPOND_SQL, [status, responded_at, user.pk, list(ids)])
+            answered = [
+                ConnectionRequest(
+                    pk=request_id,
+                    from_user_id=from_user_id,
+                    to_user_id=user.pk,
+                    status=status,
+                    responded_at=responded_at,
+                )
+                for request_id, from_user_id in cursor.fetchall()
+            ]
+
+        outcomes = dict.fromkeys(ids, "not_found")
+        outcomes.update(
+            (request_id, f"already_{request_status}")
+            for request_id, request_status in ConnectionRequest.objects.filter(
+                pk__in=set(ids) - {request.pk for request in answered},
+                to_user=user,
+            ).values_list("id", "status")
+        )
+        outcomes.update((request.pk, status) for request in answered)
+
+        if answered:
+            # What the post_save receivers would do per row, once for the batch
+            publish_many(
+                connection_request_event(request, f"connection_request.{status}")
+                for request in answered
+            )
+            transaction.on_commit(lambda: forget_requests(answered))
+            if status == "accepted":
+                transaction.on_commit(refresh_townhall_feed)
+    return outcomes
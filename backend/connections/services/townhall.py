@@ -0,0 +1,71 @@
+"""
+Precomputed townhall feed.
+The recent-connections feed is the same for every guest and for every
+member, so both variants are rendered once and kept in the shared cache.
+They are rebuilt when a request is accepted (see connections.signals) and
+otherwise expire after TOWNHALL_FEED_TIMEOUT, which bounds how long profile
+edits take to show up.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from connections.models import ConnectionRequest
+from connections.serializers import TownhallConnectionSerializer
+
+CACHE_KEY = "connections:townhall"
+FEED_WINDOW = timedelta(days=7)
+FEED_SIZE = 10
+
+# Variant -> whether it shows names and profiles
+VARIANTS = {"public": False, "members": True}
+
+
+def build_townhall_feed():
+    """Render both variants from one query: {variant: [items]}."""
+    connections = list(
+        ConnectionRequest.objects.filter(
+            status="accepted", responded_at__gte=timezone.now() - FEED_WINDOW
+        )
+        .select_related(
+            "from_user",
+            "to_user",
+            "from_user__founder_profile",
+            "from_user__founder_profile__industry",
+            "from_user__mentor_profile",
+            "to_user__founder_profile",
+            "to_user__founder_profile__industry",
+            "to_user__mentor_profile",
+        )
+        .order_by("-responded_at")[:FEED_SIZE]
+    )
+    return {
+        variant: TownhallConnectionSerializer(
+            connections, many=True, context={"full_profiles": full_profiles}
+        ).data
+        for variant, full_profiles in VARIANTS.items()
+    }
+
+
+def refresh_townhall_feed():
+    feed = build_townhall_feed()
+    cache.set(CACHE_KEY, feed, settings.TOWNHALL_FEED_TIMEOUT)
+    return feed
+
+
+def get_townhall_feed(variant):
+    """The cached `variant` items, without those that left the window since."""
+    feed = cache.get(CACHE_KEY)
+    if feed is None:
+        feed = refresh_townhall_feed()
+    # Items are newest first, so dropping expired ones from the tail gives the
+    # same page a fresh query would
+    cutoff = timezone.now() - FEED_WINDOW
+    return [
+        item
+        for item in feed[variant]
+        if parse_datetime(item["connected_at"]) >= cutoff
+    ]
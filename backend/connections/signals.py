@@ -0,0 +1,35 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from sapan.events import publish
+
+from .models import ConnectionRequest
+from .services.connection_graph import forget_requests
+from .services.connection_requests import connection_request_event
+from .services.townhall import refresh_townhall_feed
+
+
+@receiver(post_save, sender=ConnectionRequest)
+@receiver(post_delete, sender=ConnectionRequest)
+def forget_connection_graphs(sender, instance, **kwargs):
+    # After commit, so rebuilt graphs see the change
+    transaction.on_commit(lambda: forget_requests([instance]))
+
+
+@receiver(post_save, sender=ConnectionRequest)
+@receiver(post_delete, sender=ConnectionRequest)
+def refresh_townhall(sender, instance, **kwargs):
+    if instance.status == "accepted":
+        transaction.on_commit(refresh_townhall_feed)
+
+
+@receiver(post_save, sender=ConnectionRequest)
+def publish_connection_event(sender, instance, created, **kwargs):
+    if created:
+        event_type = "connection_request.created"
+    elif instance.status in ("accepted", "declined"):
+        event_type = f"connection_request.{instance.status}"
+    else:
+        return
+    publish(*connection_request_event(instance, event_type))
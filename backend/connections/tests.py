@@ -0,0 +1,305 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import ConnectionRequest
+from .services.connection_requests import create_connection_request
+
+User = get_user_model()
+
+
+class ConcurrentConnectionRequestTests(TransactionTestCase):
+    """
+    Concurrent sends between the same pair, in both directions, leave one
+    request: one send creates it and the others get it back.
+    """
+
+    senders = 8
+    rounds = 5
+
+    def _user(self, name):
+        return User.objects.create_user(
+            email=f"{name}@example.com",
+            username=name,
+            password="secret",
+            user_type="founder",
+        )
+
+    def _race(self, first, second):
+        barrier = threading.Barrier(self.senders)
+        outcomes, errors = [], []
+
+        def send(from_user, to_user):
+            try:
+                barrier.wait()
+                outcomes.append(create_connection_request(from_user, to_user))
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(
+                target=send, args=(first, second) if i % 2 else (second, first)
+            )
+            for i in range(self.senders)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        return outcomes
+
+    def test_one_request_per_pair(self):
+        for index in range(self.rounds):
+            first = self._user(f"first{index}")
+            second = self._user(f"second{index}")
+            outcomes = self._race(first, second)
+
+            stored = ConnectionRequest.objects.filter(
+                from_user__in=[first, second], to_user__in=[first, second]
+            )
+            self.assertEqual(stored.count(), 1)
+            self.assertEqual(sum(created for _, created in outcomes), 1)
+            self.assertEqual({request.pk for request, _ in outcomes}, {stored.get().pk})
+
+
+class ConnectionListTests(TestCase):
+    """The list reads the cached graph, which follows accepted requests."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer, cls.mentor, cls.founder, cls.stranger = [
+            User.objects.create_user(
+                email=f"{name}@example.com",
+                username=name,
+                password="secret",
+                user_type=user_type,
+                is_approved=True,
+            )
+            for name, user_type in [
+                ("viewer", "founder"),
+                ("mentor", "mentor"),
+                ("founder", "founder"),
+                ("stranger", "founder"),
+            ]
+        ]
+        cls.accepted = ConnectionRequest.objects.create(
+            from_user=cls.mentor, to_user=cls.viewer, status="accepted"
+        )
+        cls.pending = ConnectionRequest.objects.create(
+            from_user=cls.founder, to_user=cls.viewer
+        )
+        ConnectionRequest.objects.create(
+            from_user=cls.mentor, to_user=cls.stranger, status="accepted"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def _listed(self):
+        response = self.client.get("/api/connections/")
+        self.assertEqual(response.status_code, 200)
+        return sorted(request["id"] for request in response.json()["results"])
+
+    def test_accepting_updates_the_cached_list(self):
+        self.assertEqual(self._listed(), [self.accepted.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/api/connections/request/{self.pending.pk}/accept/"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._listed(), [self.accepted.pk, self.pending.pk])
+
+
+class TownhallFeedTests(TestCase):
+    """
+    Guests and members get their variant of the cached feed, which is
+    rebuilt when a request is accepted.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.mentor, cls.founder, cls.other = [
+            User.objects.create_user(
+                email=f"{name}@example.com",
+                username=name,
+                password="secret",
+                first_name=name.title(),
+                user_type=user_type,
+                is_approved=True,
+            )
+            for name, user_type in [
+                ("mentor", "mentor"),
+                ("founder", "founder"),
+                ("other", "founder"),
+            ]
+        ]
+        cls.accepted = ConnectionRequest.objects.create(
+            from_user=cls.founder,
+            to_user=cls.mentor,
+            status="accepted",
+            responded_at=timezone.now(),
+        )
+        cls.pending = ConnectionRequest.objects.create(
+            from_user=cls.other, to_user=cls.mentor
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def _feed(self, user=None):
+        self.client.force_authenticate(user)
+        response = self.client.get("/api/connections/recent/")
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_variants(self):
+        public = self._feed()
+        self.assertIn("public", public["Cache-Control"])
+        self.assertEqual(
+            public.json(),
+            [
+                {
+                    "id": self.accepted.pk,
+                    "from_user_detail": {"type": "founder", "description": "A founder"},
+                    "to_user_detail": {"type": "mentor", "description": "A mentor"},
+                    "connected_at": public.json()[0]["connected_at"],
+                }
+            ],
+        )
+
+        members = self._feed(self.other)
+        self.assertIn("private", members["Cache-Control"])
+        [item] = members.json()
+        self.assertEqual(item["from_user_detail"]["first_name"], "Founder")
+        self.assertEqual(item["to_user_detail"]["first_name"], "Mentor")
+
+    def test_accepting_refreshes_both_variants(self):
+        self._feed()  # Warm the cached feed
+
+        self.client.force_authenticate(self.mentor)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/api/connections/request/{self.pending.pk}/accept/"
+            )
+        self.assertEqual(response.status_code, 200)
+
+        for user in (None, self.founder):
+            with self.subTest(member=user is not None):
+                self.assertEqual(
+                    [item["id"] for item in self._feed(user).json()],
+                    [self.pending.pk, self.accepted.pk],
+                )
+
+
+class BulkRespondTests(TestCase):
+    """
+    One call answers the viewer's pending requests among the ids and reports
+    the rest, then refreshes what the per-request views would.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.mentor, cls.first, cls.second, cls.third, cls.other = [
+            User.objects.create_user(
+                email=f"{name}@example.com",
+                username=name,
+                password="secret",
+                user_type=user_type,
+                is_approved=True,
+            )
+            for name, user_type in [
+                ("mentor", "mentor"),
+                ("first", "founder"),
+                ("second", "founder"),
+                ("third", "founder"),
+                ("other", "mentor"),
+            ]
+        ]
+        cls.pending = [
+            ConnectionRequest.objects.create(from_user=founder, to_user=cls.mentor)
+            for founder in (cls.first, cls.second)
+        ]
+        cls.declined = ConnectionRequest.objects.create(
+            from_user=cls.third, to_user=cls.mentor, status="declined"
+        )
+        # Sent by the mentor, so not theirs to answer
+        cls.sent = ConnectionRequest.objects.create(
+            from_user=cls.mentor, to_user=cls.other
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.mentor)
+
+    def _respond(self, action, ids):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                "/api/connections/requests/bulk/",
+                {"action": action, "ids": ids},
+                format="json",
+            )
+
+    def test_outcomes(self):
+        first, second = self.pending
+        # Warm the mentor's cached graph and the townhall feed
+        self.assertEqual(self.client.get("/api/connections/").json()["results"], [])
+        self.assertEqual(self.client.get("/api/connections/recent/").json(), [])
+
+        response = self._respond(
+            "accept", [first.pk, self.declined.pk, self.sent.pk, 999999, first.pk]
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {"id": first.pk, "outcome": "accepted"},
+                {"id": self.declined.pk, "outcome": "already_declined"},
+                {"id": self.sent.pk, "outcome": "not_found"},
+                {"id": 999999, "outcome": "not_found"},
+            ],
+        )
+        first.refresh_from_db()
+        self.assertEqual(first.status, "accepted")
+        self.assertIsNotNone(first.responded_at)
+        self.sent.refresh_from_db()
+        self.assertEqual(self.sent.status, "pending")
+
+        listed = self.client.get("/api/connections/").json()["results"]
+        self.assertEqual([request["id"] for request in listed], [first.pk])
+        feed = self.client.get("/api/connections/recent/").json()
+        self.assertEqual([item["id"] for item in feed], [first.pk])
+
+        response = self._respond("decline", [first.pk, second.pk])
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {"id": first.pk, "outcome": "already_accepted"},
+                {"id": second.pk, "outcome": "declined"},
+            ],
+        )
+
+    def test_validation(self):
+        cases = {
+            "no ids": {"action": "accept", "ids": []},
+            "unknown action": {"action": "ignore", "ids": [self.pending[0].pk]},
+            "too many ids": {"action": "accept", "ids": list(range(1, 102))},
+        }
+        for name, payload in cases.items():
+            with self.subTest(name):
+                response = self.client.post(
+                    "/api/connections/requests/bulk/", payload, format="json"
+                )
+                self.assertEqual(response.status_code, 400)
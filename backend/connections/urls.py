@@ -6,6 +6,8 @@ from .views import (
     SendRequestView,
     AcceptRequestView,
     DeclineRequestView,
+    BulkRespondView,
+    SuggestedConnectionsView,
     RecentConnectionsView,
 )
 
@@ -16,6 +18,11 @@ urlpatterns = [
         RecentConnectionsView.as_view(),
         name="recent-connections",
     ),
+    path(
+        "connections/suggestions/",
+        SuggestedConnectionsView.as_view(),
+        name="suggested-connections",
+    ),
     path(
         "connections/requests/sent/", SentRequestsView.as_view(), name="sent-requests"
     ),
@@ -24,6 +31,9 @@ urlpatterns = [
         ReceivedRequestsView.as_view(),
         name="received-requests",
     ),
+    path(
+        "connections/requests/bulk/", BulkRespondView.as_view(), name="bulk-respond"
+    ),
     path("connections/request/", SendRequestView.as_view(), name="send-request"),
     path(
         "connections/request/<int:pk>/accept/",
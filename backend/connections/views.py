@@ -2,64 +2,91 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.utils import timezone
-from django.db.models import Q
-from datetime import timedelta
+from django.utils.cache import patch_cache_control, patch_vary_headers
 
+from sapan.fast_serialization import ValuesListMixin
+from sapan.sparse_fields import SparseFieldsetViewMixin
 from .models import ConnectionRequest
+from .services.connection_graph import get_viewer_graph
+from .services.network import suggested_connections
+from .services.request_responses import respond_to_requests
+from .services.townhall import get_townhall_feed
 from .serializers import (
+    BulkRespondSerializer,
     ConnectionRequestSerializer,
     ConnectionRequestCreateSerializer,
     ConnectionSerializer,
-    TownhallConnectionSerializer,
+    SuggestedConnectionSerializer,
 )
 
+User = get_user_model()
 
-class ConnectionListView(generics.ListAPIView):
+SUGGESTIONS_DEFAULT_LIMIT = 10
+SUGGESTIONS_MAX_LIMIT = 50
+
+# Relations read by UserConnectionSerializer for each side of a request
+FROM_USER_RELATED = [
+    "from_user",
+    "from_user__founder_profile__industry",
+    "from_user__mentor_profile",
+]
+TO_USER_RELATED = [
+    "to_user",
+    "to_user__founder_profile__industry",
+    "to_user__mentor_profile",
+]
+
+
+class ConnectionListView(SparseFieldsetViewMixin, generics.ListAPIView):
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ("-created_at", "id")
     serializer_class = ConnectionSerializer
+    sparse_related = {"connected_user": FROM_USER_RELATED + TO_USER_RELATED}
 
     def get_queryset(self):
-        user = self.request.user
-        return ConnectionRequest.objects.filter(
-            Q(from_user=user) | Q(to_user=user), status="accepted"
-        ).select_related(
-            "from_user",
-            "to_user",
-            "from_user__founder_profile",
-            "from_user__mentor_profile",
-            "to_user__founder_profile",
-            "to_user__mentor_profile",
+        # Primary key lookups for the viewer's accepted requests
+        graph = get_viewer_graph(self.request)
+        return self.select_sparse_related(
+            ConnectionRequest.objects.filter(pk__in=graph.request_ids("accepted"))
         )
 
 
-class SentRequestsView(generics.ListAPIView):
+class SentRequestsView(
+    ValuesListMixin, SparseFieldsetViewMixin, generics.ListAPIView
+):
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ("-created_at", "id")
     serializer_class = ConnectionRequestSerializer
+    sparse_related = {
+        "from_user_detail": FROM_USER_RELATED,
+        "to_user_detail": TO_USER_RELATED,
+    }
 
     def get_queryset(self):
-        return ConnectionRequest.objects.filter(
-            from_user=self.request.user
-        ).select_related(
-            "from_user",
-            "to_user",
-            "to_user__founder_profile",
-            "to_user__mentor_profile",
+        return self.select_sparse_related(
+            ConnectionRequest.objects.filter(from_user=self.request.user)
         )
 
 
-class ReceivedRequestsView(generics.ListAPIView):
+class ReceivedRequestsView(
+    ValuesListMixin, SparseFieldsetViewMixin, generics.ListAPIView
+):
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ("-created_at", "id")
     serializer_class = ConnectionRequestSerializer
+    sparse_related = {
+        "from_user_detail": FROM_USER_RELATED,
+        "to_user_detail": TO_USER_RELATED,
+    }
 
     def get_queryset(self):
-        return ConnectionRequest.objects.filter(
-            to_user=self.request.user, status="pending"
-        ).select_related(
-            "from_user",
-            "to_user",
-            "from_user__founder_profile",
-            "from_user__mentor_profile",
+        return self.select_sparse_related(
+            ConnectionRequest.objects.filter(
+                to_user=self.request.user, status="pending"
+            )
         )
 
 
@@ -116,33 +143,81 @@ class DeclineRequestView(APIView):
         )
 
 
-class RecentConnectionsView(generics.ListAPIView):
+class BulkRespondView(APIView):
+    """
+    Accept or decline several received requests in one call.
+    Returns an outcome per id: "accepted"/"declined", "already_<status>"
+    for requests answered before, or "not_found".
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = BulkRespondSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+        new_status = {"accept": "accepted", "decline": "declined"}[
+            serializer.validated_data["action"]
+        ]
+
+        outcomes = respond_to_requests(request.user, ids, new_status)
+        return Response(
+            {"results": [{"id": pk, "outcome": outcomes[pk]} for pk in ids]},
+            status=status.HTTP_200_OK,
+        )
+
+
+class SuggestedConnectionsView(APIView):
+    """
+    People you may know: users connected to the viewer's connections that
+    the viewer has no request with, most mutual connections first.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", SUGGESTIONS_DEFAULT_LIMIT))
+        except ValueError:
+            limit = SUGGESTIONS_DEFAULT_LIMIT
+        limit = max(1, min(limit, SUGGESTIONS_MAX_LIMIT))
+
+        suggestions = suggested_connections(get_viewer_graph(request), limit)
+        users = User.objects.select_related(
+            "founder_profile__industry", "mentor_profile"
+        ).in_bulk([user_id for user_id, _ in suggestions])
+        return Response(
+            SuggestedConnectionSerializer(
+                [
+                    {"user": users[user_id], "mutual_count": mutual_count}
+                    for user_id, mutual_count in suggestions
+                    if user_id in users
+                ],
+                many=True,
+                context={"request": request},
+            ).data
+        )
+
+
+class RecentConnectionsView(APIView):
     """
     Townhall feed: public endpoint showing recent connections.
     - Authenticated users see full names and profiles
     - Anonymous users see anonymized descriptions
+    Both variants are served from the precomputed feed.
     """
 
     permission_classes = [AllowAny]
-    serializer_class = TownhallConnectionSerializer
-    pagination_class = None  # Return array directly, not paginated
 
-    def get_queryset(self):
-        # Get connections from the last 7 days, max 10
-        seven_days_ago = timezone.now() - timedelta(days=7)
-        return (
-            ConnectionRequest.objects.filter(
-                status="accepted", responded_at__gte=seven_days_ago
-            )
-            .select_related(
-                "from_user",
-                "to_user",
-                "from_user__founder_profile",
-                "from_user__founder_profile__industry",
-                "from_user__mentor_profile",
-                "to_user__founder_profile",
-                "to_user__founder_profile__industry",
-                "to_user__mentor_profile",
+    def get(self, request):
+        if request.user.is_authenticated:
+            response = Response(get_townhall_feed("members"))
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            response = Response(get_townhall_feed("public"))
+            # Identical for every guest: let browsers and CDNs absorb spikes
+            patch_cache_control(
+                response, public=True, max_age=settings.TOWNHALL_PUBLIC_MAX_AGE
             )
-            .order_by("-responded_at")[:10]
-        )
+        patch_vary_headers(response, ["Authorization"])
+        return response
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class IndustriesConfig(AppConfig):
+    name = "industries"
+
+    def ready(self):
+        from . import signals  # noqa: F401
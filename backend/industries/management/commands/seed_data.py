@@ -1,5 +1,10 @@
 from django.core.management.base import BaseCommand
 from industries.models import IndustryCategory, IndustrySubcategory, Objective
+from industries.reference_data import bump_reference_version
+
+
+def _slugify(name):
+    return name.lower().replace("/", "-").replace(" ", "-")
 
 
 class Command(BaseCommand):
@@ -22,21 +27,35 @@ class Command(BaseCommand):
             "Services": ["Agency", "Consulting", "Freelance Platform"],
         }
 
-        for category_name, subcategories in industries.items():
-            category_slug = category_name.lower().replace("/", "-").replace(" ", "-")
-            category, created = IndustryCategory.objects.get_or_create(
-                slug=category_slug, defaults={"name": category_name}
-            )
-            if created:
+        # Bulk inserts skip existing slugs, so re-running only adds what's missing
+        existing = set(IndustryCategory.objects.values_list("slug", flat=True))
+        categories = []
+        for category_name in industries:
+            category_slug = _slugify(category_name)
+            if category_slug not in existing:
+                categories.append(
+                    IndustryCategory(slug=category_slug, name=category_name)
+                )
                 self.stdout.write(f"  Created category: {category_name}")
+        IndustryCategory.objects.bulk_create(categories, ignore_conflicts=True)
 
-            for sub_name in subcategories:
-                sub_slug = f"{category_slug}-{sub_name.lower().replace('/', '-').replace(' ', '-')}"
-                sub, created = IndustrySubcategory.objects.get_or_create(
-                    slug=sub_slug, defaults={"category": category, "name": sub_name}
-                )
-                if created:
+        category_ids = dict(IndustryCategory.objects.values_list("slug", "id"))
+        existing = set(IndustrySubcategory.objects.values_list("slug", flat=True))
+        subcategories = []
+        for category_name, names in industries.items():
+            category_slug = _slugify(category_name)
+            for sub_name in names:
+                sub_slug = f"{category_slug}-{_slugify(sub_name)}"
+                if sub_slug not in existing:
+                    subcategories.append(
+                        IndustrySubcategory(
+                            slug=sub_slug,
+                            name=sub_name,
+                            category_id=category_ids[category_slug],
+                        )
+                    )
                     self.stdout.write(f"    Created subcategory: {sub_name}")
+        IndustrySubcategory.objects.bulk_create(subcategories, ignore_conflicts=True)
 
         # Objectives
         objectives = {
@@ -53,13 +72,20 @@ class Command(BaseCommand):
             ],
         }
 
+        existing = set(Objective.objects.values_list("slug", flat=True))
+        new_objectives = []
         for category, items in objectives.items():
             for name in items:
                 slug = name.lower().replace("&", "and").replace(" ", "-")
-                obj, created = Objective.objects.get_or_create(
-                    slug=slug, defaults={"name": name, "category": category}
-                )
-                if created:
+                if slug not in existing:
+                    new_objectives.append(
+                        Objective(slug=slug, name=name, category=category)
+                    )
                     self.stdout.write(f"  Created objective: {name}")
+        Objective.objects.bulk_create(new_objectives, ignore_conflicts=True)
+
+        # bulk_create sends no signals
+        if categories or subcategories or new_objectives:
+            bump_reference_version()
 
         self.stdout.write(self.style.SUCCESS("Successfully seeded database!"))
@@ -52,3 +52,16 @@ STAGE_CHOICES = [
     ("series_a", "Series A"),
     ("growth", "Growth"),
 ]
+
+
+class ReferenceDataVersion(models.Model):
+    """
+    Single-row version stamp for the taxonomy endpoints, bumped whenever an
+    IndustryCategory, IndustrySubcategory or Objective is saved or deleted.
+    """
+
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Reference data v{self.version}"
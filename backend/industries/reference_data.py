@@ -0,0 +1,74 @@
+"""
+Per-worker cache of the serialized reference data (industries, objectives,
+stages).
+
+The payloads are built once per worker and reused until the
+ReferenceDataVersion stamp moves. Workers re-read the stamp at most every
+REFERENCE_DATA_CHECK_INTERVAL seconds, so serving these endpoints normally
+costs no queries and no shared cache is needed to invalidate them.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ReferenceDataVersion
+
+VERSION_PK = 1
+
+
+def bump_reference_version():
+    updated = ReferenceDataVersion.objects.filter(pk=VERSION_PK).update(
+        version=F("version") + 1, updated_at=timezone.now()
+    )
+    if not updated:
+        ReferenceDataVersion.objects.get_or_create(
+            pk=VERSION_PK, defaults={"version": 1}
+        )
+    reference_data.expire()
+
+
+class ReferenceDataCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = None
+        self._payloads = {}
+
+    def version(self):
+        """(version, updated_at) of the reference data, re-read every interval."""
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._checked_at is None
+                or now - self._checked_at >= settings.REFERENCE_DATA_CHECK_INTERVAL
+            ):
+                version = (
+                    ReferenceDataVersion.objects.filter(pk=VERSION_PK)
+                    .values_list("version", "updated_at")
+                    .first()
+                ) or (0, None)
+                if version != self._version:
+                    self._payloads = {}
+                    self._version = version
+                self._checked_at = now
+            return self._version
+
+    def get(self, key, build):
+        """The payload for `key`, built with `build()` once per version."""
+        self.version()
+        with self._lock:
+            if key not in self._payloads:
+                self._payloads[key] = build()
+            return self._payloads[key]
+
+    def expire(self):
+        """Re-read the version on the next request, e.g. after a local bump."""
+        with self._lock:
+            self._checked_at = None
+
+
+# Singleton instance
+reference_data = ReferenceDataCache()
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import IndustryCategory, IndustrySubcategory, Objective
+from .reference_data import bump_reference_version
+
+
+@receiver(post_save, sender=IndustryCategory)
+@receiver(post_save, sender=IndustrySubcategory)
+@receiver(post_save, sender=Objective)
+@receiver(post_delete, sender=IndustryCategory)
+@receiver(post_delete, sender=IndustrySubcategory)
+@receiver(post_delete, sender=Objective)
+def bump_reference_data(sender, **kwargs):
+    bump_reference_version()
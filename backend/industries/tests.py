@@ -0,0 +1,90 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .models import IndustryCategory, IndustrySubcategory, ReferenceDataVersion
+from .reference_data import ReferenceDataCache
+
+User = get_user_model()
+
+class ReferenceDataTests(TestCase):
+    """
+    Reference data is served from the per-worker cache until the version
+    stamp moves, with an ETag clients and proxies can revalidate.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = IndustryCategory.objects.create(name="Tech", slug="tech")
+        IndustrySubcategory.objects.create(
+            category=cls.category, name="SaaS", slug="saas"
+        )
+
+    def setUp(self):
+        # A fresh worker cache: the singleton outlives each test's rollback
+        cache = ReferenceDataCache()
+        for target in (
+            "industries.reference_data.reference_data",
+            "industries.views.reference_data",
+        ):
+            patcher = mock.patch(target, cache)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = APIClient()
+
+    def _revalidate(self, response):
+        return self.client.get(
+            "/api/industries/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+    def _subcategories(self, response):
+        return [
+            subcategory["slug"]
+            for category in response.json()
+            for subcategory in category["subcategories"]
+        ]
+
+    def test_etag_revalidation(self):
+        response = self.client.get("/api/industries/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("public", response["Cache-Control"])
+
+        # Anonymous and authenticated clients share the ETag
+        self.client.force_authenticate(
+            User.objects.create_user(
+                email="founder@example.com",
+                username="founder",
+                password="secret",
+                user_type="founder",
+            )
+        )
+        self.assertEqual(self._revalidate(response).status_code, 304)
+
+    def test_edits_bump_the_version(self):
+        first = self.client.get("/api/industries/")
+        self.assertEqual(self._subcategories(first), ["saas"])
+
+        IndustrySubcategory.objects.create(
+            category=self.category, name="Fintech", slug="fintech"
+        )
+        response = self._revalidate(first)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+        self.assertEqual(sorted(self._subcategories(response)), ["fintech", "saas"])
+
+    def test_other_workers_bumps_seen_after_the_check_interval(self):
+        first = self.client.get("/api/industries/")
+        # Another worker's edit: only the stamp in the database moves
+        IndustrySubcategory.objects.filter(slug="saas").update(slug="software")
+        ReferenceDataVersion.objects.update(version=F("version") + 1)
+
+        with override_settings(REFERENCE_DATA_CHECK_INTERVAL=3600):
+            self.assertEqual(self._revalidate(first).status_code, 304)
+
+        with override_settings(REFERENCE_DATA_CHECK_INTERVAL=0):
+            fresh = self._revalidate(first)
+            self.assertEqual(fresh.status_code, 200)
+            self.assertEqual(self._subcategories(fresh), ["software"])
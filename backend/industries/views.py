@@ -1,29 +1,63 @@
+from django.conf import settings
 from rest_framework import generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 
+from sapan.conditional import ConditionalGetMixin
+
 from .models import IndustryCategory, Objective, STAGE_CHOICES
+from .reference_data import reference_data
 from .serializers import IndustryCategorySerializer, ObjectiveSerializer
 
 
-class IndustryListView(generics.ListAPIView):
+class ReferenceDataMixin(ConditionalGetMixin):
+    """
+    Serve the payload from the per-worker reference data cache, with an ETag
+    derived from the reference data version so proxies and browsers can
+    keep it.
+    """
+
+    reference_key = None
+    conditional_per_user = False
+    conditional_cache_control = {
+        "public": True,
+        "max_age": settings.REFERENCE_DATA_MAX_AGE,
+    }
+
+    def get_validators(self, request, *args, **kwargs):
+        version, updated_at = reference_data.version()
+        return (self.reference_key, version), updated_at
+
+    def list(self, request, *args, **kwargs):
+        return Response(reference_data.get(self.reference_key, self.build_payload))
+
+    def build_payload(self):
+        return self.get_serializer(self.get_queryset(), many=True).data
+
+
+class IndustryListView(ReferenceDataMixin, generics.ListAPIView):
     queryset = IndustryCategory.objects.prefetch_related("subcategories").all()
     serializer_class = IndustryCategorySerializer
     permission_classes = [AllowAny]
     pagination_class = None
+    reference_key = "industries"
 
 
-class ObjectiveListView(generics.ListAPIView):
+class ObjectiveListView(ReferenceDataMixin, generics.ListAPIView):
     queryset = Objective.objects.all()
     serializer_class = ObjectiveSerializer
     permission_classes = [AllowAny]
     pagination_class = None
+    reference_key = "objectives"
 
 
-class StageListView(APIView):
+class StageListView(ReferenceDataMixin, APIView):
     permission_classes = [AllowAny]
+    reference_key = "stages"
+
+    def get(self, request, *args, **kwargs):
+        return self.conditional_response(self.list, request, *args, **kwargs)
 
-    def get(self, request):
-        stages = [{"value": value, "label": label} for value, label in STAGE_CHOICES]
-        return Response(stages)
+    def build_payload(self):
+        return [{"value": value, "label": label} for value, label in STAGE_CHOICES]
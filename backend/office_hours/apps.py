@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class OfficeHoursConfig(AppConfig):
+    name = 'office_hours'
+
+    def ready(self):
+        from . import signals  # noqa: F401
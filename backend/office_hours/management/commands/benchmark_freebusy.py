@@ -0,0 +1,264 @@
+"""
+Run busy-time lookups against a local fake Google Calendar API with injected
+latency, to check the fetch budget and the concurrency of the fan-out.
+Usage: python manage.py benchmark_freebusy [--mentors 40] [--latency 0.2]
+           [--slow 0.25] [--slow-latency 5] [--budget 2] [--calls 200]
+
+Temporary calendar tokens are created for mentors with availability rules
+and rolled back afterwards; their access token tells the fake server how
+long to stall. Reports the cold lookup (slow calendars should come back
+unchecked once the budget runs out), a warm one after the slow fetches
+finished in the background, and the single-mentor slots endpoint. Then
+times back-to-back calls with no injected latency through the reused client
+against building a client and connection per call, as before.
+"""
+import json
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httplib2
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from office_hours.models import AvailabilityRule, GoogleCalendarToken
+from office_hours.services import busy_cache
+from office_hours.services.google_calendar import google_calendar_service
+from office_hours.services.slots import find_available_slots
+from office_hours.views import MentorSlotsView
+
+
+class FakeFreeBusyServer(ThreadingHTTPServer):
+    """Answers freeBusy queries after the delay named in the bearer token."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeFreeBusyHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    @property
+    def endpoint(self):
+        return f'http://127.0.0.1:{self.server_address[1]}/'
+
+
+class FakeFreeBusyHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like Google
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # the client's delayed ACK stall every reused connection by ~40 ms
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            token = self.headers.get('Authorization', '').rsplit('-', 1)[-1]
+            time.sleep(float(token or 0))
+
+            start = body['timeMin']
+            busy = [{'start': start, 'end': start}]
+            payload = json.dumps({
+                'kind': 'calendar#freeBusy',
+                'timeMin': body['timeMin'],
+                'timeMax': body['timeMax'],
+                'calendars': {item['id']: {'busy': busy} for item in body['items']},
+            }).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client gave up on us
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks budgeted busy-time fetching against a fake Google API'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mentors', type=int, default=40)
+        parser.add_argument(
+            '--latency', type=float, default=0.2, help='Seconds per normal response'
+        )
+        parser.add_argument(
+            '--slow', type=float, default=0.25, help='Fraction of slow calendars'
+        )
+        parser.add_argument(
+            '--slow-latency', type=float, default=5, help='Seconds per slow response'
+        )
+        parser.add_argument(
+            '--budget', type=float, default=2, help='CALENDAR_BUSY_BUDGET to use'
+        )
+        parser.add_argument(
+            '--calls', type=int, default=200, help='Calls per client comparison'
+        )
+
+    def handle(self, *args, **options):
+        mentor_ids = list(
+            AvailabilityRule.objects.filter(is_active=True)
+            .exclude(mentor__calendar_token__isnull=False)
+            .values_list('mentor_id', flat=True)
+            .distinct()[:options['mentors']]
+        )
+        if not mentor_ids:
+            raise CommandError('No mentors with active availability rules')
+        slow_count = round(len(mentor_ids) * options['slow'])
+        slow_ids = set(mentor_ids[:slow_count])
+
+        server = FakeFreeBusyServer()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            with override_settings(
+                GOOGLE_CALENDAR_API_ENDPOINT=server.endpoint,
+                CALENDAR_BUSY_BUDGET=options['budget'],
+            ):
+                with transaction.atomic():
+                    self.run(server, mentor_ids, slow_ids, options)
+                    raise Rollback
+        except Rollback:
+            pass
+        finally:
+            for mentor_id in mentor_ids:
+                busy_cache.invalidate(mentor_id)
+
+        try:
+            with override_settings(GOOGLE_CALENDAR_API_ENDPOINT=server.endpoint):
+                self.compare_clients(server, options['calls'])
+        finally:
+            server.shutdown()
+
+        self.stdout.write(self.style.SUCCESS('Successfully ran freebusy benchmark!'))
+
+    def run(self, server, mentor_ids, slow_ids, options):
+        expires_at = timezone.now() + timedelta(hours=1)
+        latency = {
+            mentor_id: options['slow_latency'] if mentor_id in slow_ids else options['latency']
+            for mentor_id in mentor_ids
+        }
+        GoogleCalendarToken.objects.bulk_create([
+            GoogleCalendarToken(
+                user_id=mentor_id,
+                access_token=f'fake-{latency[mentor_id]}',
+                refresh_token='fake',
+                expires_at=expires_at,
+                scope='fake',
+            )
+            for mentor_id in mentor_ids
+        ])
+        for mentor_id in mentor_ids:
+            busy_cache.invalidate(mentor_id)
+        self.stdout.write(
+            f'  {len(mentor_ids)} calendars, {len(slow_ids)} slow '
+            f'({options["slow_latency"]:.1f} s), others {options["latency"]:.1f} s, '
+            f'budget {options["budget"]:.1f} s'
+        )
+
+        start = timezone.now()
+        end = start + timedelta(days=7)
+        for label in ('cold', 'warm'):
+            requests_before = server.requests
+            started = time.perf_counter()
+            available, unchecked = find_available_slots(mentor_ids, start, end)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'  {label}: {elapsed:.2f} s, {len(mentor_ids) - len(unchecked)} '
+                f'checked, {len(unchecked)} unchecked '
+                f'({len(unchecked & slow_ids)} slow), '
+                f'{server.requests - requests_before} API calls, '
+                f'max {server.max_in_flight} concurrent'
+            )
+            if label == 'cold':
+                # Let the slow fetches finish in the background and fill the cache
+                time.sleep(max(0, options['slow_latency'] - elapsed) + 0.5)
+
+        if slow_ids:
+            mentor_id = next(iter(slow_ids))
+            busy_cache.invalidate(mentor_id)
+            mentor = AvailabilityRule.objects.filter(mentor_id=mentor_id).first().mentor
+            request = APIRequestFactory().get(
+                f'/api/office-hours/mentors/{mentor_id}/slots/', {'days': 7}
+            )
+            force_authenticate(request, user=mentor)
+            started = time.perf_counter()
+            response = MentorSlotsView.as_view()(request, mentor_id=mentor_id)
+            self.stdout.write(
+                f'  slow mentor slots: {time.perf_counter() - started:.2f} s, '
+                f'{len(response.data["slots"])} slots, '
+                f'calendar_checked={response.data.get("calendar_checked")}'
+            )
+
+    def compare_clients(self, server, calls):
+        credentials = Credentials(token='fake-0')
+        body = {
+            'timeMin': '2025-01-01T00:00:00+00:00',
+            'timeMax': '2025-01-29T00:00:00+00:00',
+            'items': [{'id': 'primary'}],
+        }
+
+        def per_call():
+            # What _fetch_busy_times did before the client was reused
+            service = build(
+                'calendar',
+                'v3',
+                http=AuthorizedHttp(credentials, http=httplib2.Http()),
+                client_options={'api_endpoint': server.endpoint},
+                cache_discovery=False,
+            )
+            return service.freebusy().query(body=body).execute()
+
+        def reused():
+            http = AuthorizedHttp(credentials, http=google_calendar_service._http())
+            calendar = google_calendar_service._calendar()
+            return calendar.freebusy().query(body=body).execute(http=http)
+
+        results = {}
+        for name, call in (('per-call client', per_call), ('reused client', reused)):
+            call()  # Warm up imports and the thread's client
+            connections_before = server.connections
+            started = time.perf_counter()
+            for _ in range(calls):
+                result = call()
+            elapsed = (time.perf_counter() - started) * 1000 / calls
+            results[name] = elapsed
+            if 'primary' not in result['calendars']:
+                raise CommandError(f'Unexpected freeBusy response: {result}')
+            self.stdout.write(
+                f'  {name}: {elapsed:.2f} ms/call, '
+                f'{server.connections - connections_before} connections '
+                f'for {calls} calls'
+            )
+        self.stdout.write(
+            f'  per-call overhead removed: '
+            f'{results["per-call client"] - results["reused client"]:.2f} ms '
+            f'x{results["per-call client"] / results["reused client"]:.1f}'
+        )
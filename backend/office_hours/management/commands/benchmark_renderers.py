@@ -0,0 +1,149 @@
+"""
+Check the orjson renderer against DRF's JSONRenderer and time both on the
+mentor slots response.
+Usage: python manage.py benchmark_renderers [--mentor ID] [--days 90] [--repeat 20]
+
+The compatibility cases cover every type the renderer handles; any
+MISMATCH means API output would change and the command exits non-zero.
+"""
+import datetime
+import decimal
+import json
+import time
+import uuid
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from office_hours.models import AvailabilityRule
+from office_hours.views import MentorSlotsView
+from sapan.renderers import ORJSONRenderer
+
+User = get_user_model()
+
+UTC_NOW = datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc)
+
+COMPATIBILITY_CASES = {
+    "aware utc datetime": UTC_NOW,
+    "utc datetime without micros": UTC_NOW.replace(microsecond=0),
+    "zoneinfo datetime": UTC_NOW.astimezone(ZoneInfo("Asia/Bangkok")),
+    "zero-offset zoneinfo": UTC_NOW.astimezone(ZoneInfo("Europe/London")),
+    "naive datetime": UTC_NOW.replace(tzinfo=None),
+    "date": UTC_NOW.date(),
+    "time": datetime.time(9, 30),
+    "time with micros": datetime.time(9, 30, 0, 5),
+    "timedelta": datetime.timedelta(minutes=30),
+    "decimal": decimal.Decimal("12.50"),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "lazy string": gettext_lazy("Confirmed"),
+    "unicode": "สวัสดี café     \"quoted\" \\ \n",
+    "numbers": [0, -1, 2**53, 1.5, 0.1, 0.0001, 123456789.125],
+    "big int": 2**64,
+    "numpy scalars": [np.float32(0.3), np.int64(7)],
+    "non-str keys": {1: "a", None: "b", True: "c"},
+    "nested return types": ReturnDict(
+        {"results": ReturnList([{"a": None, "b": True}], serializer=None)},
+        serializer=None,
+    ),
+    "empty": {},
+}
+
+# Same value, different spelling: orjson writes 1e-7 where json writes 1e-07
+EQUIVALENT_CASES = {
+    "float exponents": [1e-7, 1e16, 1.7976931348623157e308],
+}
+
+# Documented differences (see sapan.renderers): JSONRenderer raises, orjson
+# writes null
+NON_FINITE_CASES = {
+    "nan": float("nan"),
+    "infinity": [float("inf"), float("-inf")],
+}
+
+
+class Command(BaseCommand):
+    help = "Checks ORJSONRenderer output against JSONRenderer and benchmarks both"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mentor", type=int, help="Mentor user id")
+        parser.add_argument("--days", type=int, default=90, help="Slot window")
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Renders per measurement; the best one is reported",
+        )
+
+    def handle(self, *args, **options):
+        stdlib = JSONRenderer()
+        fast = ORJSONRenderer()
+
+        mismatches = 0
+        for name, data in COMPATIBILITY_CASES.items():
+            same = stdlib.render(data) == fast.render(data)
+            mismatches += not same
+            self.stdout.write(f"  {name:<28} {'identical' if same else 'MISMATCH'}")
+
+        for name, data in EQUIVALENT_CASES.items():
+            same = json.loads(stdlib.render(data)) == json.loads(fast.render(data))
+            mismatches += not same
+            self.stdout.write(f"  {name:<28} {'equivalent' if same else 'MISMATCH'}")
+
+        for name, data in NON_FINITE_CASES.items():
+            try:
+                stdlib.render(data)
+                raised = False
+            except ValueError:
+                raised = True
+            same = raised and b"null" in fast.render(data)
+            mismatches += not same
+            self.stdout.write(f"  {name:<28} {'null' if same else 'MISMATCH'}")
+
+        data = self._slots(options["mentor"], options["days"])
+        same = stdlib.render(data) == fast.render(data)
+        mismatches += not same
+        self.stdout.write(
+            f"  slots ({len(data['slots'])} slots, {options['days']} days)"
+            f"  {'identical' if same else 'MISMATCH'}"
+        )
+
+        stdlib_ms = self._best(lambda: stdlib.render(data), options["repeat"])
+        fast_ms = self._best(lambda: fast.render(data), options["repeat"])
+        self.stdout.write(
+            f"  render: json {stdlib_ms:.2f} ms  orjson {fast_ms:.2f} ms"
+            f"  x{stdlib_ms / fast_ms:.1f}"
+        )
+
+        if mismatches:
+            raise CommandError(f"{mismatches} renderer mismatches")
+        self.stdout.write(self.style.SUCCESS("Successfully ran renderer benchmark!"))
+
+    def _slots(self, mentor_id, days):
+        rules = AvailabilityRule.objects.filter(is_active=True)
+        if mentor_id:
+            rules = rules.filter(mentor_id=mentor_id)
+        rule = rules.select_related("mentor").first()
+        if rule is None:
+            raise CommandError("No mentor with active availability rules")
+
+        request = APIRequestFactory().get(
+            f"/api/office-hours/mentors/{rule.mentor_id}/slots/", {"days": days}
+        )
+        force_authenticate(request, user=rule.mentor)
+        response = MentorSlotsView.as_view()(request, mentor_id=rule.mentor_id)
+        return response.data
+
+    def _best(self, run, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
@@ -0,0 +1,143 @@
+"""
+Time the slot engine against the previous day-by-day slot generation.
+Usage: python manage.py benchmark_slots [--mentor ID] [--busy 500] [--repeat 5]
+
+Runs 90- and 365-day windows with synthetic busy periods. The engine's
+timezone and DST handling is covered by office_hours.tests.
+"""
+import random
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from office_hours.models import AvailabilityRule, Booking
+from office_hours.services.slots import SlotEngine, booked_intervals, mark_slots
+
+
+def _legacy_slots(mentor, start_date, end_date, busy_times):
+    """The day-by-day generation MentorSlotsView used before the engine."""
+    rules = AvailabilityRule.objects.filter(mentor=mentor, is_active=True)
+    if not rules.exists():
+        return []
+    slots = []
+    current_date = start_date
+    while current_date <= end_date:
+        for rule in rules.filter(weekday=current_date.weekday()):
+            tz = ZoneInfo(rule.timezone)
+            slot_start = datetime.combine(current_date, rule.start_time, tzinfo=tz)
+            slot_end_time = datetime.combine(current_date, rule.end_time, tzinfo=tz)
+            duration = timedelta(minutes=rule.slot_duration_minutes)
+            while slot_start + duration <= slot_end_time:
+                slot_end = slot_start + duration
+                if slot_start > timezone.now():
+                    slots.append({
+                        'start_time': slot_start,
+                        'end_time': slot_end,
+                        'is_available': True,
+                    })
+                slot_start = slot_end
+        current_date += timedelta(days=1)
+
+    booked_times = {
+        booking.start_time.isoformat()
+        for booking in Booking.objects.filter(
+            mentor=mentor,
+            status='confirmed',
+            start_time__gte=timezone.now(),
+            start_time__date__lte=end_date,
+        )
+    }
+    for slot in slots:
+        if slot['start_time'].isoformat() in booked_times:
+            slot['is_available'] = False
+            continue
+        for busy_start, busy_end in busy_times:
+            if slot['start_time'] < busy_end and slot['end_time'] > busy_start:
+                slot['is_available'] = False
+                break
+    return slots
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks slot generation against the day-by-day generation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mentor', type=int, help='Mentor user id')
+        parser.add_argument(
+            '--busy', type=int, default=500, help='Synthetic busy periods'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Runs per measurement; the best one is reported',
+        )
+
+    def handle(self, *args, **options):
+        mentor = self._mentor(options['mentor'])
+        for days in (90, 365):
+            self._benchmark(mentor, days, options['busy'], options['repeat'])
+
+        self.stdout.write(self.style.SUCCESS('Successfully ran slot benchmark!'))
+
+    def _mentor(self, mentor_id):
+        rules = AvailabilityRule.objects.filter(is_active=True)
+        if mentor_id:
+            rules = rules.filter(mentor_id=mentor_id)
+        rule = rules.select_related('mentor').first()
+        if rule is None:
+            raise CommandError('No mentor with active availability rules')
+        return rule.mentor
+
+    def _benchmark(self, mentor, days, busy_count, repeat):
+        start_date = timezone.now().date()
+        end_date = start_date + timedelta(days=days)
+        rng = random.Random(days)
+        now = timezone.now()
+        busy_times = sorted(
+            (start, start + timedelta(minutes=rng.choice([30, 60, 90])))
+            for start in (
+                now + timedelta(minutes=rng.randrange(days * 24 * 60))
+                for _ in range(busy_count)
+            )
+        )
+
+        def engine():
+            rules = list(AvailabilityRule.objects.filter(mentor=mentor, is_active=True))
+            candidates = SlotEngine(rules).expand(
+                start_date, end_date, after=timezone.now()
+            )
+            if not candidates:
+                return []
+            booked = booked_intervals(
+                [mentor.pk], candidates[0][0], max(end for _, end in candidates)
+            )[mentor.pk]
+            return mark_slots(candidates, booked, busy_times)
+
+        results = {}
+        for name, run in (
+            ('legacy', lambda: _legacy_slots(mentor, start_date, end_date, busy_times)),
+            ('engine', engine),
+        ):
+            best = None
+            for _ in range(repeat):
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    slots = run()
+                    elapsed = (time.perf_counter() - started) * 1000
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = (best, len(queries), slots)
+
+        legacy_ms, legacy_queries, legacy = results['legacy']
+        engine_ms, engine_queries, slots = results['engine']
+        self.stdout.write(
+            f'  {days} days, {len(slots)} slots, {busy_count} busy: '
+            f'legacy {legacy_ms:.1f} ms / {legacy_queries} queries, '
+            f'engine {engine_ms:.1f} ms / {engine_queries} queries '
+            f'x{legacy_ms / engine_ms:.1f}'
+        )
@@ -0,0 +1,32 @@
+"""
+Show the Google Calendar busy-times cache hit/miss counters.
+Usage: python manage.py calendar_busy_stats [--reset]
+
+A miss is a lookup that had to call Google; lookups for mentors without a
+connected calendar aren't counted.
+"""
+from django.core.management.base import BaseCommand
+
+from office_hours.services import busy_cache
+
+
+class Command(BaseCommand):
+    help = 'Shows the busy-times cache hit/miss counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true', help='Zero the counters afterwards'
+        )
+
+    def handle(self, *args, **options):
+        stats = busy_cache.stats()
+        lookups = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / lookups if lookups else 0
+        self.stdout.write(
+            f"  hits {stats['hits']}, misses {stats['misses']}, "
+            f"hit ratio {ratio:.1%}"
+        )
+        if options['reset']:
+            busy_cache.reset_stats()
+            self.stdout.write('  counters reset')
+        self.stdout.write(self.style.SUCCESS('Successfully read busy cache stats!'))
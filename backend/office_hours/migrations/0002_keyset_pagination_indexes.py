@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('office_hours', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['mentor', '-start_time', 'id'], name='booking_mentor_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['founder', '-start_time', 'id'], name='booking_founder_start_idx'),
+        ),
+    ]
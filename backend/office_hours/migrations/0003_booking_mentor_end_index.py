@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('office_hours', '0002_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['mentor', 'end_time'], name='booking_mentor_end_idx'),
+        ),
+    ]
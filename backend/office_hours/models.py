@@ -102,6 +102,13 @@ class Booking(models.Model):
         verbose_name = "Booking"
         verbose_name_plural = "Bookings"
         ordering = ['-start_time']
+        indexes = [
+            # Keyset pagination of booking lists on (-start_time, id)
+            models.Index(fields=['mentor', '-start_time', 'id'], name='booking_mentor_start_idx'),
+            models.Index(fields=['founder', '-start_time', 'id'], name='booking_founder_start_idx'),
+            # Bookings overlapping a slot window (booked_intervals), whatever their length
+            models.Index(fields=['mentor', 'end_time'], name='booking_mentor_end_idx'),
+        ]
 
     def __str__(self):
         return f"{self.founder.email} → {self.mentor.email} @ {self.start_time}"
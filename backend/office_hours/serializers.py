@@ -1,5 +1,9 @@
+from datetime import timedelta
+
 from rest_framework import serializers
+from django.utils import timezone
 from django.contrib.auth import get_user_model
+from sapan.sparse_fields import SparseFieldsetSerializerMixin
 from .models import GoogleCalendarToken, AvailabilityRule, Booking
 
 User = get_user_model()
@@ -59,12 +63,13 @@ class UserMinimalSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'email', 'full_name', 'profile_photo', 'avatar_url']
+        values_sources = {'full_name': ['first_name', 'last_name', 'email']}
 
     def get_full_name(self, obj):
         return f"{obj.first_name} {obj.last_name}".strip() or obj.email
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for bookings."""
     mentor_info = UserMinimalSerializer(source='mentor', read_only=True)
     founder_info = UserMinimalSerializer(source='founder', read_only=True)
@@ -110,3 +115,22 @@ class TimeSlotSerializer(serializers.Serializer):
     start_time = serializers.DateTimeField()
     end_time = serializers.DateTimeField()
     is_available = serializers.BooleanField()
+
+
+class SlotSearchSerializer(serializers.Serializer):
+    """Query params for searching slots across mentors."""
+    MAX_WINDOW = timedelta(days=14)
+
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+
+    def validate(self, data):
+        data.setdefault('start', timezone.now())
+        data.setdefault('end', data['start'] + timedelta(days=7))
+        if data['end'] <= data['start']:
+            raise serializers.ValidationError({'end': 'End must be after start.'})
+        if data['end'] - data['start'] > self.MAX_WINDOW:
+            raise serializers.ValidationError({
+                'end': f'The window can be at most {self.MAX_WINDOW.days} days.'
+            })
+        return data
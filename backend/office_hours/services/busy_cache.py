@@ -0,0 +1,101 @@
+"""
+Shared cache of Google Calendar busy periods.
+
+One entry per mentor, covering at least CALENDAR_BUSY_CACHE_DAYS from the
+start of the first day asked for, so narrower and later lookups inside that
+window are answered without calling Google. Entries expire after
+CALENDAR_BUSY_CACHE_TIMEOUT and are invalidated when a booking is created or
+cancelled or the calendar is connected or disconnected (see
+office_hours.signals).
+
+Invalidation bumps a per-mentor version rather than deleting the entry, so
+a fetch that was already in flight can't store outdated periods after it.
+"""
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_KEY = 'office_hours:busy:{}'
+VERSION_KEY = 'office_hours:busy:{}:version'
+STATS_KEY = 'office_hours:busy:stats:{}'
+STATS = ('hits', 'misses')
+
+
+def cache_window(time_min, time_max):
+    """The (start, end) to fetch so the entry also serves nearby lookups."""
+    start = time_min.astimezone(dt_timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    end = start + timedelta(days=settings.CALENDAR_BUSY_CACHE_DAYS)
+    return start, max(end, time_max)
+
+
+def lookup(user_ids, time_min, time_max):
+    """
+    Returns ({user_id: busy periods} for users whose entry covers the
+    window, {user_id: version} for the rest, to pass to store()).
+    """
+    keys = {}
+    for user_id in user_ids:
+        keys[CACHE_KEY.format(user_id)] = user_id
+        keys[VERSION_KEY.format(user_id)] = user_id
+    values = cache.get_many(keys)
+
+    found, missing = {}, {}
+    for user_id in set(keys.values()):
+        entry = values.get(CACHE_KEY.format(user_id))
+        version = values.get(VERSION_KEY.format(user_id), 0)
+        if (
+            entry is not None
+            and entry['version'] == version
+            and entry['start'] <= time_min
+            and entry['end'] >= time_max
+        ):
+            found[user_id] = [
+                (start, end)
+                for start, end in entry['busy']
+                if start < time_max and end > time_min
+            ]
+        else:
+            missing[user_id] = version
+    return found, missing
+
+
+def store(user_id, version, start, end, busy):
+    cache.set(
+        CACHE_KEY.format(user_id),
+        {'version': version, 'start': start, 'end': end, 'busy': busy},
+        settings.CALENDAR_BUSY_CACHE_TIMEOUT,
+    )
+
+
+def invalidate(user_id):
+    cache.delete(CACHE_KEY.format(user_id))
+    key = VERSION_KEY.format(user_id)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass  # Evicted in between; the entry itself is already gone
+
+
+def count(stat, amount=1):
+    if not amount:
+        return
+    key = STATS_KEY.format(stat)
+    if not cache.add(key, amount, None):
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            cache.set(key, amount, None)
+
+
+def stats():
+    """{'hits': n, 'misses': n} across all workers sharing the cache."""
+    values = cache.get_many([STATS_KEY.format(stat) for stat in STATS])
+    return {stat: values.get(STATS_KEY.format(stat), 0) for stat in STATS}
+
+
+def reset_stats():
+    cache.delete_many([STATS_KEY.format(stat) for stat in STATS])
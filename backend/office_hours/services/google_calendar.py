@@ -3,18 +3,24 @@ Google Calendar service for OAuth and freebusy queries.
 Uses the same GOOGLE_CLIENT_ID/SECRET as login, with calendar.readonly scope.
 """
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, List, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Optional, List, Set, Tuple
 from urllib.parse import urlencode
 
+import httplib2
 from django.conf import settings
+from django.db import connection
 from django.utils import timezone
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp, Request
 from google_auth_oauthlib.flow import Flow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from office_hours.models import GoogleCalendarToken
+from office_hours.services import busy_cache
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +33,9 @@ class GoogleCalendarService:
     def __init__(self):
         self.client_id = settings.GOOGLE_CLIENT_ID
         self.client_secret = settings.GOOGLE_CLIENT_SECRET
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._local = threading.local()
 
     def get_auth_url(self, redirect_uri: str) -> str:
         """Generate the Google OAuth URL for calendar access."""
@@ -60,7 +69,7 @@ class GoogleCalendarService:
         return {
             'access_token': credentials.token,
             'refresh_token': credentials.refresh_token,
-            'expires_at': datetime.fromtimestamp(credentials.expiry.timestamp(), tz=timezone.utc),
+            'expires_at': datetime.fromtimestamp(credentials.expiry.timestamp(), tz=dt_timezone.utc),
             'scope': ' '.join(SCOPES),
         }
 
@@ -90,49 +99,119 @@ class GoogleCalendarService:
             token_uri="https://oauth2.googleapis.com/token",
             client_id=self.client_id,
             client_secret=self.client_secret,
-            expiry=token.expires_at,
+            # google-auth compares expiry with a naive UTC now
+            expiry=timezone.make_naive(token.expires_at, dt_timezone.utc),
         )
 
         # Refresh if expired
         if credentials.expired and credentials.refresh_token:
             try:
-                credentials.refresh(None)
+                credentials.refresh(Request(self._http()))
                 # Save refreshed tokens
                 token.access_token = credentials.token
                 token.expires_at = datetime.fromtimestamp(
-                    credentials.expiry.timestamp(), tz=timezone.utc
+                    credentials.expiry.timestamp(), tz=dt_timezone.utc
                 )
-                token.save()
+                # Partial save: not a (re)connection (see office_hours.signals)
+                token.save(update_fields=['access_token', 'expires_at', 'updated_at'])
             except Exception as e:
                 logger.error(f"Failed to refresh calendar token for {user.email}: {e}")
                 return None
 
         return credentials
 
-    def get_busy_times(
+    def get_busy_times_many(
+        self,
+        user_ids,
+        time_min: datetime,
+        time_max: datetime,
+        budget: Optional[float] = None
+    ) -> Tuple[Dict[int, List[Tuple[datetime, datetime]]], Set[int]]:
+        """
+        Busy periods for each of `user_ids` with a connected calendar, keyed
+        by user id, plus the ids whose calendar couldn't be read within
+        `budget` seconds (CALENDAR_BUSY_BUDGET by default) or failed; those
+        get no busy periods.
+
+        Tokens are loaded in one query and cached periods in one cache round
+        trip; the rest are fetched concurrently on a bounded thread pool.
+        Fetches still running at the deadline finish in the background and
+        fill the cache for later requests.
+        """
+        tokens = GoogleCalendarToken.objects.filter(
+            user_id__in=user_ids
+        ).select_related('user')
+        users = {token.user_id: token.user for token in tokens}
+
+        busy_times, missing = busy_cache.lookup(users, time_min, time_max)
+        busy_cache.count('hits', len(busy_times))
+        if not missing:
+            return busy_times, set()
+
+        futures = {
+            self._get_executor().submit(
+                self._fetch_in_worker, users[user_id], version, time_min, time_max
+            ): user_id
+            for user_id, version in missing.items()
+        }
+        done, _ = wait(
+            futures,
+            timeout=settings.CALENDAR_BUSY_BUDGET if budget is None else budget,
+        )
+
+        unchecked = set()
+        for future, user_id in futures.items():
+            result = future.result() if future in done else None
+            if result is None:
+                # Queued fetches are dropped; running ones still fill the cache
+                future.cancel()
+                unchecked.add(user_id)
+            busy_times[user_id] = result or []
+        return busy_times, unchecked
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.CALENDAR_FETCH_WORKERS,
+                    thread_name_prefix='freebusy',
+                )
+            return self._executor
+
+    def _fetch_in_worker(self, *args) -> Optional[List[Tuple[datetime, datetime]]]:
+        try:
+            return self._fetch_busy_times(*args)
+        finally:
+            # Pool threads outlive requests; don't leave their connections open
+            connection.close()
+
+    def _fetch_busy_times(
         self,
         user,
+        version: int,
         time_min: datetime,
         time_max: datetime
-    ) -> List[Tuple[datetime, datetime]]:
+    ) -> Optional[List[Tuple[datetime, datetime]]]:
         """
-        Get busy time periods from user's calendar.
-        Returns list of (start, end) tuples representing busy periods.
+        Query Google for the cache window around the request and cache it.
+        Returns None if the calendar couldn't be read.
         """
         credentials = self.get_credentials(user)
         if not credentials:
-            return []
+            return None
 
+        busy_cache.count('misses')
+        window_start, window_end = busy_cache.cache_window(time_min, time_max)
         try:
-            service = build('calendar', 'v3', credentials=credentials)
-
             body = {
-                "timeMin": time_min.isoformat(),
-                "timeMax": time_max.isoformat(),
+                "timeMin": window_start.isoformat(),
+                "timeMax": window_end.isoformat(),
                 "items": [{"id": "primary"}],
             }
 
-            result = service.freebusy().query(body=body).execute()
+            # This mentor's credentials over the thread's pooled connection
+            http = AuthorizedHttp(credentials, http=self._http())
+            result = self._calendar().freebusy().query(body=body).execute(http=http)
             busy_times = []
 
             for busy in result.get('calendars', {}).get('primary', {}).get('busy', []):
@@ -140,14 +219,53 @@ class GoogleCalendarService:
                 end = datetime.fromisoformat(busy['end'].replace('Z', '+00:00'))
                 busy_times.append((start, end))
 
-            return busy_times
-
         except HttpError as e:
             logger.error(f"Calendar API error for {user.email}: {e}")
-            return []
+            return None
         except Exception as e:
             logger.error(f"Unexpected error fetching calendar for {user.email}: {e}")
-            return []
+            return None
+
+        # Failures above aren't cached, so the next lookup retries
+        busy_cache.store(user.pk, version, window_start, window_end, busy_times)
+        return [
+            (start, end) for start, end in busy_times
+            if start < time_max and end > time_min
+        ]
+
+    def _http(self) -> httplib2.Http:
+        """
+        This thread's keep-alive connection pool. httplib2 isn't thread-safe,
+        so each request or fetch thread gets its own.
+        """
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = httplib2.Http(
+                timeout=settings.CALENDAR_HTTP_TIMEOUT
+            )
+        return http
+
+    def _calendar(self):
+        """
+        This thread's calendar API client, built once from the discovery
+        document bundled with google-api-python-client. Requests pass their
+        own authorized http to execute(), so it holds no credentials.
+        """
+        # Keyed by endpoint so the API can be pointed at a local fake
+        endpoint = settings.GOOGLE_CALENDAR_API_ENDPOINT
+        clients = getattr(self._local, 'calendars', None)
+        if clients is None:
+            clients = self._local.calendars = {}
+        if endpoint not in clients:
+            clients[endpoint] = build(
+                'calendar',
+                'v3',
+                http=self._http(),
+                client_options={'api_endpoint': endpoint} if endpoint else None,
+                static_discovery=True,
+                cache_discovery=False,
+            )
+        return clients[endpoint]
 
     def disconnect(self, user) -> bool:
         """Remove calendar connection for a user."""
@@ -0,0 +1,204 @@
+"""
+Slot engine for mentor availability.
+Expands a mentor's weekly AvailabilityRules into concrete slots and marks
+the ones that overlap a booking or a busy period.
+
+Rules are wall-clock schedules in their own timezone. Each rule's slot
+offsets within the day are computed once; a day without a DST transition
+then only needs its UTC offset, while a transition day localizes every slot
+separately. Slots whose wall-clock start doesn't exist that day (spring
+forward) are skipped, and repeated wall-clock times (fall back) use their
+first occurrence. A slot always lasts slot_duration_minutes of real time.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from django.utils import timezone
+
+from office_hours.models import AvailabilityRule, Booking
+from office_hours.services.google_calendar import google_calendar_service
+
+UTC = dt_timezone.utc
+
+# What RuleSchedule reads, for loading rules as plain rows
+RULE_FIELDS = (
+    'mentor_id',
+    'weekday',
+    'start_time',
+    'end_time',
+    'slot_duration_minutes',
+    'timezone',
+)
+
+
+def _since_midnight(value):
+    return timedelta(hours=value.hour, minutes=value.minute, seconds=value.second)
+
+
+class RuleSchedule:
+    """
+    One rule's slots as wall-clock offsets from midnight. Takes an
+    AvailabilityRule or a row with the RULE_FIELDS.
+    """
+
+    def __init__(self, rule):
+        self.weekday = rule.weekday
+        self.tz = ZoneInfo(rule.timezone)
+        self.duration = timedelta(minutes=rule.slot_duration_minutes)
+        start = _since_midnight(rule.start_time)
+        end = _since_midnight(rule.end_time)
+        self.offsets = []
+        while start + self.duration <= end:
+            self.offsets.append(start)
+            start += self.duration
+
+    def expand(self, date):
+        """(start, end) UTC datetimes of this rule's slots on `date`."""
+        midnight = datetime.combine(date, time.min)
+        offset = self.tz.utcoffset(midnight)
+        if offset == self.tz.utcoffset(midnight + timedelta(days=1)):
+            # No transition today: every slot has the same UTC offset
+            base = (midnight - offset).replace(tzinfo=UTC)
+            return [
+                (base + start, base + start + self.duration) for start in self.offsets
+            ]
+
+        slots = []
+        for start in self.offsets:
+            local = midnight + start
+            utc = local.replace(tzinfo=self.tz).astimezone(UTC)
+            if utc.astimezone(self.tz).replace(tzinfo=None) != local:
+                continue  # Skipped by the clock change
+            slots.append((utc, utc + self.duration))
+        return slots
+
+
+class SlotEngine:
+    """Slots for one mentor's active rules."""
+
+    def __init__(self, rules):
+        self.by_weekday = defaultdict(list)
+        for rule in rules:
+            schedule = RuleSchedule(rule)
+            if schedule.offsets:
+                self.by_weekday[schedule.weekday].append(schedule)
+
+    def expand(self, start_date, end_date, after=None):
+        """
+        Sorted, distinct (start, end) slots for the days start_date through
+        end_date (inclusive), only those starting after `after` if given.
+        """
+        slots = set()
+        date = start_date
+        while date <= end_date:
+            for schedule in self.by_weekday.get(date.weekday(), ()):
+                slots.update(schedule.expand(date))
+            date += timedelta(days=1)
+        if after is not None:
+            slots = {slot for slot in slots if slot[0] > after}
+        return sorted(slots)
+
+    def between(self, start, end):
+        """Sorted slots starting at or after `start` and ending by `end`."""
+        # Local dates are within a day of UTC ones
+        slots = self.expand(
+            (start.astimezone(UTC) - timedelta(days=1)).date(),
+            (end.astimezone(UTC) + timedelta(days=1)).date(),
+        )
+        return [slot for slot in slots if slot[0] >= start and slot[1] <= end]
+
+
+def merge_intervals(*interval_lists):
+    """Union of (start, end) intervals as sorted, disjoint intervals."""
+    merged = []
+    for start, end in sorted(
+        interval for intervals in interval_lists for interval in intervals
+    ):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def mark_slots(slots, *interval_lists):
+    """
+    Slot dicts for sorted (start, end) `slots`, unavailable where they
+    overlap any of the intervals. One sweep over both sorted lists.
+    """
+    blocked = merge_intervals(*interval_lists)
+    results = []
+    i = 0
+    for start, end in slots:
+        # Intervals ending by this slot's start can't touch any later slot
+        while i < len(blocked) and blocked[i][1] <= start:
+            i += 1
+        results.append({
+            'start_time': start,
+            'end_time': end,
+            'is_available': i == len(blocked) or blocked[i][0] >= end,
+        })
+    return results
+
+
+def booked_intervals(mentor_ids, start, end):
+    """
+    {mentor_id: [(start, end)]} of confirmed bookings overlapping
+    [start, end), from one range scan per mentor on (mentor, end_time):
+    bookings can be any length, so ending after `start` is the bound.
+    """
+    bookings = Booking.objects.filter(
+        mentor_id__in=mentor_ids,
+        status='confirmed',
+        start_time__lt=end,
+        end_time__gt=start,
+    ).order_by().values_list('mentor_id', 'start_time', 'end_time')
+    intervals = defaultdict(list)
+    for mentor_id, booking_start, booking_end in bookings:
+        intervals[mentor_id].append((booking_start, booking_end))
+    return intervals
+
+
+def find_available_slots(mentor_ids, start, end):
+    """
+    Returns ({mentor_id: available slot dicts} between `start` and `end` for
+    the mentors that have any, ids of mentors whose calendar wasn't checked).
+    One query for rules, one for bookings and one batched busy lookup,
+    however many mentors there are. `mentor_ids` may be a queryset of user
+    ids, so large selections stay in the database.
+    """
+    rules = defaultdict(list)
+    active_rules = AvailabilityRule.objects.filter(
+        mentor_id__in=mentor_ids, is_active=True
+    ).values_list(*RULE_FIELDS, named=True)
+    for rule in active_rules:
+        rules[rule.mentor_id].append(rule)
+
+    start = max(start, timezone.now())
+    candidates = {}
+    for mentor_id, mentor_rules in rules.items():
+        slots = SlotEngine(mentor_rules).between(start, end)
+        if slots:
+            candidates[mentor_id] = slots
+    if not candidates:
+        return {}, set()
+
+    window_start = min(slots[0][0] for slots in candidates.values())
+    window_end = max(slot[1] for slots in candidates.values() for slot in slots)
+    booked = booked_intervals(mentor_ids, window_start, window_end)
+    busy, unchecked = google_calendar_service.get_busy_times_many(
+        mentor_ids, window_start, window_end
+    )
+
+    available = {}
+    for mentor_id, slots in candidates.items():
+        free = [
+            slot
+            for slot in mark_slots(slots, booked[mentor_id], busy.get(mentor_id, []))
+            if slot['is_available']
+        ]
+        if free:
+            available[mentor_id] = free
+    return available, unchecked
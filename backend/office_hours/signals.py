@@ -0,0 +1,43 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from sapan.events import publish
+
+from .models import Booking, GoogleCalendarToken
+from .services import busy_cache
+
+
+@receiver(post_save, sender=Booking)
+def publish_booking_event(sender, instance, created, **kwargs):
+    if created:
+        event_type = 'booking.created'
+    elif instance.status.startswith('cancelled'):
+        event_type = 'booking.cancelled'
+    else:
+        return
+    publish(
+        [instance.mentor_id, instance.founder_id],
+        event_type,
+        {
+            'id': instance.pk,
+            'mentor': instance.mentor_id,
+            'founder': instance.founder_id,
+            'status': instance.status,
+            'start_time': instance.start_time,
+        },
+    )
+
+
+@receiver(post_save, sender=Booking)
+def invalidate_busy_times_for_booking(sender, instance, created, **kwargs):
+    if created or instance.status.startswith('cancelled'):
+        transaction.on_commit(lambda: busy_cache.invalidate(instance.mentor_id))
+
+
+@receiver(post_save, sender=GoogleCalendarToken)
+@receiver(post_delete, sender=GoogleCalendarToken)
+def invalidate_busy_times_for_calendar(sender, instance, **kwargs):
+    # Token refreshes save only some fields and keep the same calendar
+    if kwargs.get('update_fields') is None:
+        transaction.on_commit(lambda: busy_cache.invalidate(instance.user_id))
@@ -0,0 +1,590 @@
+import random
+import threading
+import time as clock
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+
+from profiles.models import MentorProfile
+from .models import AvailabilityRule, Booking, GoogleCalendarToken
+from .services import busy_cache
+from .services.google_calendar import GoogleCalendarService, google_calendar_service
+from .services.slots import SlotEngine, booked_intervals, mark_slots
+
+User = get_user_model()
+
+UTC = dt_timezone.utc
+
+
+def _rule(weekday, start, end, minutes=30, tz='Asia/Bangkok'):
+    return AvailabilityRule(
+        weekday=weekday,
+        start_time=datetime.strptime(start, '%H:%M').time(),
+        end_time=datetime.strptime(end, '%H:%M').time(),
+        slot_duration_minutes=minutes,
+        timezone=tz,
+    )
+
+
+def _utc(value):
+    return datetime.strptime(value, '%Y-%m-%d %H:%M').replace(tzinfo=UTC)
+
+
+# name -> (rules, day, expected (start, end) in UTC)
+EDGE_CASES = {
+    'fixed offset': (
+        [_rule(0, '09:00', '10:00')],
+        date(2025, 3, 10),
+        [('2025-03-10 02:00', '2025-03-10 02:30'),
+         ('2025-03-10 02:30', '2025-03-10 03:00')],
+    ),
+    'half-hour offset': (
+        [_rule(0, '09:00', '10:00', tz='Asia/Kolkata')],
+        date(2025, 3, 10),
+        [('2025-03-10 03:30', '2025-03-10 04:00'),
+         ('2025-03-10 04:00', '2025-03-10 04:30')],
+    ),
+    'partial slot dropped': (
+        [_rule(0, '09:00', '10:45', minutes=45)],
+        date(2025, 3, 10),
+        [('2025-03-10 02:00', '2025-03-10 02:45'),
+         ('2025-03-10 02:45', '2025-03-10 03:30')],
+    ),
+    'overlapping rules': (
+        [_rule(0, '09:00', '10:00'), _rule(0, '09:30', '10:30')],
+        date(2025, 3, 10),
+        [('2025-03-10 02:00', '2025-03-10 02:30'),
+         ('2025-03-10 02:30', '2025-03-10 03:00'),
+         ('2025-03-10 03:00', '2025-03-10 03:30')],
+    ),
+    'local weekday ahead of utc': (
+        [_rule(0, '09:00', '10:00', minutes=60, tz='Pacific/Kiritimati')],
+        date(2025, 3, 10),
+        [('2025-03-09 19:00', '2025-03-09 20:00')],
+    ),
+    'spring forward skips the gap': (
+        [_rule(6, '01:00', '04:00', tz='America/New_York')],
+        date(2025, 3, 9),
+        [('2025-03-09 06:00', '2025-03-09 06:30'),
+         ('2025-03-09 06:30', '2025-03-09 07:00'),
+         ('2025-03-09 07:00', '2025-03-09 07:30'),
+         ('2025-03-09 07:30', '2025-03-09 08:00')],
+    ),
+    'fall back uses first occurrence': (
+        [_rule(6, '00:30', '02:30', tz='America/New_York')],
+        date(2025, 11, 2),
+        [('2025-11-02 04:30', '2025-11-02 05:00'),
+         ('2025-11-02 05:00', '2025-11-02 05:30'),
+         ('2025-11-02 05:30', '2025-11-02 06:00'),
+         ('2025-11-02 07:00', '2025-11-02 07:30')],
+    ),
+    'half-hour dst shift': (
+        [_rule(6, '01:00', '03:00', minutes=60, tz='Australia/Lord_Howe')],
+        date(2025, 4, 6),
+        [('2025-04-05 14:00', '2025-04-05 15:00'),
+         ('2025-04-05 15:30', '2025-04-05 16:30')],
+    ),
+    'day after a transition': (
+        [_rule(0, '09:00', '10:00', minutes=60, tz='Europe/London')],
+        date(2025, 3, 31),
+        [('2025-03-31 08:00', '2025-03-31 09:00')],
+    ),
+}
+
+# Zones for the year-long comparison with the reference expansion
+REFERENCE_ZONES = [
+    'America/New_York',
+    'America/Santiago',
+    'America/Havana',
+    'Europe/London',
+    'Australia/Lord_Howe',
+    'Pacific/Chatham',
+    'Asia/Tehran',
+    'Asia/Bangkok',
+]
+
+
+def _reference_slots(rules, start_date, end_date):
+    """Localize every slot separately: slow, but obviously right."""
+    slots = set()
+    day = start_date
+    while day <= end_date:
+        for rule in rules:
+            if rule.weekday != day.weekday():
+                continue
+            tz = ZoneInfo(rule.timezone)
+            duration = timedelta(minutes=rule.slot_duration_minutes)
+            local = datetime.combine(day, rule.start_time)
+            while local + duration <= datetime.combine(day, rule.end_time):
+                utc = local.replace(tzinfo=tz).astimezone(UTC)
+                if utc.astimezone(tz).replace(tzinfo=None) == local:
+                    slots.add((utc, utc + duration))
+                local += duration
+        day += timedelta(days=1)
+    return sorted(slots)
+
+
+class SlotEngineTests(SimpleTestCase):
+    def test_edge_cases(self):
+        for name, (rules, day, expected) in EDGE_CASES.items():
+            with self.subTest(name):
+                self.assertEqual(
+                    SlotEngine(rules).expand(day, day),
+                    [(_utc(start), _utc(end)) for start, end in expected],
+                )
+
+    def test_year_matches_reference(self):
+        start_date, end_date = date(2025, 1, 1), date(2025, 12, 31)
+        for tz in REFERENCE_ZONES:
+            with self.subTest(tz):
+                rules = [
+                    _rule(weekday, '00:00', '23:45', minutes=45, tz=tz)
+                    for weekday in range(7)
+                ]
+                self.assertEqual(
+                    SlotEngine(rules).expand(start_date, end_date),
+                    _reference_slots(rules, start_date, end_date),
+                )
+
+    def test_sweep_matches_pairwise_overlap(self):
+        rng = random.Random(0)
+        base = _utc('2025-01-01 00:00')
+
+        def interval(start, minutes):
+            return (
+                base + timedelta(minutes=start),
+                base + timedelta(minutes=start + minutes),
+            )
+
+        slots = sorted({
+            interval(rng.randrange(0, 10000, 15), rng.choice([15, 30, 60, 120]))
+            for _ in range(2000)
+        })
+        busy = [
+            interval(rng.randrange(10000), rng.randrange(1, 90)) for _ in range(300)
+        ]
+        marked = mark_slots(slots, busy[:150], busy[150:])
+        expected = [
+            not any(
+                start < busy_end and end > busy_start for busy_start, busy_end in busy
+            )
+            for start, end in slots
+        ]
+        self.assertEqual([slot['is_available'] for slot in marked], expected)
+
+
+class BookedIntervalsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.mentor = User.objects.create_user(
+            email='mentor@example.com',
+            username='mentor',
+            password='secret',
+            user_type='mentor',
+        )
+        cls.founder = User.objects.create_user(
+            email='founder@example.com',
+            username='founder',
+            password='secret',
+            user_type='founder',
+        )
+
+    def _book(self, start, end, status='confirmed'):
+        Booking.objects.create(
+            mentor=self.mentor,
+            founder=self.founder,
+            start_time=_utc(start),
+            end_time=_utc(end),
+            status=status,
+        )
+
+    def test_overlapping_bookings_of_any_length(self):
+        # The serializer accepts any end_time, so bookings can outlast a slot
+        self._book('2025-03-10 01:00', '2025-03-10 09:00')
+        self._book('2025-03-10 07:30', '2025-03-10 08:30')
+        self._book('2025-03-10 09:30', '2025-03-10 10:30')
+        self._book('2025-03-10 05:00', '2025-03-10 06:00')
+        self._book('2025-03-10 08:00', '2025-03-10 09:00', 'cancelled_by_founder')
+
+        intervals = booked_intervals(
+            [self.mentor.pk], _utc('2025-03-10 08:00'), _utc('2025-03-10 10:00')
+        )
+        self.assertEqual(
+            sorted(intervals[self.mentor.pk]),
+            [
+                (_utc('2025-03-10 01:00'), _utc('2025-03-10 09:00')),
+                (_utc('2025-03-10 07:30'), _utc('2025-03-10 08:30')),
+                (_utc('2025-03-10 09:30'), _utc('2025-03-10 10:30')),
+            ],
+        )
+
+
+class BookingListConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.mentor = User.objects.create_user(
+            email='mentor@example.com',
+            username='mentor',
+            password='secret',
+            user_type='mentor',
+        )
+        cls.founder = User.objects.create_user(
+            email='founder@example.com',
+            username='founder',
+            password='secret',
+            user_type='founder',
+        )
+        cls.bookings = [
+            Booking.objects.create(
+                mentor=cls.mentor,
+                founder=cls.founder,
+                start_time=_utc(start),
+                end_time=_utc(start) + timedelta(minutes=30),
+            )
+            for start in ('2025-03-10 02:00', '2025-03-11 02:00')
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.founder)
+
+    def test_deletion_changes_the_response(self):
+        first = self.client.get('/api/office-hours/bookings/')
+        self.assertEqual(first.status_code, 200)
+        self.assertFalse(first.has_header('Last-Modified'))
+
+        self.bookings[0].delete()
+        response = self.client.get(
+            '/api/office-hours/bookings/',
+            HTTP_IF_NONE_MATCH=first['ETag'],
+            HTTP_IF_MODIFIED_SINCE=http_date(),
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [booking['id'] for booking in response.json()['results']],
+            [self.bookings[1].pk],
+        )
+
+
+def _next_monday():
+    """Midnight UTC of a Monday one to two weeks ahead, safely in the future."""
+    today = timezone.now().date()
+    return datetime.combine(today + timedelta(days=14 - today.weekday()), time(), UTC)
+
+
+def _mentor(name, weekday, start, end, is_approved=True):
+    mentor = User.objects.create_user(
+        email=f'{name}@example.com',
+        username=name,
+        password='secret',
+        user_type='mentor',
+        is_approved=is_approved,
+    )
+    MentorProfile.objects.create(
+        user=mentor, company='Acme', role='CTO', years_of_experience=10
+    )
+    AvailabilityRule.objects.create(
+        mentor=mentor,
+        weekday=weekday,
+        start_time=datetime.strptime(start, '%H:%M').time(),
+        end_time=datetime.strptime(end, '%H:%M').time(),
+        timezone='UTC',
+    )
+    return mentor
+
+
+class SlotSearchTests(TestCase):
+    """Mentors come back soonest free slot first, ties broken by user id."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.monday = _next_monday()
+        cls.tuesday_mentor = _mentor('tuesday', 1, '09:00', '10:00')
+        cls.booked_mentor = _mentor('booked', 0, '09:00', '10:00')
+        cls.early_mentor = _mentor('early', 0, '09:00', '10:00')
+        cls.second_early_mentor = _mentor('second', 0, '09:00', '10:00')
+        _mentor('pending', 0, '08:00', '10:00', is_approved=False)
+        cls.founder = User.objects.create_user(
+            email='founder@example.com',
+            username='founder',
+            password='secret',
+            user_type='founder',
+        )
+        Booking.objects.create(
+            mentor=cls.booked_mentor,
+            founder=cls.founder,
+            start_time=cls.monday + timedelta(hours=9),
+            end_time=cls.monday + timedelta(hours=9, minutes=30),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.founder)
+
+    def _search(self, **params):
+        response = self.client.get('/api/office-hours/slots/search/', {
+            'start': self.monday.isoformat(),
+            'end': (self.monday + timedelta(days=2)).isoformat(),
+            **params,
+        })
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def _ranked(self, results):
+        return [
+            (
+                result['mentor']['user']['id'],
+                datetime.fromisoformat(result['next_slot']['start_time']),
+            )
+            for result in results
+        ]
+
+    def _at(self, **offset):
+        return self.monday + timedelta(**offset)
+
+    def test_ordering(self):
+        nine = self._at(hours=9)
+        results = self._search()['results']
+        self.assertEqual(self._ranked(results), [
+            (self.early_mentor.pk, nine),
+            (self.second_early_mentor.pk, nine),
+            (self.booked_mentor.pk, self._at(hours=9, minutes=30)),
+            (self.tuesday_mentor.pk, self._at(days=1, hours=9)),
+        ])
+        self.assertEqual(len(results[0]['slots']), 2)
+        self.assertTrue(all(result['calendar_checked'] for result in results))
+
+    def test_paging(self):
+        with mock.patch.object(PageNumberPagination, 'page_size', 3):
+            first = self._search()
+            second = self._search(page=2)
+        self.assertEqual(first['count'], 4)
+        self.assertIsNotNone(first['next'])
+        self.assertEqual(
+            [result['mentor']['user']['id'] for result in first['results']],
+            [self.early_mentor.pk, self.second_early_mentor.pk, self.booked_mentor.pk],
+        )
+        self.assertEqual(
+            [result['mentor']['user']['id'] for result in second['results']],
+            [self.tuesday_mentor.pk],
+        )
+
+
+class FakeFreeBusy:
+    """
+    Stands in for the calendar API client. Answers each mentor by access
+    token: their busy periods, or a stall until `release` for 'slow'.
+    """
+
+    def __init__(self, busy=None):
+        self.busy = busy or {}
+        self.calls = []
+        self.release = threading.Event()
+
+    def freebusy(self):
+        return self
+
+    def query(self, body):
+        return mock.Mock(execute=lambda http: self._answer(body, http))
+
+    def _answer(self, body, http):
+        token = http.credentials.token
+        self.calls.append(token)
+        if token == 'slow':
+            self.release.wait(10)
+        return {'calendars': {'primary': {'busy': [
+            {'start': start.isoformat(), 'end': end.isoformat()}
+            for start, end in self.busy.get(token, [])
+        ]}}}
+
+
+def _connect_calendar(user, access_token):
+    GoogleCalendarToken.objects.create(
+        user=user,
+        access_token=access_token,
+        refresh_token='refresh',
+        expires_at=timezone.now() + timedelta(hours=1),
+        scope='calendar.readonly',
+    )
+
+
+class BusyCacheTests(TestCase):
+    """Busy periods are fetched once per window and refetched after a bump."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.monday = _next_monday()
+        cls.mentor = _mentor('mentor', 0, '09:00', '10:00')
+        cls.founder = User.objects.create_user(
+            email='founder@example.com',
+            username='founder',
+            password='secret',
+            user_type='founder',
+        )
+        _connect_calendar(cls.mentor, 'mentor')
+
+    def setUp(self):
+        cache.clear()
+        self.meeting = [
+            (self.monday + timedelta(hours=9), self.monday + timedelta(hours=10))
+        ]
+        self.calendar = FakeFreeBusy({'mentor': self.meeting})
+        patcher = mock.patch.object(
+            google_calendar_service, '_calendar', return_value=self.calendar
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _busy(self, start, end):
+        busy, unchecked = google_calendar_service.get_busy_times_many(
+            [self.mentor.pk], self.monday + start, self.monday + end
+        )
+        self.assertEqual(unchecked, set())
+        return busy[self.mentor.pk]
+
+    def test_hits_misses_and_invalidation(self):
+        day = (timedelta(), timedelta(days=1))
+
+        self.assertEqual(self._busy(*day), self.meeting)
+        self.assertEqual(len(self.calendar.calls), 1)
+        self.assertEqual(busy_cache.stats(), {'hits': 0, 'misses': 1})
+
+        # Narrower and later windows come from the cached entry
+        self.assertEqual(self._busy(*day), self.meeting)
+        self.assertEqual(self._busy(timedelta(days=1), timedelta(days=2)), [])
+        self.assertEqual(len(self.calendar.calls), 1)
+        self.assertEqual(busy_cache.stats(), {'hits': 2, 'misses': 1})
+
+        # A new booking bumps the mentor's version
+        with self.captureOnCommitCallbacks(execute=True):
+            Booking.objects.create(
+                mentor=self.mentor,
+                founder=self.founder,
+                start_time=self.monday + timedelta(hours=12),
+                end_time=self.monday + timedelta(hours=13),
+            )
+        self.assertEqual(self._busy(*day), self.meeting)
+        self.assertEqual(len(self.calendar.calls), 2)
+        self.assertEqual(busy_cache.stats(), {'hits': 2, 'misses': 2})
+
+    def test_fetch_in_flight_during_invalidation_is_not_served(self):
+        start, end = self.monday, self.monday + timedelta(days=1)
+        _, missing = busy_cache.lookup([self.mentor.pk], start, end)
+        busy_cache.invalidate(self.mentor.pk)
+        # The fetch that started before the bump stores under its old version
+        busy_cache.store(self.mentor.pk, missing[self.mentor.pk], start, end, [])
+
+        found, missing = busy_cache.lookup([self.mentor.pk], start, end)
+        self.assertEqual(found, {})
+        self.assertEqual(list(missing), [self.mentor.pk])
+
+
+class CalendarBudgetTests(TestCase):
+    """
+    A calendar still loading when the budget runs out doesn't hold up the
+    search: its mentor is listed unchecked, and the fetch fills the cache.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.monday = _next_monday()
+        cls.fast = _mentor('fast', 0, '09:00', '10:00')
+        cls.slow = _mentor('slow', 0, '09:00', '10:00')
+        cls.founder = User.objects.create_user(
+            email='founder@example.com',
+            username='founder',
+            password='secret',
+            user_type='founder',
+        )
+        _connect_calendar(cls.fast, 'fast')
+        _connect_calendar(cls.slow, 'slow')
+
+    def setUp(self):
+        cache.clear()
+        meeting = (
+            self.monday + timedelta(hours=9),
+            self.monday + timedelta(hours=9, minutes=30),
+        )
+        self.calendar = FakeFreeBusy({'fast': [meeting]})
+        patcher = mock.patch.object(
+            google_calendar_service, '_calendar', return_value=self.calendar
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.calendar.release.set)
+        self.client = APIClient()
+        self.client.force_authenticate(self.founder)
+
+    def _search(self):
+        response = self.client.get('/api/office-hours/slots/search/', {
+            'start': self.monday.isoformat(),
+            'end': (self.monday + timedelta(days=1)).isoformat(),
+        })
+        self.assertEqual(response.status_code, 200)
+        return {
+            result['mentor']['user']['id']: (
+                datetime.fromisoformat(result['next_slot']['start_time']),
+                result['calendar_checked'],
+            )
+            for result in response.json()['results']
+        }
+
+    @override_settings(CALENDAR_BUSY_BUDGET=0.2)
+    def test_partial_results_within_budget(self):
+        nine = self.monday + timedelta(hours=9)
+        half_past = self.monday + timedelta(hours=9, minutes=30)
+        self.assertEqual(self._search(), {
+            self.fast.pk: (half_past, True),
+            self.slow.pk: (nine, False),
+        })
+
+        self.calendar.release.set()
+        deadline = clock.monotonic() + 5
+        while busy_cache.lookup(
+            [self.slow.pk], self.monday, self.monday + timedelta(days=1)
+        )[1]:
+            self.assertLess(clock.monotonic(), deadline)
+            clock.sleep(0.01)
+
+        self.assertEqual(self._search(), {
+            self.fast.pk: (half_past, True),
+            self.slow.pk: (nine, True),
+        })
+        self.assertEqual(sorted(self.calendar.calls), ['fast', 'slow'])
+
+
+class CalendarClientReuseTests(SimpleTestCase):
+    """Each thread builds one client per endpoint and keeps its connection pool."""
+
+    def test_clients_are_reused_per_thread_and_endpoint(self):
+        service = GoogleCalendarService()
+        client = service._calendar()
+        self.assertIs(service._calendar(), client)
+        self.assertIs(service._http(), service._http())
+
+        other_thread = {}
+        thread = threading.Thread(
+            target=lambda: other_thread.update(
+                client=service._calendar(), http=service._http()
+            )
+        )
+        thread.start()
+        thread.join()
+        self.assertIsNot(other_thread['client'], client)
+        self.assertIsNot(other_thread['http'], service._http())
+
+        with override_settings(GOOGLE_CALENDAR_API_ENDPOINT='http://127.0.0.1:9/'):
+            local = service._calendar()
+            self.assertIsNot(local, client)
+            self.assertIs(service._calendar(), local)
+            self.assertTrue(local._baseUrl.startswith('http://127.0.0.1:9/'))
+        self.assertIs(service._calendar(), client)
@@ -8,6 +8,7 @@ from .views import (
     CalendarDisconnectView,
     AvailabilityViewSet,
     MentorSlotsView,
+    SlotSearchView,
     BookingViewSet,
 )
 
@@ -24,6 +25,7 @@ urlpatterns = [
 
     # Mentor slots
     path('mentors/<int:mentor_id>/slots/', MentorSlotsView.as_view(), name='mentor-slots'),
+    path('slots/search/', SlotSearchView.as_view(), name='slot-search'),
 
     # Router URLs
     path('', include(router.urls)),
@@ -1,15 +1,22 @@
 from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
 
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db.models import Count, Max, Q
 from django.utils import timezone
-from rest_framework import status, viewsets
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import generics, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.views import APIView
 
+from profiles.cards import get_cards
+from profiles.filters import MentorFilterSet
+from profiles.models import MentorProfile
+from sapan.conditional import ConditionalGetMixin
+from sapan.fast_serialization import ValuesListMixin
+from sapan.sparse_fields import SparseFieldsetViewMixin
 from .models import GoogleCalendarToken, AvailabilityRule, Booking
 from .serializers import (
     GoogleCalendarTokenSerializer,
@@ -18,8 +25,15 @@ from .serializers import (
     BookingSerializer,
     BookingCreateSerializer,
     TimeSlotSerializer,
+    SlotSearchSerializer,
 )
 from .services.google_calendar import google_calendar_service
+from .services.slots import (
+    SlotEngine,
+    booked_intervals,
+    find_available_slots,
+    mark_slots,
+)
 from .services.email_service import send_booking_confirmation, send_booking_cancellation
 
 User = get_user_model()
@@ -105,6 +119,7 @@ class AvailabilityViewSet(viewsets.ModelViewSet):
     """CRUD for availability rules."""
     serializer_class = AvailabilityRuleSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ('weekday', 'start_time', 'id')
 
     def get_queryset(self):
         return AvailabilityRule.objects.filter(mentor=self.request.user)
@@ -143,101 +158,123 @@ class MentorSlotsView(APIView):
 
         end_date = start_date + timedelta(days=days)
 
-        # Get mentor's availability rules
-        rules = AvailabilityRule.objects.filter(
-            mentor=mentor,
-            is_active=True
-        )
-
-        if not rules.exists():
+        rules = list(AvailabilityRule.objects.filter(mentor=mentor, is_active=True))
+        if not rules:
             return Response({'slots': [], 'message': 'Mentor has no availability set'})
 
-        # Generate all possible slots
-        slots = []
-        current_date = start_date
-
-        while current_date <= end_date:
-            weekday = current_date.weekday()
+        now = timezone.now()
+        candidates = SlotEngine(rules).expand(start_date, end_date, after=now)
+        if candidates:
+            window_start = candidates[0][0]
+            window_end = max(end for _, end in candidates)
+            booked = booked_intervals([mentor.pk], window_start, window_end)[mentor.pk]
 
-            for rule in rules.filter(weekday=weekday):
-                tz = ZoneInfo(rule.timezone)
-                slot_start = datetime.combine(current_date, rule.start_time, tzinfo=tz)
-                slot_end_time = datetime.combine(current_date, rule.end_time, tzinfo=tz)
+            # Check Google Calendar conflicts, within the latency budget
+            busy_times, unchecked = google_calendar_service.get_busy_times_many(
+                [mentor.pk], window_start, window_end
+            )
+            busy_times = busy_times.get(mentor.pk, [])
+            calendar_checked = mentor.pk not in unchecked
+        else:
+            booked = busy_times = []
+            calendar_checked = True
 
-                while slot_start + timedelta(minutes=rule.slot_duration_minutes) <= slot_end_time:
-                    slot_end = slot_start + timedelta(minutes=rule.slot_duration_minutes)
+        slots = mark_slots(candidates, booked, busy_times)
 
-                    # Only include future slots
-                    if slot_start > timezone.now():
-                        slots.append({
-                            'start_time': slot_start,
-                            'end_time': slot_end,
-                            'is_available': True
-                        })
+        # Return serialized slots
+        serializer = TimeSlotSerializer(slots, many=True)
+        return Response({'slots': serializer.data, 'calendar_checked': calendar_checked})
 
-                    slot_start = slot_end
 
-            current_date += timedelta(days=1)
+class SlotSearchView(generics.ListAPIView):
+    """
+    Free slots across mentors: approved mentors matching the directory's
+    industry/objective filters with availability between `start` and `end`,
+    soonest free slot first. `calendar_checked` is false for mentors whose
+    Google Calendar couldn't be read in time.
+    """
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = MentorFilterSet
+    # The ordering is computed in memory, so no keyset mode
+    pagination_class = PageNumberPagination
 
-        # Check for existing bookings
-        existing_bookings = Booking.objects.filter(
-            mentor=mentor,
-            status='confirmed',
-            start_time__gte=timezone.now(),
-            start_time__date__lte=end_date
-        )
+    def get_queryset(self):
+        return MentorProfile.objects.filter(user__is_approved=True).only('id', 'user_id')
 
-        booked_times = set()
-        for booking in existing_bookings:
-            booked_times.add(booking.start_time.isoformat())
+    def list(self, request, *args, **kwargs):
+        params = SlotSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
 
-        # Check Google Calendar conflicts
-        busy_times = []
-        try:
-            busy_times = google_calendar_service.get_busy_times(
-                mentor,
-                timezone.now(),
-                datetime.combine(end_date, datetime.max.time(), tzinfo=ZoneInfo('UTC'))
-            )
-        except Exception:
-            pass  # Calendar not connected or error - continue without
-
-        # Mark unavailable slots
-        for slot in slots:
-            # Check if already booked
-            if slot['start_time'].isoformat() in booked_times:
-                slot['is_available'] = False
-                continue
-
-            # Check Google Calendar conflicts
-            for busy_start, busy_end in busy_times:
-                if slot['start_time'] < busy_end and slot['end_time'] > busy_start:
-                    slot['is_available'] = False
-                    break
+        mentors = self.filter_queryset(self.get_queryset())
+        available, unchecked = find_available_slots(
+            mentors.values('user_id'),
+            params.validated_data['start'],
+            params.validated_data['end'],
+        )
+        ranked = sorted(
+            available.items(), key=lambda item: (item[1][0]['start_time'], item[0])
+        )
 
-        # Return serialized slots
-        serializer = TimeSlotSerializer(slots, many=True)
-        return Response({'slots': serializer.data})
+        page = self.paginate_queryset(ranked)
+        profile_ids = dict(
+            mentors.filter(
+                user_id__in=[mentor_id for mentor_id, _ in page]
+            ).values_list('user_id', 'id')
+        )
+        cards = dict(get_cards(
+            'mentor', [profile_ids[mentor_id] for mentor_id, _ in page], request
+        ))
+        return self.get_paginated_response([
+            {
+                'mentor': cards[profile_ids[mentor_id]],
+                'next_slot': TimeSlotSerializer(slots[0]).data,
+                'slots': TimeSlotSerializer(slots, many=True).data,
+                'calendar_checked': mentor_id not in unchecked,
+            }
+            for mentor_id, slots in page
+            if profile_ids[mentor_id] in cards
+        ])
 
 
 # ============ Booking Views ============
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(
+    ConditionalGetMixin, ValuesListMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet
+):
     """Booking management."""
     serializer_class = BookingSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ('-start_time', 'id')
+    sparse_related = {'mentor_info': ['mentor'], 'founder_info': ['founder']}
 
     def get_queryset(self):
         user = self.request.user
-        return Booking.objects.filter(
-            Q(mentor=user) | Q(founder=user)
-        ).select_related('mentor', 'founder')
+        return self.select_sparse_related(
+            Booking.objects.filter(Q(mentor=user) | Q(founder=user))
+        )
 
     def get_serializer_class(self):
         if self.action == 'create':
             return BookingCreateSerializer
         return BookingSerializer
 
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def get_validators(self, request, *args, **kwargs):
+        # Count catches deletions; the user maxes catch mentor_info/founder_info edits.
+        # No Last-Modified: a deletion can't move a timestamp forward, so an
+        # If-Modified-Since check would answer 304 for a changed list
+        user = request.user
+        state = Booking.objects.filter(Q(mentor=user) | Q(founder=user)).aggregate(
+            count=Count('id'),
+            updated=Max('updated_at'),
+            mentor_updated=Max('mentor__updated_at'),
+            founder_updated=Max('founder__updated_at'),
+        )
+        return tuple(state.values()), None
+
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
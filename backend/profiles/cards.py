@@ -0,0 +1,252 @@
+"""
+Profile card read model.
+
+Directory cards (the MentorListSerializer / FounderListSerializer output minus
+the viewer-specific connection fields) are stored pre-rendered in ProfileCard,
+so list and detail views render a page with one indexed query instead of the
+user join plus industry/objective prefetches. Filtering and ranking still run
+against the profile tables and their search indexes.
+"""
+from django.conf import settings
+from django.db.models.fields.json import KeyTransform
+
+from connections.services.connection_graph import get_viewer_graph
+from connections.services.network import mutual_counts
+from sapan.fast_serialization import ValuesRenderer
+from sapan.sparse_fields import sparse_fieldset
+
+from .models import FounderProfile, MentorProfile, ProfileCard
+from .serializers import FounderListSerializer, MentorListSerializer
+
+# Filled in per viewer at render time
+VIEWER_FIELDS = ("is_connected", "connection_status", "mutual_count")
+
+CARD_SOURCES = {
+    "mentor": (
+        MentorListSerializer,
+        lambda: MentorProfile.objects.select_related("user").prefetch_related(
+            "expertise_industries", "can_help_with"
+        ),
+    ),
+    "founder": (
+        FounderListSerializer,
+        lambda: FounderProfile.objects.select_related("user", "industry").prefetch_related(
+            "objectives"
+        ),
+    ),
+}
+
+
+def refresh_cards(kind, profile_ids):
+    """
+    Re-render and upsert the cards for the given profile ids; ids whose
+    profile no longer exists are deleted. Returns {profile_id: ProfileCard}.
+    """
+    profile_ids = set(profile_ids)
+    if not profile_ids:
+        return {}
+
+    serializer_class, get_queryset = CARD_SOURCES[kind]
+    if settings.FAST_SERIALIZATION:
+        renderer = ValuesRenderer(
+            serializer_class(),
+            fields=[f for f in serializer_class.Meta.fields if f not in VIEWER_FIELDS],
+        )
+        rows = list(
+            renderer.values(
+                serializer_class.Meta.model.objects.filter(pk__in=profile_ids),
+                "id",
+                "user_id",
+                "user__is_approved",
+            )
+        )
+        sources = [
+            (row["id"], row["user_id"], row["user__is_approved"]) for row in rows
+        ]
+        rendered = renderer.render(rows)
+    else:
+        profiles = list(get_queryset().filter(pk__in=profile_ids))
+        sources = [
+            (profile.pk, profile.user_id, profile.user.is_approved)
+            for profile in profiles
+        ]
+        rendered = serializer_class(profiles, many=True).data
+
+    cards = []
+    for (profile_id, user_id, is_approved), data in zip(sources, rendered):
+        for field in VIEWER_FIELDS:
+            data.pop(field, None)
+        cards.append(
+            ProfileCard(
+                kind=kind,
+                profile_id=profile_id,
+                user_id=user_id,
+                is_approved=is_approved,
+                data=data,
+            )
+        )
+
+    if cards:
+        ProfileCard.objects.bulk_create(
+            cards,
+            update_conflicts=True,
+            unique_fields=["kind", "profile_id"],
+            update_fields=["user", "is_approved", "data", "updated_at"],
+        )
+
+    stale = profile_ids - {card.profile_id for card in cards}
+    if stale:
+        ProfileCard.objects.filter(kind=kind, profile_id__in=stale).delete()
+
+    return {card.profile_id: card for card in cards}
+
+
+def refresh_user_cards(user):
+    refresh_cards(
+        "mentor", MentorProfile.objects.filter(user=user).values_list("pk", flat=True)
+    )
+    refresh_cards(
+        "founder", FounderProfile.objects.filter(user=user).values_list("pk", flat=True)
+    )
+
+
+def render_cards(kind, profiles, request):
+    """
+    Render the cards for `profiles` (instances exposing pk and user_id) in
+    order, with the viewer's connection fields filled in. Honors the
+    request's sparse fieldset.
+    """
+    profiles = list(profiles)
+    cards = get_cards(kind, [profile.pk for profile in profiles], request)
+    return [card for _, card in cards]
+
+
+def get_cards(kind, profile_ids, request, approved_only=False):
+    """
+    Render the visible cards among `profile_ids` as (profile_id, card) pairs
+    in the given order; ids that don't exist or aren't visible are skipped.
+    Two queries regardless of how many ids are asked for, plus one when some
+    ids have no card.
+    """
+    serializer_class = CARD_SOURCES[kind][0]
+    fields = sparse_fieldset(request, serializer_class.Meta.fields)
+    cards = _load_cards(kind, profile_ids, fields)
+
+    missing = [profile_id for profile_id in profile_ids if profile_id not in cards]
+    if missing:
+        # Not built yet, e.g. before the first rebuild_profile_cards run. Ids
+        # without a profile are only looked up, so clients can't force writes.
+        unbuilt = serializer_class.Meta.model.objects.filter(
+            pk__in=missing
+        ).values_list("pk", flat=True)
+        cards.update(
+            (profile_id, (card.user_id, card.is_approved, card.data))
+            for profile_id, card in refresh_cards(kind, unbuilt).items()
+        )
+    if approved_only:
+        cards = {
+            profile_id: card for profile_id, card in cards.items() if card[1]
+        }
+
+    graph = _viewer_graph(fields, request)
+    # Mutual connections for the whole page in one pass
+    mutual = (
+        mutual_counts(graph, [user_id for user_id, _, _ in cards.values()])
+        if "mutual_count" in fields
+        else {}
+    )
+
+    results = []
+    for profile_id in profile_ids:
+        if profile_id in cards:
+            user_id, _, data = cards[profile_id]
+            results.append(
+                (
+                    profile_id,
+                    _finish_card(data, user_id, fields, graph, mutual, request),
+                )
+            )
+    return results
+
+
+def _load_cards(kind, ids, fields):
+    """
+    {profile_id: (user_id, is_approved, card data)}, reading only the JSON
+    keys in `fields`.
+    """
+    cards = ProfileCard.objects.filter(kind=kind, profile_id__in=ids)
+    card_fields = [field for field in fields if field not in VIEWER_FIELDS]
+    all_fields = CARD_SOURCES[kind][0].Meta.fields
+    if len(card_fields) + len(VIEWER_FIELDS) >= len(all_fields):
+        rows = cards.values_list("profile_id", "user_id", "is_approved", "data")
+        return {row[0]: row[1:] for row in rows}
+
+    rows = cards.values_list(
+        "profile_id",
+        "user_id",
+        "is_approved",
+        *[KeyTransform(field, "data") for field in card_fields],
+    )
+    return {
+        row[0]: (row[1], row[2], dict(zip(card_fields, row[3:]))) for row in rows
+    }
+
+
+def get_card(kind, profile_id, request, approved_only=False):
+    """Render a single card, or None if the profile doesn't exist or isn't visible."""
+    cards = get_cards(kind, [profile_id], request, approved_only=approved_only)
+    return cards[0][1] if cards else None
+
+
+def card_validators(kind, profile_id, request, approved_only=False):
+    """
+    (etag_parts, last_modified) for a single card without loading its data,
+    or None if the card isn't built or isn't visible.
+    """
+    cards = ProfileCard.objects.filter(kind=kind, profile_id=profile_id)
+    if approved_only:
+        cards = cards.filter(is_approved=True)
+    row = cards.values_list("user_id", "updated_at").first()
+    if row is None:
+        return None
+
+    user_id, updated_at = row
+    # The viewer's connection to the profile is part of the representation
+    graph = get_viewer_graph(request)
+    viewer = (
+        (
+            graph.is_connected(user_id),
+            graph.status(user_id),
+            mutual_counts(graph, [user_id])[user_id],
+        )
+        if graph is not None
+        else None
+    )
+    return (updated_at, viewer), updated_at
+
+
+def _viewer_graph(fields, request):
+    """The viewer's connection graph, unless no viewer field was requested."""
+    if not any(field in fields for field in VIEWER_FIELDS):
+        return None
+    return get_viewer_graph(request)
+
+
+def _finish_card(data, user_id, fields, graph, mutual, request):
+    data = {field: data[field] for field in fields if field in data}
+    if "is_connected" in fields:
+        data["is_connected"] = graph.is_connected(user_id) if graph else False
+    if "connection_status" in fields:
+        data["connection_status"] = graph.status(user_id) if graph else None
+    if "mutual_count" in fields:
+        data["mutual_count"] = mutual.get(user_id, 0)
+
+    # Stored photo URLs are relative; match what ImageField renders with a request
+    user = data.get("user")
+    if user and user.get("profile_photo") and request is not None:
+        user = dict(user)
+        user["profile_photo"] = request.build_absolute_uri(user["profile_photo"])
+        data["user"] = user
+
+    # jsonb doesn't keep key order; restore the serializer's field order
+    return {field: data[field] for field in fields if field in data}
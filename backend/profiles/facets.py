@@ -0,0 +1,135 @@
+"""
+Facet counts for the mentor/founder directories.
+
+Each facet family is one grouped aggregate over the ids matching the current
+search and filters. Results are cached per filter signature under a version
+stamp that profile signals bump, so a save invalidates every signature at once.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import FounderProfile, MentorProfile
+
+FACET_VERSION_KEY = "profiles:facets:version"
+
+# Query params that don't affect which profiles match
+IGNORED_PARAMS = {"page", "cursor", "pagination", "fields", "omit"}
+
+
+def bump_facet_version():
+    cache.set(FACET_VERSION_KEY, time.time_ns(), None)
+
+
+def _facet_version():
+    version = cache.get(FACET_VERSION_KEY)
+    if version is None:
+        # Evicted or never set: start a new version so old entries are unreachable
+        version = time.time_ns()
+        cache.add(FACET_VERSION_KEY, version, None)
+        version = cache.get(FACET_VERSION_KEY, version)
+    return version
+
+
+def _cache_key(kind, request):
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        if key not in IGNORED_PARAMS
+        for value in values
+    )
+    signature = hashlib.md5(urlencode(params).encode()).hexdigest()
+    return f"profiles:facets:{kind}:{_facet_version()}:{signature}"
+
+
+def cached_facets(kind, request, compute):
+    key = _cache_key(kind, request)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute()
+        cache.set(key, facets, settings.FACET_CACHE_TIMEOUT)
+    return facets
+
+
+def _counts(rows, id_field, slug_field):
+    return [
+        {"id": row[id_field], "slug": row[slug_field], "count": row["count"]}
+        for row in rows
+        if row[id_field] is not None
+    ]
+
+
+def mentor_facets(queryset):
+    ids = queryset.order_by().values("pk")
+    expertise = MentorProfile.expertise_industries.through.objects.filter(
+        mentorprofile_id__in=ids
+    )
+    help_with = MentorProfile.can_help_with.through.objects.filter(
+        mentorprofile_id__in=ids
+    )
+    return {
+        "industries": _counts(
+            expertise.values("industrysubcategory_id", "industrysubcategory__slug")
+            .annotate(count=Count("mentorprofile_id", distinct=True))
+            .order_by("industrysubcategory_id"),
+            "industrysubcategory_id",
+            "industrysubcategory__slug",
+        ),
+        "categories": _counts(
+            expertise.values(
+                "industrysubcategory__category_id",
+                "industrysubcategory__category__slug",
+            )
+            .annotate(count=Count("mentorprofile_id", distinct=True))
+            .order_by("industrysubcategory__category_id"),
+            "industrysubcategory__category_id",
+            "industrysubcategory__category__slug",
+        ),
+        "objectives": _counts(
+            help_with.values("objective_id", "objective__slug")
+            .annotate(count=Count("mentorprofile_id", distinct=True))
+            .order_by("objective_id"),
+            "objective_id",
+            "objective__slug",
+        ),
+    }
+
+
+def founder_facets(queryset):
+    founders = FounderProfile.objects.filter(pk__in=queryset.order_by().values("pk"))
+    objectives = FounderProfile.objectives.through.objects.filter(
+        founderprofile_id__in=queryset.order_by().values("pk")
+    )
+    return {
+        "industries": _counts(
+            founders.values("industry_id", "industry__slug")
+            .annotate(count=Count("id"))
+            .order_by("industry_id"),
+            "industry_id",
+            "industry__slug",
+        ),
+        "categories": _counts(
+            founders.values("industry__category_id", "industry__category__slug")
+            .annotate(count=Count("id"))
+            .order_by("industry__category_id"),
+            "industry__category_id",
+            "industry__category__slug",
+        ),
+        "objectives": _counts(
+            objectives.values("objective_id", "objective__slug")
+            .annotate(count=Count("founderprofile_id", distinct=True))
+            .order_by("objective_id"),
+            "objective_id",
+            "objective__slug",
+        ),
+        "stages": [
+            {"value": row["stage"], "count": row["count"]}
+            for row in founders.values("stage")
+            .annotate(count=Count("id"))
+            .order_by("stage")
+        ],
+    }
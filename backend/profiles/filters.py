@@ -0,0 +1,152 @@
+"""
+Industry filters for the mentor/founder directories.
+
+Each profile keeps a denormalized `industry_keys` array: the ids of its
+industry subcategories plus the negated ids of their categories (category
+and subcategory ids come from different tables, the sign keeps them apart).
+Any mix of selected categories and subcategories then resolves to a single
+GIN-indexed overlap (`&&`) predicate instead of joins through the taxonomy.
+
+The arrays are maintained by the profile signals with the SQL below, which
+also serves bulk loads. Migration 0006 backfilled them with its own frozen
+copy; keep the two in sync when the key layout changes.
+"""
+import django_filters
+from django.db import connection
+
+from industries.models import IndustryCategory, IndustrySubcategory
+from industries.reference_data import reference_data
+
+from .models import FounderProfile, MentorProfile
+
+REFRESH_SQL = {
+    "mentor": """
+    UPDATE profiles_mentorprofile AS p SET
+        industry_keys = array(
+            SELECT key FROM (
+                SELECT s.id AS key
+                FROM profiles_mentorprofile_expertise_industries AS e
+                JOIN industries_industrysubcategory AS s
+                    ON s.id = e.industrysubcategory_id
+                WHERE e.mentorprofile_id = p.id
+                UNION
+                SELECT -s.category_id
+                FROM profiles_mentorprofile_expertise_industries AS e
+                JOIN industries_industrysubcategory AS s
+                    ON s.id = e.industrysubcategory_id
+                WHERE e.mentorprofile_id = p.id
+            ) AS keys
+            ORDER BY key
+        )
+    WHERE %(ids)s IS NULL OR p.id = ANY(%(ids)s)
+    """,
+    "founder": """
+    UPDATE profiles_founderprofile AS p SET
+        industry_keys = array(
+            SELECT key
+            FROM industries_industrysubcategory AS s,
+                unnest(ARRAY[s.id, -s.category_id]) AS key
+            WHERE s.id = p.industry_id
+            ORDER BY key
+        )
+    WHERE %(ids)s IS NULL OR p.id = ANY(%(ids)s)
+    """,
+}
+
+
+def refresh_industry_keys(kind, profile_ids=None):
+    """Recompute `industry_keys` for the given profiles, or all of them."""
+    if profile_ids is not None:
+        profile_ids = list(profile_ids)
+        if not profile_ids:
+            return
+    with connection.cursor() as cursor:
+        cursor.execute(REFRESH_SQL[kind], {"ids": profile_ids})
+
+
+def _slug_keys():
+    return {
+        "industry": dict(IndustrySubcategory.objects.values_list("slug", "id")),
+        "industry_category": {
+            slug: -pk
+            for slug, pk in IndustryCategory.objects.values_list("slug", "id")
+        },
+    }
+
+
+def industry_keys(selection):
+    """
+    The `industry_keys` values matching {param: [slugs]}. Unknown slugs match
+    nothing.
+    """
+    slug_keys = reference_data.get("profile-industry-keys", _slug_keys)
+    return sorted(
+        {
+            slug_keys[param][slug]
+            for param, slugs in selection.items()
+            for slug in slugs
+            if slug in slug_keys[param]
+        }
+    )
+
+
+class SlugInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    pass
+
+
+class IndustryFilterSet(django_filters.FilterSet):
+    """
+    `industry` and `industry_category` take comma-separated slugs; a profile
+    matches when it is in any of the selected subcategories or categories.
+    """
+
+    # Param name -> taxonomy level, see _slug_keys()
+    industry_params = {
+        "industry": "industry",
+        "industry_category": "industry_category",
+    }
+
+    industry = SlugInFilter(method="select_industries")
+    industry_category = SlugInFilter(method="select_industries")
+
+    def select_industries(self, queryset, name, value):
+        # Applied together in filter_queryset() as one predicate
+        return queryset
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        selection = {}
+        for param, level in self.industry_params.items():
+            slugs = self.form.cleaned_data.get(param)
+            if slugs:
+                selection.setdefault(level, []).extend(slugs)
+        if selection:
+            queryset = queryset.filter(industry_keys__overlap=industry_keys(selection))
+        return queryset
+
+
+class MentorFilterSet(IndustryFilterSet):
+    # The subcategory filter the directory used before multi-select
+    industry_params = {
+        **IndustryFilterSet.industry_params,
+        "expertise_industries__slug": "industry",
+    }
+
+    expertise_industries__slug = SlugInFilter(method="select_industries")
+
+    class Meta:
+        model = MentorProfile
+        fields = {"can_help_with__slug": ["exact"]}
+
+
+class FounderFilterSet(IndustryFilterSet):
+    industry_params = {
+        **IndustryFilterSet.industry_params,
+        "industry__slug": "industry",
+    }
+
+    industry__slug = SlugInFilter(method="select_industries")
+
+    class Meta:
+        model = FounderProfile
+        fields = {"stage": ["exact"], "objectives__slug": ["exact"]}
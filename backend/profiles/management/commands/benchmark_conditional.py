@@ -0,0 +1,99 @@
+"""
+Time repeated polls of the conditional read endpoints with and without the
+client's ETag, to show the serialization and bandwidth a 304 saves.
+Usage: python manage.py benchmark_conditional [--polls 50]
+
+Covers the endpoints behind sapan.conditional: mentor and founder detail,
+/auth/me/, industries and the booking list. A full poll re-fetches without
+validators; a conditional poll sends If-None-Match with the ETag of the
+first response. Any conditional poll that doesn't answer 304 exits non-zero.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from office_hours.models import Booking
+from profiles.models import FounderProfile, MentorProfile
+
+
+class Command(BaseCommand):
+    help = "Benchmarks full against conditional (304) polls of read endpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--polls", type=int, default=50, help="Polls per endpoint")
+
+    def handle(self, *args, **options):
+        booking = Booking.objects.select_related("founder").first()
+        mentor = MentorProfile.objects.select_related("user").first()
+        founder = FounderProfile.objects.select_related("user").first()
+        if booking is None or mentor is None or founder is None:
+            raise CommandError(
+                "Needs profiles and bookings; run generate_synthetic_data"
+            )
+
+        viewer = booking.founder
+        endpoints = {
+            "mentor detail": f"/api/profiles/mentors/{mentor.pk}/",
+            "founder detail": f"/api/profiles/founders/{founder.pk}/",
+            "me": "/api/auth/me/",
+            "industries": "/api/industries/",
+            "bookings": "/api/office-hours/bookings/",
+        }
+
+        failures = 0
+        for name, path in endpoints.items():
+            first = self._get(path, viewer)
+            if first.status_code != 200 or not first.has_header("ETag"):
+                raise CommandError(f"{name}: {first.status_code} without an ETag")
+
+            full = self._poll(path, viewer, options["polls"])
+            conditional = self._poll(
+                path, viewer, options["polls"], HTTP_IF_NONE_MATCH=first["ETag"]
+            )
+            failures += conditional["statuses"] != {304}
+
+            self.stdout.write(
+                f"  {name:<15} "
+                f"full {full['ms']:6.2f} ms {full['bytes']:>6} B "
+                f"{full['queries']} queries | "
+                f"304 {conditional['ms']:6.2f} ms {conditional['bytes']:>4} B "
+                f"{conditional['queries']} queries | "
+                f"x{full['ms'] / conditional['ms']:.1f}, "
+                f"{full['bytes'] * options['polls'] / 1024:.0f} KiB saved "
+                f"over {options['polls']} polls"
+            )
+
+        if failures:
+            raise CommandError(f"{failures} endpoints didn't answer 304")
+        self.stdout.write(
+            self.style.SUCCESS("Successfully ran conditional GET benchmark!")
+        )
+
+    def _get(self, path, user, **headers):
+        request = APIRequestFactory().get(path, **headers)
+        force_authenticate(request, user=user)
+        match = resolve(path)
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, "render"):
+            response.render()  # 304s are plain HttpResponses, already final
+        return response
+
+    def _poll(self, path, user, polls, **headers):
+        """Mean time per poll, the body size and queries of the last one."""
+        statuses = set()
+        started = time.perf_counter()
+        for _ in range(polls):
+            with CaptureQueriesContext(connection) as queries:
+                response = self._get(path, user, **headers)
+            statuses.add(response.status_code)
+        elapsed = (time.perf_counter() - started) * 1000 / polls
+        return {
+            "ms": elapsed,
+            "bytes": len(response.content),
+            "queries": len(queries),
+            "statuses": statuses,
+        }
@@ -0,0 +1,143 @@
+"""
+Time directory search with the full-text engine against the ILIKE search
+it replaced, as the directory grows.
+Usage: python manage.py benchmark_search [--sizes 1000,10000,100000] [--repeat 5]
+           [--explain]
+
+Each size searches the first N profiles (by id) of each directory for a
+name, a misspelled name and a company/startup word, the way the list views
+do: a COUNT(*) plus the first page. "tsvector" is the full-text match on
+its own, "engine" adds the trigram fallback as ProfileSearchFilter does.
+--explain prints the engine's plan at the largest size, to check that the
+GIN indexes are used. Run generate_synthetic_data first to get 100k
+profiles.
+"""
+import time
+
+from django.contrib.postgres.search import SearchQuery
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.filters import SearchFilter
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory
+
+from profiles.models import FounderProfile, MentorProfile
+from profiles.search import SEARCH_CONFIG, ProfileSearchFilter
+
+# The search fields MentorListView / FounderListView used with SearchFilter
+LEGACY_SEARCH_FIELDS = {
+    "mentor": ["user__first_name", "user__last_name", "company", "user__bio"],
+    "founder": [
+        "user__first_name",
+        "user__last_name",
+        "startup_name",
+        "about_startup",
+    ],
+}
+
+DIRECTORIES = {
+    "mentor": (MentorProfile, "company"),
+    "founder": (FounderProfile, "startup_name"),
+}
+
+
+class LegacySearchView:
+    def __init__(self, search_fields):
+        self.search_fields = search_fields
+
+
+class Command(BaseCommand):
+    help = "Benchmarks full-text directory search against ILIKE search"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="1000,10000,100000",
+            help="Comma-separated directory sizes to search",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per measurement; the best one is reported",
+        )
+        parser.add_argument(
+            "--explain", action="store_true", help="Print the engine's query plan"
+        )
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options["sizes"].split(","))
+        for kind, (model, text_field) in DIRECTORIES.items():
+            total = model.objects.count()
+            if not total:
+                raise CommandError(f"No {kind} profiles; run generate_synthetic_data")
+
+            terms = self._terms(model, text_field, min(sizes[0], total))
+            sizes_run = [size for size in sizes if size <= total]
+            for size in sorted(set(sizes) - set(sizes_run)):
+                self.stdout.write(f"  {kind} x {size}: only {total} profiles, skipped")
+            for size in sizes_run:
+                bound = (
+                    model.objects.order_by("id")
+                    .values_list("id", flat=True)[size - 1 : size]
+                    .get()
+                )
+                queryset = model.objects.filter(id__lte=bound, user__is_approved=True)
+                for label, term in terms.items():
+                    engine = self._compare(
+                        kind, size, label, term, queryset, options["repeat"]
+                    )
+                if options["explain"] and size == sizes_run[-1]:
+                    self.stdout.write(engine.explain())
+
+        self.stdout.write(self.style.SUCCESS("Successfully ran search benchmark!"))
+
+    def _terms(self, model, text_field, size):
+        # A profile from the middle of the smallest size searched
+        middle = size // 2
+        profile = (
+            model.objects.select_related("user").order_by("id")[middle : middle + 1]
+        ).get()
+        name = profile.user.first_name or profile.user.last_name
+        word = max(getattr(profile, text_field).split(), key=len)
+        return {
+            "name": name,
+            # Drop a letter from the middle of the name
+            "misspelled": name[: len(name) // 2] + name[len(name) // 2 + 1 :],
+            "word": word,
+        }
+
+    def _compare(self, kind, size, label, term, queryset, repeat):
+        request = Request(
+            APIRequestFactory().get("/", {api_settings.SEARCH_PARAM: term})
+        )
+        legacy = SearchFilter().filter_queryset(
+            request, queryset, LegacySearchView(LEGACY_SEARCH_FIELDS[kind])
+        )
+        tsvector = queryset.filter(
+            search_vector=SearchQuery(
+                term, config=SEARCH_CONFIG, search_type="websearch"
+            )
+        )
+        engine = ProfileSearchFilter().filter_queryset(request, queryset, None)
+
+        line = f"  {kind} x {size:<6} {label:<10} {term!r:<14}"
+        for name, searched in (
+            ("ilike", legacy),
+            ("tsvector", tsvector),
+            ("engine", engine),
+        ):
+            elapsed, count = self._best(searched, repeat)
+            line += f" {name} {elapsed:7.1f} ms / {count:<5}"
+        self.stdout.write(line)
+        return engine
+
+    def _best(self, queryset, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            count = queryset.count()
+            list(queryset.values_list("id", flat=True)[: api_settings.PAGE_SIZE])
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best, count
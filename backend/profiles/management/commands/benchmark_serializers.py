@@ -0,0 +1,91 @@
+"""
+Compare DRF serializers with the values() fast path on the hot list payloads.
+Usage: python manage.py benchmark_serializers [--sizes 20,100,1000] [--repeat 5]
+
+Runs against the rows already in the database (see seed_data); pages larger
+than the table are capped at the table size.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from connections.models import ConnectionRequest
+from connections.serializers import ConnectionRequestSerializer
+from connections.views import FROM_USER_RELATED, TO_USER_RELATED
+from office_hours.models import Booking
+from office_hours.serializers import BookingSerializer
+from profiles.cards import CARD_SOURCES
+from sapan.fast_serialization import ValuesRenderer
+
+TARGETS = {
+    "mentors": CARD_SOURCES["mentor"],
+    "founders": CARD_SOURCES["founder"],
+    "bookings": (
+        BookingSerializer,
+        lambda: Booking.objects.select_related("mentor", "founder"),
+    ),
+    "requests": (
+        ConnectionRequestSerializer,
+        lambda: ConnectionRequest.objects.select_related(
+            *FROM_USER_RELATED, *TO_USER_RELATED
+        ),
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = "Benchmarks DRF serializers against the values() fast path"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="20,100,1000",
+            help="Comma-separated page sizes",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per measurement; the best one is reported",
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",")]
+        request = Request(APIRequestFactory().get("/"))
+        context = {"request": request}
+        renderer = JSONRenderer()
+
+        for name, (serializer_class, get_queryset) in TARGETS.items():
+            for size in sizes:
+
+                def drf():
+                    rows = list(get_queryset().order_by("pk")[:size])
+                    data = serializer_class(rows, many=True, context=context).data
+                    return renderer.render(data)
+
+                def values():
+                    engine = ValuesRenderer(serializer_class(context=context))
+                    rows = engine.values(get_queryset().order_by("pk"))[:size]
+                    return renderer.render(engine.render(rows))
+
+                drf_ms, drf_json = self._best(drf, options["repeat"])
+                values_ms, values_json = self._best(values, options["repeat"])
+                self.stdout.write(
+                    f"  {name:<9} {size:>5}  drf {drf_ms:8.2f} ms  "
+                    f"values {values_ms:8.2f} ms  x{drf_ms / values_ms:4.1f}  "
+                    + ("identical" if drf_json == values_json else "MISMATCH")
+                )
+
+        self.stdout.write(self.style.SUCCESS("Successfully ran serializer benchmark!"))
+
+    def _best(self, run, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = run()
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best, output
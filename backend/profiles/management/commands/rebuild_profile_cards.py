@@ -0,0 +1,52 @@
+"""
+Rebuild the denormalized profile cards.
+Usage: python manage.py rebuild_profile_cards [--kind mentor|founder] [--batch-size N]
+"""
+from django.core.management.base import BaseCommand
+
+from profiles.cards import refresh_cards
+from profiles.models import FounderProfile, MentorProfile, ProfileCard
+
+MODELS = {
+    "mentor": MentorProfile,
+    "founder": FounderProfile,
+}
+
+
+class Command(BaseCommand):
+    help = "Rebuilds ProfileCard rows for mentors and founders"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind",
+            choices=sorted(MODELS),
+            help="Only rebuild cards of this kind",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Profiles rendered per batch",
+        )
+
+    def handle(self, *args, **options):
+        kinds = [options["kind"]] if options["kind"] else sorted(MODELS)
+        batch_size = options["batch_size"]
+
+        for kind in kinds:
+            model = MODELS[kind]
+            ids = list(model.objects.order_by("pk").values_list("pk", flat=True))
+            for start in range(0, len(ids), batch_size):
+                refresh_cards(kind, ids[start : start + batch_size])
+
+            # Cards whose profile is gone
+            orphans, _ = (
+                ProfileCard.objects.filter(kind=kind)
+                .exclude(profile_id__in=model.objects.values("pk"))
+                .delete()
+            )
+            self.stdout.write(
+                f"  {kind}: rebuilt {len(ids)} cards, removed {orphans} orphans"
+            )
+
+        self.stdout.write(self.style.SUCCESS("Successfully rebuilt profile cards!"))
@@ -0,0 +1,234 @@
+"""
+Mentor recommendations for founders.
+
+Approved mentors are encoded once per worker as NumPy matrices (expertise
+subcategories, their categories, objectives they help with, experience) so a
+founder can be scored against every mentor in one vectorized pass.
+
+The index stays current incrementally: profile signals bump
+MentorProfile.updated_at, and each lookup re-encodes only the rows changed
+since the last sync. That works across gunicorn workers without a shared
+cache.
+
+updated_at is stamped when a row is saved, not when its transaction
+commits, so a row can become visible with a stamp older than rows already
+synced. Each sync therefore looks back MENTOR_MATCH_SYNC_MARGIN seconds
+before the newest stamp seen; rows in that margin whose stamp is unchanged
+aren't re-encoded.
+"""
+import threading
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+
+from industries.models import IndustrySubcategory, Objective
+from .models import FounderProfile, MentorProfile
+
+SUBCATEGORY_WEIGHT = 3.0
+CATEGORY_WEIGHT = 1.5
+OBJECTIVE_WEIGHT = 4.0
+EXPERIENCE_CAP_YEARS = 20
+
+# Later-stage founders benefit more from seasoned mentors
+STAGE_EXPERIENCE_WEIGHT = {
+    "idea": 0.5,
+    "pre_seed": 0.75,
+    "seed": 1.0,
+    "series_a": 1.5,
+    "growth": 2.0,
+}
+
+ExpertiseThrough = MentorProfile.expertise_industries.through
+HelpWithThrough = MentorProfile.can_help_with.through
+
+
+class MentorMatchIndex:
+    """Per-worker encoded matrices of approved mentors."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    # ---- public API ----
+
+    def recommend(self, founder: FounderProfile, k: int = 10):
+        """Return up to k (mentor_profile_id, score) pairs, best first."""
+        with self._lock:
+            self._sync()
+            scores = self._score(founder)
+            candidates = np.flatnonzero(self._active)
+            if not len(candidates):
+                return []
+
+            scores = scores[candidates]
+            k = min(k, len(candidates))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [
+                (int(self._profile_ids[candidates[i]]), float(scores[i]))
+                for i in top
+            ]
+
+    def discard(self, profile_id) -> None:
+        """Drop a mentor from this worker's index, e.g. after deletion."""
+        with self._lock:
+            row = self._rows.get(profile_id) if self._loaded else None
+            if row is not None:
+                self._active[row] = False
+
+    def invalidate(self) -> None:
+        """Force a full rebuild on the next lookup."""
+        with self._lock:
+            self._loaded = False
+
+    # ---- encoding ----
+
+    def _sync(self):
+        if not self._loaded:
+            self._rebuild()
+            return
+
+        changed = MentorProfile.objects.all()
+        if self._watermark is not None:
+            # Catch rows stamped earlier but committed after the last sync
+            margin = timedelta(seconds=settings.MENTOR_MATCH_SYNC_MARGIN)
+            changed = changed.filter(updated_at__gte=self._watermark - margin)
+        changed = changed.values_list("id", "updated_at")
+        changed_ids = [
+            pid for pid, updated_at in changed if self._synced.get(pid) != updated_at
+        ]
+        if changed_ids:
+            self._load(MentorProfile.objects.filter(pk__in=changed_ids))
+
+    def _rebuild(self):
+        self._subcategory_cols = {}
+        self._category_cols = {}
+        self._category_of = {}
+        for subcategory_id, category_id in IndustrySubcategory.objects.values_list(
+            "id", "category_id"
+        ):
+            self._subcategory_cols[subcategory_id] = len(self._subcategory_cols)
+            self._category_of[subcategory_id] = category_id
+            self._category_cols.setdefault(category_id, len(self._category_cols))
+        self._objective_cols = {
+            objective_id: col
+            for col, objective_id in enumerate(
+                Objective.objects.values_list("id", flat=True)
+            )
+        }
+
+        self._rows = {}
+        self._synced = {}
+        self._watermark = None
+        self._profile_ids = np.zeros(0, dtype=np.int64)
+        self._active = np.zeros(0, dtype=bool)
+        self._years = np.zeros(0, dtype=np.float32)
+        self._subcategories = np.zeros((0, len(self._subcategory_cols)), dtype=np.float32)
+        self._categories = np.zeros((0, len(self._category_cols)), dtype=np.float32)
+        self._objectives = np.zeros((0, len(self._objective_cols)), dtype=np.float32)
+        self._loaded = True
+
+        self._load(MentorProfile.objects.all(), full=True)
+
+    def _load(self, queryset, full=False):
+        """(Re-)encode the mentors in queryset; `full` skips the id filter."""
+        profiles = list(
+            queryset.values_list(
+                "id", "years_of_experience", "user__is_approved", "updated_at"
+            )
+        )
+        if not profiles:
+            return
+        profile_ids = [row[0] for row in profiles]
+
+        expertise = ExpertiseThrough.objects.all()
+        help_with = HelpWithThrough.objects.all()
+        if not full:
+            expertise = expertise.filter(mentorprofile_id__in=profile_ids)
+            help_with = help_with.filter(mentorprofile_id__in=profile_ids)
+        expertise = expertise.values_list("mentorprofile_id", "industrysubcategory_id")
+        help_with = help_with.values_list("mentorprofile_id", "objective_id")
+
+        self._reserve(len(profiles))
+        for profile_id, years, is_approved, updated_at in profiles:
+            row = self._rows.get(profile_id)
+            if row is None:
+                row = len(self._rows)
+                self._rows[profile_id] = row
+                self._profile_ids[row] = profile_id
+            self._active[row] = is_approved
+            self._years[row] = min(years or 0, EXPERIENCE_CAP_YEARS) / EXPERIENCE_CAP_YEARS
+            self._subcategories[row] = 0
+            self._categories[row] = 0
+            self._objectives[row] = 0
+            self._synced[profile_id] = updated_at
+
+        loaded = set(profile_ids)
+        for profile_id, subcategory_id in expertise:
+            if profile_id not in loaded:
+                continue
+            if subcategory_id not in self._subcategory_cols:
+                # New taxonomy entry since the last rebuild
+                self._rebuild()
+                return
+            row = self._rows[profile_id]
+            self._subcategories[row, self._subcategory_cols[subcategory_id]] = 1
+            category_id = self._category_of[subcategory_id]
+            self._categories[row, self._category_cols[category_id]] = 1
+
+        for profile_id, objective_id in help_with:
+            if profile_id not in loaded:
+                continue
+            if objective_id not in self._objective_cols:
+                self._rebuild()
+                return
+            self._objectives[self._rows[profile_id], self._objective_cols[objective_id]] = 1
+
+        latest = max(updated_at for *_, updated_at in profiles)
+        if self._watermark is None or latest > self._watermark:
+            self._watermark = latest
+
+    def _reserve(self, extra):
+        """Grow the row arrays geometrically to fit `extra` more mentors."""
+        needed = len(self._rows) + extra
+        capacity = len(self._profile_ids)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 64)
+
+        def grow(array):
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[: len(array)] = array
+            return grown
+
+        self._profile_ids = grow(self._profile_ids)
+        self._active = grow(self._active)
+        self._years = grow(self._years)
+        self._subcategories = grow(self._subcategories)
+        self._categories = grow(self._categories)
+        self._objectives = grow(self._objectives)
+
+    def _score(self, founder: FounderProfile):
+        rows = len(self._profile_ids)
+        scores = np.zeros(rows, dtype=np.float32)
+
+        if founder.industry_id in self._subcategory_cols:
+            col = self._subcategory_cols[founder.industry_id]
+            scores += SUBCATEGORY_WEIGHT * self._subcategories[:, col]
+            category_col = self._category_cols[self._category_of[founder.industry_id]]
+            scores += CATEGORY_WEIGHT * self._categories[:, category_col]
+
+        wanted = np.zeros(len(self._objective_cols), dtype=np.float32)
+        for objective_id in founder.objectives.values_list("id", flat=True):
+            if objective_id in self._objective_cols:
+                wanted[self._objective_cols[objective_id]] = 1
+        if wanted.any():
+            scores += OBJECTIVE_WEIGHT * (self._objectives @ wanted) / wanted.sum()
+
+        scores += STAGE_EXPERIENCE_WEIGHT.get(founder.stage, 1.0) * self._years
+        return scores
+
+
+# Singleton instance
+mentor_match_index = MentorMatchIndex()
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:04
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.conf import settings
+from django.db import migrations, models
+
+
+BACKFILL_SQL = [
+    """
+    UPDATE profiles_mentorprofile AS p SET
+        search_vector =
+            setweight(to_tsvector('english', trim(u.first_name || ' ' || u.last_name)), 'A')
+            || setweight(to_tsvector('english', p.company), 'B')
+            || setweight(to_tsvector('english', coalesce(u.bio, '')), 'C'),
+        search_name = trim(u.first_name || ' ' || u.last_name)
+    FROM users_user AS u
+    WHERE u.id = p.user_id
+    """,
+    """
+    UPDATE profiles_founderprofile AS p SET
+        search_vector =
+            setweight(to_tsvector('english', trim(u.first_name || ' ' || u.last_name)), 'A')
+            || setweight(to_tsvector('english', p.startup_name), 'A')
+            || setweight(to_tsvector('english', p.about_startup), 'B'),
+        search_name = trim(u.first_name || ' ' || u.last_name) || ' ' || p.startup_name
+    FROM users_user AS u
+    WHERE u.id = p.user_id
+    """,
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('industries', '0001_initial'),
+        ('profiles', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='founderprofile',
+            name='search_name',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='founderprofile',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='mentorprofile',
+            name='search_name',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='mentorprofile',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='founderprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='founder_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='founderprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_name'], name='founder_search_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='mentorprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='mentor_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mentorprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_name'], name='mentor_search_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunSQL(
+            sql=BACKFILL_SQL,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_search_documents'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mentorprofile',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0004_mentor_updated_at_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileCard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('mentor', 'Mentor'), ('founder', 'Founder')], max_length=10)),
+                ('profile_id', models.BigIntegerField()),
+                ('is_approved', models.BooleanField(default=False)),
+                ('data', models.JSONField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='profile_cards', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'profile_id'), name='unique_profile_card')],
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:26
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+# A frozen copy of profiles.filters.REFRESH_SQL: migrations must not import
+# app code, which keeps changing after they have run
+BACKFILL_SQL = [
+    """
+    UPDATE profiles_mentorprofile AS p SET
+        industry_keys = array(
+            SELECT key FROM (
+                SELECT s.id AS key
+                FROM profiles_mentorprofile_expertise_industries AS e
+                JOIN industries_industrysubcategory AS s
+                    ON s.id = e.industrysubcategory_id
+                WHERE e.mentorprofile_id = p.id
+                UNION
+                SELECT -s.category_id
+                FROM profiles_mentorprofile_expertise_industries AS e
+                JOIN industries_industrysubcategory AS s
+                    ON s.id = e.industrysubcategory_id
+                WHERE e.mentorprofile_id = p.id
+            ) AS keys
+            ORDER BY key
+        )
+    """,
+    """
+    UPDATE profiles_founderprofile AS p SET
+        industry_keys = array(
+            SELECT key
+            FROM industries_industrysubcategory AS s,
+                unnest(ARRAY[s.id, -s.category_id]) AS key
+            WHERE s.id = p.industry_id
+            ORDER BY key
+        )
+    """,
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('industries', '0002_reference_data_version'),
+        ('profiles', '0005_profile_cards'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='founderprofile',
+            name='industry_keys',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='mentorprofile',
+            name='industry_keys',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddIndex(
+            model_name='founderprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['industry_keys'], name='founder_industry_keys_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mentorprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['industry_keys'], name='mentor_industry_keys_idx'),
+        ),
+        migrations.RunSQL(
+            sql=BACKFILL_SQL,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from industries.models import IndustrySubcategory, Objective, STAGE_CHOICES
 
 
@@ -19,9 +22,27 @@ class FounderProfile(models.Model):
     stage = models.CharField(max_length=20, choices=STAGE_CHOICES)
     objectives = models.ManyToManyField(Objective, related_name="founders")
     about_startup = models.TextField()
+    # Subcategory ids and negated category ids, maintained by profiles.filters
+    industry_keys = ArrayField(
+        models.IntegerField(), default=list, blank=True, editable=False
+    )
+    # Maintained by profiles.search, see signals.py
+    search_vector = SearchVectorField(null=True, editable=False)
+    search_name = models.TextField(blank=True, default="", editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="founder_search_vector_idx"),
+            GinIndex(fields=["industry_keys"], name="founder_industry_keys_idx"),
+            GinIndex(
+                fields=["search_name"],
+                opclasses=["gin_trgm_ops"],
+                name="founder_search_name_trgm_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.startup_name} - {self.user.get_full_name()}"
 
@@ -39,8 +60,60 @@ class MentorProfile(models.Model):
         IndustrySubcategory, related_name="mentors"
     )
     can_help_with = models.ManyToManyField(Objective, related_name="mentors")
+    # Subcategory ids and negated category ids, maintained by profiles.filters
+    industry_keys = ArrayField(
+        models.IntegerField(), default=list, blank=True, editable=False
+    )
+    # Maintained by profiles.search, see signals.py
+    search_vector = SearchVectorField(null=True, editable=False)
+    search_name = models.TextField(blank=True, default="", editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    # Indexed for the recommendation index's incremental sync
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="mentor_search_vector_idx"),
+            GinIndex(fields=["industry_keys"], name="mentor_industry_keys_idx"),
+            GinIndex(
+                fields=["search_name"],
+                opclasses=["gin_trgm_ops"],
+                name="mentor_search_name_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.role} @ {self.company}"
+
+
+class ProfileCard(models.Model):
+    """
+    Denormalized, pre-rendered directory card for a mentor or founder.
+    Maintained by profiles.cards; rebuild with `manage.py rebuild_profile_cards`.
+    """
+
+    KIND_CHOICES = [
+        ("mentor", "Mentor"),
+        ("founder", "Founder"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    profile_id = models.BigIntegerField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="profile_cards",
+    )
+    is_approved = models.BooleanField(default=False)
+    data = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "profile_id"], name="unique_profile_card"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} card #{self.profile_id}"
@@ -0,0 +1,104 @@
+"""
+Full-text search for the mentor/founder directories.
+
+Each profile carries a weighted tsvector (names first, then company/startup,
+then free text) plus a plain name column for trigram matching, so searches
+hit GIN indexes instead of ILIKE scans across joined tables.
+"""
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.contrib.auth import get_user_model
+from django.db.models import F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Concat, Trim
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+from .models import FounderProfile, MentorProfile
+
+SEARCH_CONFIG = "english"
+
+# User fields that feed the search documents
+USER_SEARCH_FIELDS = {"first_name", "last_name", "bio"}
+
+
+def _user_value(expression):
+    # The profile's user's `expression`; correlated, so one UPDATE covers
+    # any set of profiles
+    return Subquery(
+        get_user_model()
+        .objects.filter(pk=OuterRef("user_id"))
+        .values(value=expression)
+    )
+
+
+def _full_name():
+    return _user_value(Trim(Concat("first_name", Value(" "), "last_name")))
+
+
+def mentor_search_document():
+    """Update expressions for mentors' search columns."""
+    return {
+        "search_vector": (
+            SearchVector(_full_name(), weight="A", config=SEARCH_CONFIG)
+            + SearchVector("company", weight="B", config=SEARCH_CONFIG)
+            + SearchVector(_user_value(F("bio")), weight="C", config=SEARCH_CONFIG)
+        ),
+        "search_name": _full_name(),
+    }
+
+
+def founder_search_document():
+    """Update expressions for founders' search columns."""
+    return {
+        "search_vector": (
+            SearchVector(_full_name(), weight="A", config=SEARCH_CONFIG)
+            + SearchVector("startup_name", weight="A", config=SEARCH_CONFIG)
+            + SearchVector("about_startup", weight="B", config=SEARCH_CONFIG)
+        ),
+        "search_name": Concat(_full_name(), Value(" "), "startup_name"),
+    }
+
+
+def update_mentor_search_document(user):
+    MentorProfile.objects.filter(user=user).update(**mentor_search_document())
+
+
+def update_founder_search_document(user):
+    FounderProfile.objects.filter(user=user).update(**founder_search_document())
+
+
+def rebuild_search_documents():
+    """Recompute all search documents, e.g. after bulk inserts that skip signals."""
+    MentorProfile.objects.update(**mentor_search_document())
+    FounderProfile.objects.update(**founder_search_document())
+
+
+class ProfileSearchFilter(BaseFilterBackend):
+    """
+    Ranked full-text search over the profile search documents, with a trigram
+    fallback on names so misspellings still match.
+    Uses the same `search` query param as DRF's SearchFilter.
+    """
+
+    search_param = api_settings.SEARCH_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, "").strip()
+        if not term:
+            return queryset
+
+        query = SearchQuery(term, config=SEARCH_CONFIG, search_type="websearch")
+        return (
+            queryset.filter(
+                Q(search_vector=query) | Q(search_name__trigram_word_similar=term)
+            )
+            .annotate(
+                search_rank=SearchRank(F("search_vector"), query)
+                + TrigramWordSimilarity(term, "search_name")
+            )
+            .order_by("-search_rank", "id")
+        )
@@ -3,6 +3,8 @@ from django.contrib.auth import get_user_model
 from .models import FounderProfile, MentorProfile
 from industries.serializers import IndustrySubcategorySerializer, ObjectiveSerializer
 from industries.models import IndustrySubcategory, Objective
+from connections.services.connection_graph import get_viewer_graph
+from connections.services.network import mutual_counts
 
 User = get_user_model()
 
@@ -101,7 +103,38 @@ class MentorProfileCreateSerializer(serializers.ModelSerializer):
         return profile
 
 
-class MentorListSerializer(serializers.ModelSerializer):
+CONNECTION_STATUS_SOURCES = {
+    "is_connected": ["user_id"],
+    "connection_status": ["user_id"],
+    "mutual_count": ["user_id"],
+}
+
+
+class ConnectionStatusMixin:
+    """
+    is_connected / connection_status / mutual_count fields backed by the
+    viewer's graph. Pages render through profiles.cards, which computes
+    mutual counts for the whole page at once.
+    """
+
+    def get_is_connected(self, obj):
+        graph = get_viewer_graph(self.context.get("request"))
+        if graph is None:
+            return False
+        return graph.is_connected(obj.user_id)
+
+    def get_connection_status(self, obj):
+        graph = get_viewer_graph(self.context.get("request"))
+        if graph is None:
+            return None
+        return graph.status(obj.user_id)
+
+    def get_mutual_count(self, obj):
+        graph = get_viewer_graph(self.context.get("request"))
+        return mutual_counts(graph, [obj.user_id])[obj.user_id]
+
+
+class MentorListSerializer(ConnectionStatusMixin, serializers.ModelSerializer):
     user = UserMiniSerializer(read_only=True)
     expertise_industries_detail = IndustrySubcategorySerializer(
         source="expertise_industries", many=True, read_only=True
@@ -111,6 +144,7 @@ class MentorListSerializer(serializers.ModelSerializer):
     )
     is_connected = serializers.SerializerMethodField()
     connection_status = serializers.SerializerMethodField()
+    mutual_count = serializers.SerializerMethodField()
 
     class Meta:
         model = MentorProfile
@@ -124,36 +158,12 @@ class MentorListSerializer(serializers.ModelSerializer):
             "can_help_with_detail",
             "is_connected",
             "connection_status",
+            "mutual_count",
         ]
+        values_sources = CONNECTION_STATUS_SOURCES
 
-    def get_is_connected(self, obj):
-        request = self.context.get("request")
-        if not request or not request.user.is_authenticated:
-            return False
-        from connections.models import ConnectionRequest
-        from django.db.models import Q
-
-        return ConnectionRequest.objects.filter(
-            Q(from_user=request.user, to_user=obj.user)
-            | Q(from_user=obj.user, to_user=request.user),
-            status="accepted",
-        ).exists()
-
-    def get_connection_status(self, obj):
-        request = self.context.get("request")
-        if not request or not request.user.is_authenticated:
-            return None
-        from connections.models import ConnectionRequest
-        from django.db.models import Q
-
-        connection = ConnectionRequest.objects.filter(
-            Q(from_user=request.user, to_user=obj.user)
-            | Q(from_user=obj.user, to_user=request.user)
-        ).first()
-        return connection.status if connection else None
 
-
-class FounderListSerializer(serializers.ModelSerializer):
+class FounderListSerializer(ConnectionStatusMixin, serializers.ModelSerializer):
     user = UserMiniSerializer(read_only=True)
     industry_detail = IndustrySubcategorySerializer(source="industry", read_only=True)
     objectives_detail = ObjectiveSerializer(
@@ -162,6 +172,7 @@ class FounderListSerializer(serializers.ModelSerializer):
     stage_display = serializers.CharField(source="get_stage_display", read_only=True)
     is_connected = serializers.SerializerMethodField()
     connection_status = serializers.SerializerMethodField()
+    mutual_count = serializers.SerializerMethodField()
 
     class Meta:
         model = FounderProfile
@@ -176,30 +187,13 @@ class FounderListSerializer(serializers.ModelSerializer):
             "about_startup",
             "is_connected",
             "connection_status",
+            "mutual_count",
         ]
+        values_sources = CONNECTION_STATUS_SOURCES
 
-    def get_is_connected(self, obj):
-        request = self.context.get("request")
-        if not request or not request.user.is_authenticated:
-            return False
-        from connections.models import ConnectionRequest
-        from django.db.models import Q
 
-        return ConnectionRequest.objects.filter(
-            Q(from_user=request.user, to_user=obj.user)
-            | Q(from_user=obj.user, to_user=request.user),
-            status="accepted",
-        ).exists()
+class RecommendedMentorSerializer(MentorListSerializer):
+    match_score = serializers.FloatField(read_only=True)
 
-    def get_connection_status(self, obj):
-        request = self.context.get("request")
-        if not request or not request.user.is_authenticated:
-            return None
-        from connections.models import ConnectionRequest
-        from django.db.models import Q
-
-        connection = ConnectionRequest.objects.filter(
-            Q(from_user=request.user, to_user=obj.user)
-            | Q(from_user=obj.user, to_user=request.user)
-        ).first()
-        return connection.status if connection else None
+    class Meta(MentorListSerializer.Meta):
+        fields = MentorListSerializer.Meta.fields + ["match_score"]
@@ -0,0 +1,236 @@
+from django.conf import settings
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from industries.models import IndustryCategory, IndustrySubcategory, Objective
+from .cards import refresh_cards, refresh_user_cards
+from .facets import bump_facet_version
+from .filters import refresh_industry_keys
+from .matching import mentor_match_index
+from .models import FounderProfile, MentorProfile
+from .search import (
+    USER_SEARCH_FIELDS,
+    update_founder_search_document,
+    update_mentor_search_document,
+)
+
+
+# User fields that change which profiles match a directory search/filter
+USER_FACET_FIELDS = USER_SEARCH_FIELDS | {"is_approved"}
+
+# User fields rendered into profile cards, plus visibility
+USER_CARD_FIELDS = {
+    "email",
+    "first_name",
+    "last_name",
+    "profile_photo",
+    "bio",
+    "is_approved",
+}
+
+
+def touch_mentor_profiles(**filters):
+    """Bump updated_at so every worker's match index re-encodes these mentors."""
+    MentorProfile.objects.filter(**filters).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def refresh_user_search_documents(sender, instance, update_fields=None, **kwargs):
+    # Skip saves that can't change the documents, e.g. last_login updates
+    if update_fields is not None and not USER_SEARCH_FIELDS & set(update_fields):
+        return
+    update_mentor_search_document(instance)
+    update_founder_search_document(instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def refresh_mentor_approval(sender, instance, update_fields=None, **kwargs):
+    if instance.user_type != "mentor":
+        return
+    if update_fields is not None and "is_approved" not in update_fields:
+        return
+    touch_mentor_profiles(user=instance)
+
+
+@receiver(post_save, sender=MentorProfile)
+def refresh_mentor_search_document(sender, instance, **kwargs):
+    update_mentor_search_document(instance.user)
+
+
+@receiver(post_save, sender=FounderProfile)
+def refresh_founder_search_document(sender, instance, **kwargs):
+    update_founder_search_document(instance.user)
+
+
+@receiver(post_delete, sender=MentorProfile)
+def discard_mentor_match(sender, instance, **kwargs):
+    mentor_match_index.discard(instance.pk)
+
+
+@receiver(m2m_changed, sender=MentorProfile.expertise_industries.through)
+@receiver(m2m_changed, sender=MentorProfile.can_help_with.through)
+def refresh_mentor_match(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        touch_mentor_profiles(pk=instance.pk)
+    elif pk_set:
+        touch_mentor_profiles(pk__in=pk_set)
+    else:
+        # Reverse clear, e.g. objective.mentors.clear(): affected ids unknown
+        mentor_match_index.invalidate()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_facets(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not USER_FACET_FIELDS & set(update_fields):
+        return
+    bump_facet_version()
+
+
+@receiver(post_save, sender=MentorProfile)
+@receiver(post_save, sender=FounderProfile)
+@receiver(post_delete, sender=MentorProfile)
+@receiver(post_delete, sender=FounderProfile)
+@receiver(m2m_changed, sender=MentorProfile.expertise_industries.through)
+@receiver(m2m_changed, sender=MentorProfile.can_help_with.through)
+@receiver(m2m_changed, sender=FounderProfile.objectives.through)
+def invalidate_profile_facets(sender, action=None, **kwargs):
+    # action is only set for m2m_changed; skip its pre_* phases
+    if action is None or action.startswith("post_"):
+        bump_facet_version()
+
+
+@receiver(post_save, sender=IndustryCategory)
+@receiver(post_save, sender=IndustrySubcategory)
+@receiver(post_save, sender=Objective)
+@receiver(post_delete, sender=IndustryCategory)
+@receiver(post_delete, sender=IndustrySubcategory)
+@receiver(post_delete, sender=Objective)
+def invalidate_taxonomy_facets(sender, **kwargs):
+    # Facets carry slugs and category ids; deletes also cascade through the
+    # profile links without m2m_changed
+    bump_facet_version()
+
+
+# ---- Profile cards ----
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def refresh_user_profile_cards(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not USER_CARD_FIELDS & set(update_fields):
+        return
+    refresh_user_cards(instance)
+
+
+@receiver(post_save, sender=MentorProfile)
+@receiver(post_delete, sender=MentorProfile)
+def refresh_mentor_card(sender, instance, **kwargs):
+    refresh_cards("mentor", [instance.pk])
+
+
+@receiver(post_save, sender=FounderProfile)
+@receiver(post_delete, sender=FounderProfile)
+def refresh_founder_card(sender, instance, **kwargs):
+    refresh_cards("founder", [instance.pk])
+
+
+def _referencing_profiles(instance):
+    """(kind, profile ids) of cards rendering a subcategory or objective."""
+    return [
+        ("mentor", list(instance.mentors.values_list("pk", flat=True))),
+        ("founder", list(instance.founders.values_list("pk", flat=True))),
+    ]
+
+
+@receiver(m2m_changed, sender=MentorProfile.expertise_industries.through)
+@receiver(m2m_changed, sender=MentorProfile.can_help_with.through)
+@receiver(m2m_changed, sender=FounderProfile.objectives.through)
+def refresh_cards_on_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    kind = "founder" if sender is FounderProfile.objectives.through else "mentor"
+    if not reverse:
+        if action.startswith("post_"):
+            refresh_cards(kind, [instance.pk])
+    elif action == "pre_clear":
+        # Reverse clear() doesn't report which profiles lose the entry
+        instance._card_profiles = _referencing_profiles(instance)
+    elif action == "post_clear":
+        for kind, profile_ids in getattr(instance, "_card_profiles", []):
+            refresh_cards(kind, profile_ids)
+    elif action.startswith("post_"):
+        refresh_cards(kind, pk_set)
+
+
+@receiver(post_save, sender=IndustrySubcategory)
+@receiver(post_save, sender=Objective)
+def refresh_taxonomy_cards(sender, instance, created, **kwargs):
+    if created:
+        return
+    for kind, profile_ids in _referencing_profiles(instance):
+        refresh_cards(kind, profile_ids)
+
+
+@receiver(pre_delete, sender=IndustrySubcategory)
+@receiver(pre_delete, sender=Objective)
+def collect_taxonomy_cards(sender, instance, **kwargs):
+    instance._card_profiles = _referencing_profiles(instance)
+
+
+@receiver(post_delete, sender=IndustrySubcategory)
+@receiver(post_delete, sender=Objective)
+def refresh_deleted_taxonomy_cards(sender, instance, **kwargs):
+    for kind, profile_ids in getattr(instance, "_card_profiles", []):
+        refresh_cards(kind, profile_ids)
+
+
+# ---- Industry filter keys ----
+
+
+@receiver(post_save, sender=FounderProfile)
+def refresh_founder_industry_keys(sender, instance, **kwargs):
+    refresh_industry_keys("founder", [instance.pk])
+
+
+@receiver(m2m_changed, sender=MentorProfile.expertise_industries.through)
+def refresh_mentor_industry_keys(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not reverse:
+        if action.startswith("post_"):
+            refresh_industry_keys("mentor", [instance.pk])
+    elif action == "pre_clear":
+        # Reverse clear() doesn't report which mentors lose the subcategory
+        instance._industry_mentors = list(
+            instance.mentors.values_list("pk", flat=True)
+        )
+    elif action == "post_clear":
+        refresh_industry_keys("mentor", getattr(instance, "_industry_mentors", []))
+    elif action.startswith("post_"):
+        refresh_industry_keys("mentor", pk_set)
+
+
+@receiver(post_save, sender=IndustrySubcategory)
+def refresh_subcategory_industry_keys(sender, instance, created, **kwargs):
+    # Moving a subcategory to another category changes its category key
+    if created:
+        return
+    for kind, profile_ids in _referencing_profiles(instance):
+        refresh_industry_keys(kind, profile_ids)
+
+
+@receiver(pre_delete, sender=IndustrySubcategory)
+def collect_subcategory_industry_keys(sender, instance, **kwargs):
+    instance._industry_profiles = _referencing_profiles(instance)
+
+
+@receiver(post_delete, sender=IndustrySubcategory)
+def refresh_deleted_subcategory_industry_keys(sender, instance, **kwargs):
+    # The delete cascaded through rows and nulled founder industries silently
+    for kind, profile_ids in getattr(instance, "_industry_profiles", []):
+        refresh_industry_keys(kind, profile_ids)
@@ -0,0 +1,391 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from connections.models import ConnectionRequest
+from industries.models import IndustryCategory, IndustrySubcategory, Objective
+
+from .matching import MentorMatchIndex
+from .models import FounderProfile, MentorProfile
+from .views import BULK_MAX_IDS
+
+User = get_user_model()
+
+
+class DirectoryQueryCountTests(TestCase):
+    """
+    The directory lists resolve the viewer's connection fields for a whole
+    page at once, so their query count doesn't grow with the page.
+    """
+
+    expected_queries = {
+        # Viewer graph, count, page, cards, the page's mutual counts
+        "/api/profiles/mentors/": 5,
+        "/api/profiles/founders/": 5,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        category = IndustryCategory.objects.create(name="Tech", slug="tech")
+        cls.industry = IndustrySubcategory.objects.create(
+            category=category, name="SaaS", slug="saas"
+        )
+        cls.objective = Objective.objects.create(
+            name="Fundraising", slug="fundraising", category="fundraising"
+        )
+        cls.viewer = User.objects.create_user(
+            email="viewer@example.com",
+            username="viewer",
+            password="secret",
+            user_type="founder",
+        )
+
+    def setUp(self):
+        # Start every request from cold graph, facet and card caches
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def _user(self, name, user_type):
+        return User.objects.create_user(
+            email=f"{name}@example.com",
+            username=name,
+            password="secret",
+            first_name=name,
+            user_type=user_type,
+            is_approved=True,
+        )
+
+    def _add_mentors(self, count):
+        for _ in range(count):
+            index = MentorProfile.objects.count()
+            profile = MentorProfile.objects.create(
+                user=self._user(f"mentor{index}", "mentor"),
+                company="Acme",
+                role="CTO",
+                years_of_experience=10,
+            )
+            profile.expertise_industries.add(self.industry)
+            profile.can_help_with.add(self.objective)
+            self._connect(profile.user, index)
+
+    def _add_founders(self, count):
+        for _ in range(count):
+            index = FounderProfile.objects.count()
+            profile = FounderProfile.objects.create(
+                user=self._user(f"founder{index}", "founder"),
+                startup_name="Startup",
+                industry=self.industry,
+                stage="idea",
+                about_startup="About",
+            )
+            profile.objectives.add(self.objective)
+            self._connect(profile.user, index)
+
+    def _connect(self, user, index):
+        # A mix of statuses and directions, and some users with no request
+        status = ("accepted", "pending", "declined", None)[index % 4]
+        if status is None:
+            return
+        from_user, to_user = (self.viewer, user) if index % 2 else (user, self.viewer)
+        ConnectionRequest.objects.create(
+            from_user=from_user, to_user=to_user, status=status
+        )
+
+    def _count_queries(self, url):
+        cache.clear()
+        with self.assertNumQueries(self.expected_queries[url]):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"]
+
+    def test_mentor_list_query_count_is_constant(self):
+        self._add_mentors(3)
+        small = self._count_queries("/api/profiles/mentors/")
+        self._add_mentors(30)
+        full = self._count_queries("/api/profiles/mentors/")
+
+        self.assertEqual(len(small), 3)
+        self.assertEqual(len(full), 20)
+
+    def test_founder_list_query_count_is_constant(self):
+        self._add_founders(3)
+        small = self._count_queries("/api/profiles/founders/")
+        self._add_founders(30)
+        full = self._count_queries("/api/profiles/founders/")
+
+        self.assertEqual(len(small), 3)
+        self.assertEqual(len(full), 20)
+
+    def test_connection_fields_match_requests(self):
+        self._add_mentors(8)
+        results = self._count_queries("/api/profiles/mentors/")
+
+        expected = {}
+        for request in ConnectionRequest.objects.all():
+            outgoing = request.from_user_id == self.viewer.pk
+            other = request.to_user_id if outgoing else request.from_user_id
+            expected[other] = request.status
+        for card in results:
+            status = expected.get(card["user"]["id"])
+            self.assertEqual(card["connection_status"], status)
+            self.assertEqual(card["is_connected"], status == "accepted")
+
+
+class MentorMatchSyncTests(TestCase):
+    """
+    A loaded match index picks up approval changes made through the admin on
+    its next incremental sync, without a rebuild.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        category = IndustryCategory.objects.create(name="Tech", slug="tech")
+        industry = IndustrySubcategory.objects.create(
+            category=category, name="SaaS", slug="saas"
+        )
+        objective = Objective.objects.create(
+            name="Fundraising", slug="fundraising", category="fundraising"
+        )
+        cls.admin = User.objects.create_superuser(
+            email="admin@example.com", username="admin", password="secret"
+        )
+        founder = User.objects.create_user(
+            email="founder@example.com",
+            username="founder",
+            password="secret",
+            user_type="founder",
+        )
+        cls.founder = FounderProfile.objects.create(
+            user=founder,
+            startup_name="Startup",
+            industry=industry,
+            stage="idea",
+            about_startup="About",
+        )
+        cls.founder.objectives.add(objective)
+        cls.mentor = User.objects.create_user(
+            email="mentor@example.com",
+            username="mentor",
+            password="secret",
+            user_type="mentor",
+        )
+        cls.profile = MentorProfile.objects.create(
+            user=cls.mentor, company="Acme", role="CTO", years_of_experience=10
+        )
+        cls.profile.expertise_industries.add(industry)
+        cls.profile.can_help_with.add(objective)
+
+    def _run_action(self, action):
+        self.client.force_login(self.admin)
+        self.client.post(
+            reverse("admin:users_user_changelist"),
+            {"action": action, "_selected_action": [self.mentor.pk]},
+        )
+
+    def _recommended(self, index):
+        return [profile_id for profile_id, _ in index.recommend(self.founder)]
+
+    def test_sync_follows_admin_approval(self):
+        index = MentorMatchIndex()
+        self.assertEqual(self._recommended(index), [])
+
+        self._run_action("approve_mentors")
+        self.assertEqual(self._recommended(index), [self.profile.pk])
+
+        self._run_action("reject_mentors")
+        self.assertEqual(self._recommended(index), [])
+
+
+class SearchPaginationTests(TestCase):
+    """Cursor mode doesn't override the relevance order of a search."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = User.objects.create_user(
+            email="viewer@example.com",
+            username="viewer",
+            password="secret",
+            user_type="founder",
+        )
+        # The older profile only matches on company, the newer one on name
+        cls.ids = [
+            MentorProfile.objects.create(
+                user=User.objects.create_user(
+                    email=f"{username}@example.com",
+                    username=username,
+                    password="secret",
+                    first_name=first_name,
+                    user_type="mentor",
+                    is_approved=True,
+                ),
+                company=company,
+                role="CTO",
+                years_of_experience=10,
+            ).pk
+            for username, first_name, company in [
+                ("bob", "Bob", "Alice Ventures"),
+                ("alice", "Alice", "Acme"),
+            ]
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def test_cursor_mode_keeps_rank_order(self):
+        for params in ({}, {"pagination": "cursor"}, {"cursor": "e30="}):
+            with self.subTest(params):
+                response = self.client.get(
+                    "/api/profiles/mentors/", {"search": "alice", **params}
+                )
+                self.assertEqual(response.status_code, 200)
+                results = response.json()["results"]
+                self.assertEqual(
+                    [card["id"] for card in results], list(reversed(self.ids))
+                )
+
+
+class FacetCacheTests(TestCase):
+    """Cached facet counts follow profile and taxonomy edits."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tech = IndustryCategory.objects.create(name="Tech", slug="tech")
+        cls.health = IndustryCategory.objects.create(name="Health", slug="health")
+        cls.saas = IndustrySubcategory.objects.create(
+            category=cls.tech, name="SaaS", slug="saas"
+        )
+        cls.viewer = User.objects.create_user(
+            email="viewer@example.com",
+            username="viewer",
+            password="secret",
+            user_type="founder",
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def _add_mentor(self, name):
+        profile = MentorProfile.objects.create(
+            user=User.objects.create_user(
+                email=f"{name}@example.com",
+                username=name,
+                password="secret",
+                user_type="mentor",
+                is_approved=True,
+            ),
+            company="Acme",
+            role="CTO",
+            years_of_experience=10,
+        )
+        profile.expertise_industries.add(self.saas)
+        return profile
+
+    def _facets(self):
+        response = self.client.get("/api/profiles/mentors/facets/")
+        self.assertEqual(response.status_code, 200)
+        facets = response.json()
+        return {
+            family: [(row["slug"], row["count"]) for row in facets[family]]
+            for family in ("industries", "categories")
+        }
+
+    def test_profile_edits(self):
+        self._add_mentor("first")
+        self.assertEqual(self._facets()["industries"], [("saas", 1)])
+
+        second = self._add_mentor("second")
+        self.assertEqual(self._facets()["industries"], [("saas", 2)])
+
+        second.expertise_industries.clear()
+        self.assertEqual(self._facets()["industries"], [("saas", 1)])
+
+    def test_taxonomy_edits(self):
+        self._add_mentor("first")
+        self.assertEqual(
+            self._facets(), {"industries": [("saas", 1)], "categories": [("tech", 1)]}
+        )
+
+        self.saas.slug = "software"
+        self.saas.category = self.health
+        self.saas.save()
+        self.assertEqual(
+            self._facets(),
+            {"industries": [("software", 1)], "categories": [("health", 1)]},
+        )
+
+        self.saas.delete()
+        self.assertEqual(self._facets(), {"industries": [], "categories": []})
+
+
+class BulkProfilesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = IndustryCategory.objects.create(name="Tech", slug="tech")
+        industry = IndustrySubcategory.objects.create(
+            category=category, name="SaaS", slug="saas"
+        )
+        cls.viewer = User.objects.create_user(
+            email="viewer@example.com",
+            username="viewer",
+            password="secret",
+            user_type="founder",
+        )
+        cls.founder = FounderProfile.objects.create(
+            user=cls.viewer,
+            startup_name="Startup",
+            industry=industry,
+            stage="idea",
+            about_startup="About",
+        )
+        cls.mentors = {}
+        for name, is_approved in [("approved", True), ("pending", False)]:
+            cls.mentors[name] = MentorProfile.objects.create(
+                user=User.objects.create_user(
+                    email=f"{name}@example.com",
+                    username=name,
+                    password="secret",
+                    user_type="mentor",
+                    is_approved=is_approved,
+                ),
+                company="Acme",
+                role="CTO",
+                years_of_experience=10,
+            ).pk
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def _bulk(self, **params):
+        return self.client.get("/api/profiles/bulk/", params)
+
+    def _ids(self, response, key):
+        self.assertEqual(response.status_code, 200)
+        return [card["id"] for card in response.json()[key]]
+
+    def test_only_visible_profiles_in_requested_order(self):
+        approved, pending = self.mentors["approved"], self.mentors["pending"]
+        missing = max(approved, pending) + 1
+        response = self._bulk(
+            mentor_ids=f"{missing},{pending},{approved},{approved}",
+            founder_ids=str(self.founder.pk),
+        )
+        self.assertEqual(self._ids(response, "mentors"), [approved])
+        self.assertEqual(self._ids(response, "founders"), [self.founder.pk])
+
+    def test_empty_params(self):
+        self.assertEqual(self._bulk().json(), {"mentors": [], "founders": []})
+
+    def test_limits_and_validation(self):
+        ids = ",".join(str(self.mentors["approved"] + i) for i in range(BULK_MAX_IDS))
+        self.assertEqual(self._bulk(mentor_ids=ids).status_code, 200)
+        self.assertEqual(self._bulk(mentor_ids=ids + ",0").status_code, 400)
+        self.assertEqual(self._bulk(founder_ids="1,x").status_code, 400)
@@ -6,8 +6,12 @@ from .views import (
     MentorProfileCreateView,
     MentorListView,
     MentorDetailView,
+    RecommendedMentorsView,
+    MentorFacetsView,
+    FounderFacetsView,
     FounderListView,
     FounderDetailView,
+    BulkProfilesView,
 )
 
 urlpatterns = [
@@ -24,7 +28,15 @@ urlpatterns = [
         name="mentor-profile-create",
     ),
     path("mentors/", MentorListView.as_view(), name="mentor-list"),
+    path(
+        "mentors/recommended/",
+        RecommendedMentorsView.as_view(),
+        name="mentor-recommended",
+    ),
+    path("mentors/facets/", MentorFacetsView.as_view(), name="mentor-facets"),
     path("mentors/<int:pk>/", MentorDetailView.as_view(), name="mentor-detail"),
     path("founders/", FounderListView.as_view(), name="founder-list"),
+    path("founders/facets/", FounderFacetsView.as_view(), name="founder-facets"),
     path("founders/<int:pk>/", FounderDetailView.as_view(), name="founder-detail"),
+    path("bulk/", BulkProfilesView.as_view(), name="profile-bulk"),
 ]
@@ -1,10 +1,17 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter
 
 from .models import FounderProfile, MentorProfile
+from sapan.conditional import ConditionalGetMixin
+
+from .cards import card_validators, get_card, get_cards, render_cards
+from .facets import cached_facets, founder_facets, mentor_facets
+from .filters import FounderFilterSet, MentorFilterSet
+from .matching import mentor_match_index
+from .search import ProfileSearchFilter
 from .serializers import (
     FounderProfileSerializer,
     FounderProfileCreateSerializer,
@@ -12,8 +19,13 @@ from .serializers import (
     MentorProfileCreateSerializer,
     MentorListSerializer,
     FounderListSerializer,
+    RecommendedMentorSerializer,
 )
 
+RECOMMENDATION_DEFAULT_LIMIT = 10
+RECOMMENDATION_MAX_LIMIT = 50
+BULK_MAX_IDS = 100
+
 
 class FounderProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
@@ -83,67 +95,199 @@ class MentorProfileCreateView(generics.CreateAPIView):
         return super().create(request, *args, **kwargs)
 
 
-class MentorListView(generics.ListAPIView):
-    serializer_class = MentorListSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter]
-    filterset_fields = {
-        "expertise_industries__slug": ["exact"],
-        "can_help_with__slug": ["exact"],
-    }
-    search_fields = ["user__first_name", "user__last_name", "company", "user__bio"]
+class ProfileCardListMixin:
+    """Render list pages from the ProfileCard read model."""
 
-    def get_queryset(self):
-        return (
-            MentorProfile.objects.filter(user__is_approved=True)
-            .select_related("user")
-            .prefetch_related(
-                "expertise_industries",
-                "expertise_industries__category",
-                "can_help_with",
+    card_kind = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                render_cards(self.card_kind, page, request)
             )
+        return Response(render_cards(self.card_kind, queryset, request))
+
+
+class ProfileCardDetailMixin(ConditionalGetMixin):
+    """Render a single profile from the ProfileCard read model."""
+
+    card_kind = None
+    approved_only = False
+
+    def get_validators(self, request, *args, **kwargs):
+        return card_validators(
+            self.card_kind, kwargs["pk"], request, approved_only=self.approved_only
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        card = get_card(
+            self.card_kind, kwargs["pk"], request, approved_only=self.approved_only
         )
+        if card is None:
+            return Response(
+                {"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(card)
 
 
-class MentorDetailView(generics.RetrieveAPIView):
+class MentorListView(ProfileCardListMixin, generics.ListAPIView):
     serializer_class = MentorListSerializer
+    card_kind = "mentor"
+    cursor_ordering = ("id",)
+    filter_backends = [DjangoFilterBackend, ProfileSearchFilter]
+    filterset_class = MentorFilterSet
 
     def get_queryset(self):
-        return (
+        # Only what filtering and card lookup need; the rest comes from the card
+        return MentorProfile.objects.filter(user__is_approved=True).only(
+            "id", "user_id"
+        )
+
+
+class RecommendedMentorsView(generics.ListAPIView):
+    """Top-k approved mentors for the requesting founder, best match first."""
+
+    serializer_class = RecommendedMentorSerializer
+    pagination_class = None
+
+    def list(self, request, *args, **kwargs):
+        try:
+            founder = request.user.founder_profile
+        except FounderProfile.DoesNotExist:
+            return Response(
+                {"detail": "Only founders can get mentor recommendations."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        try:
+            limit = int(request.query_params.get("limit", RECOMMENDATION_DEFAULT_LIMIT))
+        except ValueError:
+            limit = RECOMMENDATION_DEFAULT_LIMIT
+        limit = max(1, min(limit, RECOMMENDATION_MAX_LIMIT))
+
+        matches = mentor_match_index.recommend(founder, k=limit)
+        mentors = (
             MentorProfile.objects.filter(user__is_approved=True)
-            .select_related("user")
-            .prefetch_related(
-                "expertise_industries",
-                "expertise_industries__category",
-                "can_help_with",
+            .only("id", "user_id")
+            .in_bulk([profile_id for profile_id, _ in matches])
+        )
+        if len(mentors) < len(matches):
+            # Deleted or unapproved since this worker last synced
+            mentor_match_index.invalidate()
+
+        scores = dict(matches)
+        results = render_cards(
+            "mentor",
+            [mentors[profile_id] for profile_id, _ in matches if profile_id in mentors],
+            request,
+        )
+        for card in results:
+            card["match_score"] = round(scores[card["id"]], 4)
+        return Response(results)
+
+
+class MentorFacetsView(MentorListView):
+    """Facet counts for the mentor directory under the current search/filters."""
+
+    def list(self, request, *args, **kwargs):
+        return Response(
+            cached_facets(
+                "mentors",
+                request,
+                lambda: mentor_facets(self.filter_queryset(self.get_queryset())),
             )
         )
 
 
-class FounderListView(generics.ListAPIView):
+class MentorDetailView(ProfileCardDetailMixin, generics.RetrieveAPIView):
+    serializer_class = MentorListSerializer
+    card_kind = "mentor"
+    approved_only = True
+
+    def get_queryset(self):
+        return MentorProfile.objects.filter(user__is_approved=True)
+
+
+class FounderListView(ProfileCardListMixin, generics.ListAPIView):
     serializer_class = FounderListSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter]
-    filterset_fields = {
-        "industry__slug": ["exact"],
-        "stage": ["exact"],
-        "objectives__slug": ["exact"],
-    }
-    search_fields = [
-        "user__first_name",
-        "user__last_name",
-        "startup_name",
-        "about_startup",
-    ]
+    card_kind = "founder"
+    cursor_ordering = ("id",)
+    filter_backends = [DjangoFilterBackend, ProfileSearchFilter]
+    filterset_class = FounderFilterSet
 
     def get_queryset(self):
-        return FounderProfile.objects.select_related(
-            "user", "industry", "industry__category"
-        ).prefetch_related("objectives")
+        return FounderProfile.objects.only("id", "user_id")
+
 
+class FounderFacetsView(FounderListView):
+    """Facet counts for the founder directory under the current search/filters."""
 
-class FounderDetailView(generics.RetrieveAPIView):
+    def list(self, request, *args, **kwargs):
+        return Response(
+            cached_facets(
+                "founders",
+                request,
+                lambda: founder_facets(self.filter_queryset(self.get_queryset())),
+            )
+        )
+
+
+class FounderDetailView(ProfileCardDetailMixin, generics.RetrieveAPIView):
     serializer_class = FounderListSerializer
+    card_kind = "founder"
 
     def get_queryset(self):
-        return FounderProfile.objects.select_related(
-            "user", "industry", "industry__category"
-        ).prefetch_related("objectives")
+        return FounderProfile.objects.all()
+
+
+class BulkProfilesView(APIView):
+    """
+    Cards for many profiles in one request:
+    ?mentor_ids=1,2&founder_ids=3. Visibility matches the detail views;
+    ids that aren't visible are left out.
+    """
+
+    sources = {
+        "mentors": ("mentor_ids", MentorDetailView),
+        "founders": ("founder_ids", FounderDetailView),
+    }
+
+    def get(self, request):
+        requested = {}
+        for key, (param, _) in self.sources.items():
+            try:
+                ids = [
+                    int(value)
+                    for value in request.query_params.get(param, "").split(",")
+                    if value.strip()
+                ]
+            except ValueError:
+                return Response(
+                    {"detail": f"{param} must be a comma-separated list of ids."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if len(ids) > BULK_MAX_IDS:
+                return Response(
+                    {"detail": f"At most {BULK_MAX_IDS} {param} per request."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            requested[key] = list(dict.fromkeys(ids))
+
+        return Response(
+            {
+                key: [
+                    card
+                    for _, card in get_cards(
+                        view.card_kind,
+                        requested[key],
+                        request,
+                        approved_only=view.approved_only,
+                    )
+                ]
+                if requested[key]
+                else []
+                for key, (_, view) in self.sources.items()
+            }
+        )
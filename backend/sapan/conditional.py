@@ -0,0 +1,60 @@
+"""
+Conditional GET support (ETag / Last-Modified) for read endpoints.
+
+Views compute a cheap validator from timestamps or version counters before
+doing any serialization; when the client's copy is current they answer
+304 Not Modified without building the body.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Views implement get_validators(request, *args, **kwargs) and return
+    (etag_parts, last_modified), or None to skip conditional handling
+    (e.g. when the object doesn't exist).
+    """
+
+    # Per-user data by default: browsers may keep it but must revalidate
+    conditional_cache_control = {"private": True, "no_cache": True}
+    conditional_per_user = True
+
+    def get_validators(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        return self.conditional_response(super().get, request, *args, **kwargs)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        validators = self.get_validators(request, *args, **kwargs)
+        if validators is None:
+            return handler(request, *args, **kwargs)
+
+        etag_parts, last_modified = validators
+        etag = self._make_etag(request, etag_parts)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        patch_cache_control(response, **self.conditional_cache_control)
+        return response
+
+    def _make_etag(self, request, etag_parts):
+        # The same resource renders differently per viewer and per query string
+        user_id = None
+        if self.conditional_per_user and request.user.is_authenticated:
+            user_id = request.user.pk
+        key = repr((type(self).__name__, user_id, request.get_full_path(), etag_parts))
+        return quote_etag(hashlib.md5(key.encode()).hexdigest())
@@ -0,0 +1,104 @@
+"""
+Server-Sent Events endpoint for the event bus (sapan.events).
+
+Browsers' EventSource can't send an Authorization header, so clients first
+POST /api/events/ticket/ with their JWT and open
+/api/events/stream/?ticket=... with the short-lived signed ticket it
+returns. Clients that can set headers may send the JWT instead.
+
+The stream view is async: it must be served by an ASGI server, where an idle
+stream is just a suspended coroutine. Under a sync WSGI worker each stream
+would hold the whole worker.
+"""
+import asyncio
+import json
+import time
+
+from django.core import signing
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .events import event_bus
+
+TICKET_SALT = "sapan.event_stream"
+TICKET_MAX_AGE = 60
+# Comment lines keep proxies from closing idle streams
+HEARTBEAT_INTERVAL = 25
+# Streams are closed after this long; EventSource reconnects on its own
+STREAM_MAX_AGE = 3600
+RETRY_MS = 5000
+
+
+class EventTicketView(APIView):
+    """A signed ticket for opening the event stream without headers."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        ticket = signing.dumps(request.user.pk, salt=TICKET_SALT)
+        return Response({"ticket": ticket, "expires_in": TICKET_MAX_AGE})
+
+
+def _stream_user_id(request):
+    ticket = request.GET.get("ticket")
+    if ticket:
+        try:
+            return signing.loads(ticket, salt=TICKET_SALT, max_age=TICKET_MAX_AGE)
+        except signing.BadSignature:
+            return None
+
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        token = authentication.get_validated_token(raw_token)
+    except (InvalidToken, TokenError):
+        return None
+    user_id = token.get(jwt_settings.USER_ID_CLAIM)
+    return int(user_id) if user_id is not None else None
+
+
+def _format(event_type, data):
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+@require_GET
+async def event_stream(request):
+    user_id = _stream_user_id(request)
+    if user_id is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=401
+        )
+
+    async def events():
+        subscription = event_bus.subscribe(user_id)
+        deadline = time.monotonic() + STREAM_MAX_AGE
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            # Anything sent before this point was missed: refetch now
+            yield _format("ready", {})
+            while time.monotonic() < deadline:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), HEARTBEAT_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _format(event["type"], event["data"])
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Don't let nginx buffer the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
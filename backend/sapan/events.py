@@ -0,0 +1,195 @@
+"""
+Server-push event bus.
+
+Model changes publish small events ({"type", "data"} addressed to user ids)
+with Postgres NOTIFY. NOTIFY is transactional, so an event goes out only if
+the change commits. Each worker process keeps one LISTEN connection on a
+background thread and fans events out to the open streams of the addressed
+users (see sapan.event_stream), so idle streams cost no queries at all.
+
+Events only carry ids and statuses; clients refetch what they show through
+the regular endpoints. Nothing is stored, so a stream that reconnects (or
+whose listener had to reconnect) gets a "resync" event and should refetch.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+
+import psycopg2
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, connections
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "sapan_events"
+# Seconds between checks that the listener connection is still alive
+LISTEN_TIMEOUT = 30
+RECONNECT_DELAY = 5
+# Events buffered per stream before it is told to resync instead
+QUEUE_SIZE = 100
+# NOTIFY payloads must stay under 8000 bytes
+MAX_PAYLOAD = 7000
+
+
+def publish(user_ids, event_type, data):
+    """Send an event to `user_ids` once the current transaction commits."""
+    publish_many([(user_ids, event_type, data)])
+
+
+def publish_many(events):
+    """
+    Send (user_ids, event_type, data) events, packed into as few
+    notifications as the payload limit allows.
+    """
+    payloads, batch, size = [], [], 0
+    for user_ids, event_type, data in events:
+        message = json.dumps(
+            {"users": sorted(set(user_ids)), "type": event_type, "data": data},
+            cls=DjangoJSONEncoder,
+        )
+        if batch and size + len(message) > MAX_PAYLOAD:
+            payloads.append(batch)
+            batch, size = [], 0
+        batch.append(message)
+        size += len(message) + 1
+    if batch:
+        payloads.append(batch)
+
+    with connection.cursor() as cursor:
+        for batch in payloads:
+            cursor.execute(
+                "SELECT pg_notify(%s, %s)", [CHANNEL, f"[{','.join(batch)}]"]
+            )
+
+
+class Subscription:
+    """One open stream's queue, filled from the listener thread."""
+
+    def __init__(self, user_id, loop):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+
+    def deliver(self, event):
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A stuck client: drop what it has and make it refetch
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync", "data": {}})
+
+
+class EventBus:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+        self._listener = None
+
+    def subscribe(self, user_id):
+        """Start receiving `user_id`'s events on the running event loop."""
+        subscription = Subscription(user_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name="event-bus", daemon=True
+                )
+                self._listener.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    @property
+    def subscription_count(self):
+        with self._lock:
+            return sum(map(len, self._subscriptions.values()))
+
+    def dispatch(self, user_ids, event):
+        with self._lock:
+            targets = [
+                subscription
+                for user_id in user_ids
+                for subscription in self._subscriptions.get(user_id, ())
+            ]
+        for subscription in targets:
+            subscription.deliver(event)
+
+    def _broadcast(self, event):
+        with self._lock:
+            targets = [
+                subscription
+                for subscriptions in self._subscriptions.values()
+                for subscription in subscriptions
+            ]
+        for subscription in targets:
+            subscription.deliver(event)
+
+    def _listen(self):
+        first = True
+        while True:
+            listener = None
+            try:
+                listener = psycopg2.connect(
+                    **connections["default"].get_connection_params()
+                )
+                listener.set_isolation_level(
+                    psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT
+                )
+                with listener.cursor() as cursor:
+                    cursor.execute(f"LISTEN {CHANNEL}")
+                if not first:
+                    # Events sent while we were disconnected are lost
+                    self._broadcast({"type": "resync", "data": {}})
+                first = False
+                self._receive(listener)
+            except Exception:
+                # Anything that escapes _receive would end the thread and
+                # silently stop every stream in this worker
+                logger.exception("Event bus listener failed, reconnecting")
+                if listener is not None:
+                    listener.close()
+                time.sleep(RECONNECT_DELAY)
+
+    def _receive(self, listener):
+        while True:
+            if select.select([listener], [], [], LISTEN_TIMEOUT) == ([], [], []):
+                # Idle: make sure the connection is still there
+                with listener.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                continue
+            listener.poll()
+            while listener.notifies:
+                notify = listener.notifies.pop(0)
+                try:
+                    messages = json.loads(notify.payload)
+                except ValueError:
+                    logger.warning("Skipping malformed event payload")
+                    continue
+                if not isinstance(messages, list):
+                    messages = [messages]
+                for message in messages:
+                    try:
+                        users = message["users"]
+                        event = {"type": message["type"], "data": message["data"]}
+                    except (KeyError, TypeError):
+                        logger.warning("Skipping malformed event %r", message)
+                        continue
+                    self.dispatch(users, event)
+
+
+# Singleton instance
+event_bus = EventBus()
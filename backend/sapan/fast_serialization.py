@@ -0,0 +1,262 @@
+"""
+Fast read path for hot list endpoints.
+
+A ModelSerializer builds a model instance per row and then walks every
+field's get_attribute/to_representation. For read-only pages the same
+output can be built from `.values()` rows: ValuesRenderer compiles a
+serializer once per request into the lookups it needs plus a row -> dict
+function, and only calls the DRF field's to_representation where it
+actually converts something (datetimes, choices). The JSON is identical
+to the serializer's.
+
+Plain model fields, choice displays (`get_<field>_display`), FK primary
+keys, files, nested serializers over FKs / reverse one-to-ones and nested
+`many=True` serializers over top-level M2Ms are compiled automatically.
+A SerializerMethodField needs `Meta.values_sources = {name: [lookups]}`;
+its method then gets a lightweight row object exposing just those
+lookups (with related objects nested the same way instances nest them).
+"""
+import re
+from collections import defaultdict
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.relations import RelatedField
+from rest_framework.response import Response
+
+# Fields whose to_representation is the identity for values read from the DB
+PASSTHROUGH_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+)
+
+DISPLAY_SOURCE = re.compile(r"^get_(\w+)_display$")
+
+
+class ValuesRenderer:
+    """
+    Renders `serializer`'s representation from `.values()` rows of `model`
+    (the serializer's model by default); `fields` narrows the top level.
+    """
+
+    def __init__(self, serializer, fields=None, model=None, prefix=""):
+        self.request = serializer.context.get("request")
+        self.lookups = []
+        self.many = []
+        self.build = self._compile(
+            serializer, model or serializer.Meta.model, prefix, fields
+        )
+
+    def values(self, queryset, *extra):
+        """`queryset` as .values() rows carrying every lookup the plan reads."""
+        return queryset.values(*dict.fromkeys([*self.lookups, *extra]))
+
+    def render(self, rows):
+        rows = list(rows)
+        for relation in self.many:
+            relation.load(rows)
+        return [self.build(row) for row in rows]
+
+    # ---- compilation ----
+
+    def _compile(self, serializer, model, prefix, only=None):
+        steps = []
+        for name, field in serializer.fields.items():
+            if field.write_only or (only is not None and name not in only):
+                continue
+            steps.append((name, self._compile_field(serializer, field, model, prefix)))
+
+        def build(row):
+            return {name: get(row) for name, get in steps}
+
+        return build
+
+    def _compile_field(self, serializer, field, model, prefix):
+        if isinstance(field, serializers.SerializerMethodField):
+            return self._compile_method(serializer, field, model, prefix)
+
+        if isinstance(field, serializers.ListSerializer):
+            if prefix:
+                raise ImproperlyConfigured(
+                    f"{field.field_name}: nested many=True is only supported "
+                    "at the top level."
+                )
+            relation = _ManyRelation(self, field, model)
+            self.many.append(relation)
+            return relation.get
+
+        source = field.source_attrs
+        display = DISPLAY_SOURCE.match(source[-1])
+        if display:
+            model_field = _model_field(model, source[:-1] + [display.group(1)])
+            choices = {key: str(label) for key, label in model_field.flatchoices}
+            lookup = self._lookup(prefix, source[:-1] + [display.group(1)])
+            return _nullable(lookup, lambda value: choices.get(value, str(value)))
+
+        model_field = _model_field(model, source)
+
+        if isinstance(field, serializers.BaseSerializer):
+            nested_prefix = prefix + "__".join(source) + "__"
+            build = self._compile(field, model_field.related_model, nested_prefix)
+            present = self._lookup(prefix, source + ["pk"])
+            return lambda row: None if row[present] is None else build(row)
+
+        lookup = self._lookup(prefix, source)
+
+        if isinstance(field, (RelatedField, *PASSTHROUGH_FIELDS)):
+            return lambda row: row[lookup]
+
+        if isinstance(field, serializers.FileField):
+            return _nullable(lookup, self._file_url(field, model_field))
+
+        return _nullable(lookup, field.to_representation)
+
+    def _compile_method(self, serializer, field, model, prefix):
+        sources = getattr(serializer.Meta, "values_sources", {}).get(field.field_name)
+        if sources is None:
+            raise ImproperlyConfigured(
+                f"{type(serializer).__name__}.Meta.values_sources has no entry "
+                f"for the method field '{field.field_name}'."
+            )
+        paths = [source.split("__") for source in sources]
+        make_object = self._compile_object(model, prefix, paths)
+        method = getattr(serializer, field.method_name)
+        return lambda row: method(make_object(row))
+
+    def _compile_object(self, model, prefix, paths):
+        """A row -> SimpleNamespace function exposing `paths` as attributes."""
+        leaves = {}
+        relations = defaultdict(list)
+        for path in paths:
+            if len(path) == 1:
+                leaves[path[0]] = self._lookup(prefix, path)
+            else:
+                relations[path[0]].append(path[1:])
+
+        nested = []
+        for name, subpaths in relations.items():
+            model_field = model._meta.get_field(name)
+            present = self._lookup(prefix, [name, "pk"])
+            make = self._compile_object(
+                model_field.related_model, f"{prefix}{name}__", subpaths
+            )
+            # Missing reverse one-to-ones raise on access, so hasattr() is False;
+            # forward relations are None
+            nested.append((name, present, make, model_field.auto_created))
+
+        def make_object(row):
+            obj = SimpleNamespace(
+                **{name: row[lookup] for name, lookup in leaves.items()}
+            )
+            for name, present, make, reverse in nested:
+                if row[present] is not None:
+                    setattr(obj, name, make(row))
+                elif not reverse:
+                    setattr(obj, name, None)
+            return obj
+
+        return make_object
+
+    def _lookup(self, prefix, attrs):
+        lookup = prefix + "__".join(attrs)
+        if lookup not in self.lookups:
+            self.lookups.append(lookup)
+        return lookup
+
+    def _file_url(self, field, model_field):
+        # Mirrors FileField.to_representation on the stored name
+        request = self.request
+        storage = model_field.storage
+        use_url = getattr(field, "use_url", True)
+
+        def to_representation(name):
+            if not name:
+                return None
+            if not use_url:
+                return name
+            url = storage.url(name)
+            return request.build_absolute_uri(url) if request is not None else url
+
+        return to_representation
+
+
+class _ManyRelation:
+    """A nested many=True serializer over an M2M, loaded in one query per page."""
+
+    def __init__(self, renderer, field, model):
+        model_field = model._meta.get_field(field.source)
+        self.through = model_field.remote_field.through
+        self.source = model_field.m2m_field_name()
+        target = model_field.m2m_reverse_field_name()
+        # Same order as the related manager's default ordering
+        self.ordering = [
+            f"-{target}__{name[1:]}" if name.startswith("-") else f"{target}__{name}"
+            for name in model_field.related_model._meta.ordering
+        ]
+
+        # Child lookups are read through the through model's FK to the target
+        self.child = ValuesRenderer(
+            field.child, model=model_field.related_model, prefix=f"{target}__"
+        )
+        self.parent_pk = renderer._lookup("", ["pk"])
+        self.name = field.field_name
+        self.items = {}
+
+    def load(self, rows):
+        ids = {row[self.parent_pk] for row in rows}
+        self.items = defaultdict(list)
+        if not ids:
+            return
+        related = (
+            self.through.objects.filter(**{f"{self.source}__in": ids})
+            .order_by(*self.ordering)
+            .values(self.source, *self.child.lookups)
+        )
+        for row in related:
+            self.items[row[self.source]].append(self.child.build(row))
+
+    def get(self, row):
+        return self.items.get(row[self.parent_pk], [])
+
+
+def _nullable(lookup, convert):
+    def get(row):
+        value = row[lookup]
+        return None if value is None else convert(value)
+
+    return get
+
+
+def _model_field(model, attrs):
+    try:
+        for attr in attrs[:-1]:
+            model = model._meta.get_field(attr).related_model
+        return model._meta.get_field(attrs[-1])
+    except FieldDoesNotExist:
+        raise ImproperlyConfigured(
+            f"'{'.'.join(attrs)}' on {model.__name__} isn't a model field "
+            "and can't be read from values()."
+        )
+
+
+class ValuesListMixin:
+    """List views rendered with ValuesRenderer instead of the serializer."""
+
+    def list(self, request, *args, **kwargs):
+        if not settings.FAST_SERIALIZATION:
+            return super().list(request, *args, **kwargs)
+
+        renderer = ValuesRenderer(self.get_serializer())
+        # The keyset cursor reads the ordering values off the last row
+        ordering = [name.lstrip("-") for name in getattr(self, "cursor_ordering", ())]
+        queryset = renderer.values(
+            self.filter_queryset(self.get_queryset()), *ordering
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(renderer.render(page))
+        return Response(renderer.render(queryset))
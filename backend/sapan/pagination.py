@@ -0,0 +1,152 @@
+"""
+Project-wide pagination.
+
+Page-number pagination by default. Clients can opt into keyset (cursor)
+pagination with `?pagination=cursor`; follow-up pages are requested with the
+`cursor` param from the `next` link. Keyset pages seek on the view's
+`cursor_ordering` instead of using COUNT(*) + OFFSET, so deep pages cost the
+same as the first one.
+
+Searches are always page-numbered: their results are ordered by relevance
+(see profiles.search.ProfileSearchFilter), which a keyset over the view's
+cursor_ordering would replace.
+"""
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+DEFAULT_CURSOR_ORDERING = ("id",)
+
+
+def _encode_value(value):
+    # Full-precision isoformat; DjangoJSONEncoder drops microseconds, which
+    # would make the seek skip or repeat rows.
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset pagination over a unique ordering.
+    The cursor holds the ordering values of the last row on the page.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, ordering=DEFAULT_CURSOR_ORDERING):
+        self.ordering = tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.model = queryset.model
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self._seek_filter(position))
+
+        # Fetch one extra row to know whether there is a next page
+        results = list(queryset[: self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        self.next_position = None
+        if self.has_next:
+            last = results[-1]
+            self.next_position = [
+                # Model instances, or .values() dicts from the fast list path
+                last[field] if isinstance(last, dict) else getattr(last, field)
+                for field in (name.lstrip("-") for name in self.ordering)
+            ]
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", None),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+
+    def encode_cursor(self, position):
+        payload = json.dumps(position, default=_encode_value)
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                self.model._meta.get_field(name.lstrip("-")).to_python(value)
+                for name, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _seek_filter(self, position):
+        """
+        Rows strictly after `position` in the ordering, e.g. for
+        (-created_at, id): created_at < c OR (created_at = c AND id > i).
+        """
+        seek = Q()
+        equal = Q()
+        for name, value in zip(self.ordering, position):
+            field = name.lstrip("-")
+            lookup = "lt" if name.startswith("-") else "gt"
+            seek |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        return seek
+
+
+class DefaultPagination(PageNumberPagination):
+    """Page-number pagination with an opt-in keyset mode."""
+
+    mode_query_param = "pagination"
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self._wants_keyset(request):
+            ordering = getattr(view, "cursor_ordering", DEFAULT_CURSOR_ORDERING)
+            self.keyset = KeysetPagination(ordering)
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def _wants_keyset(self, request):
+        if request.query_params.get(api_settings.SEARCH_PARAM, "").strip():
+            return False
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or KeysetPagination.cursor_query_param in request.query_params
+        )
@@ -0,0 +1,56 @@
+"""
+orjson-based JSON renderer, the project-wide default.
+
+Output is byte-for-byte what DRF's JSONRenderer produces with the project
+settings (compact, UTF-8, \\u2028/\\u2029 escaped): datetimes, dates, times
+and UUIDs are encoded natively by orjson, and everything orjson doesn't know
+(Decimal, lazy strings, querysets, numpy values, ...) goes through DRF's own
+encoder. Indented output (`indent=` in the media type, the browsable API)
+and data orjson rejects (integers over 64 bits) fall back to the stdlib
+renderer. For valid JSON the one textual difference is float exponents:
+1e-07 is written 1e-7, which parses to the same value.
+
+Behaviour change: NaN and +/-Infinity are written as null, where
+JSONRenderer raised ValueError ("Out of range float values are not JSON
+compliant"). Checking every response for them would cost more than the
+stdlib encoder saves, so code that can produce non-finite floats (e.g.
+scores divided by a possibly-zero sum) must not hand them to a response.
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# No orjson option rejects NaN/Infinity; they render as null (see above)
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+# orjson calls this for every type it can't serialize itself
+_default = JSONEncoder().default
+
+LINE_SEPARATOR = "\u2028".encode()
+PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if (
+            self.get_indent(accepted_media_type, renderer_context) is not None
+            or not self.compact
+            or self.ensure_ascii
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep the output a strict javascript subset, as JSONRenderer does
+        if LINE_SEPARATOR in ret or PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(LINE_SEPARATOR, b"\\u2028").replace(
+                PARAGRAPH_SEPARATOR, b"\\u2029"
+            )
+        return ret
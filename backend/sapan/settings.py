@@ -23,6 +23,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.sites",
+    "django.contrib.postgres",
     # Third party
     "rest_framework",
     "rest_framework.authtoken",
@@ -92,6 +93,26 @@ DATABASES = {
     }
 }
 
+# Production must use a shared backend (docker-compose.prod.yml runs Redis):
+# facet versions, connection graphs, the townhall feed and calendar busy
+# periods are invalidated through the cache, and a per-process LocMemCache
+# only sees the invalidations made by its own worker. LocMem is for
+# single-process development.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("DJANGO_CACHE_LOCATION", ""),
+    }
+}
+if CACHES["default"]["BACKEND"].endswith("LocMemCache"):
+    # The default of 300 entries thrashes with per-user graphs and
+    # per-mentor busy periods
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": int(os.environ.get("DJANGO_CACHE_MAX_ENTRIES", 100000))
+    }
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"
@@ -122,15 +143,62 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    "DEFAULT_RENDERER_CLASSES": [
+        "sapan.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "sapan.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "sapan.pagination.DefaultPagination",
     "PAGE_SIZE": 20,
 }
 
+# Render hot list endpoints from .values() rows (sapan.fast_serialization)
+FAST_SERIALIZATION = os.environ.get("FAST_SERIALIZATION", "True").lower() == "true"
+
+# Reference data endpoints (industries, objectives, stages): browser/proxy
+# max-age and how often each worker re-checks the version stamp (seconds)
+REFERENCE_DATA_MAX_AGE = int(os.environ.get("REFERENCE_DATA_MAX_AGE", 3600))
+REFERENCE_DATA_CHECK_INTERVAL = int(
+    os.environ.get("REFERENCE_DATA_CHECK_INTERVAL", 5)
+)
+
+# How far back (seconds) each mentor recommendation sync looks before the
+# newest updated_at it has seen: at least twice the longest transaction that
+# saves a mentor profile (gunicorn kills requests after 30s)
+MENTOR_MATCH_SYNC_MARGIN = int(os.environ.get("MENTOR_MATCH_SYNC_MARGIN", 60))
+
+# Directory facet counts (seconds); entries are also invalidated on profile saves
+FACET_CACHE_TIMEOUT = int(os.environ.get("FACET_CACHE_TIMEOUT", 300))
+
+# Per-user connection graphs (seconds); entries are also dropped on every change
+CONNECTION_GRAPH_TIMEOUT = int(os.environ.get("CONNECTION_GRAPH_TIMEOUT", 3600))
+
+# Townhall feed: server-side lifetime (also rebuilt on every acceptance) and
+# the public max-age of the guest variant (seconds)
+TOWNHALL_FEED_TIMEOUT = int(os.environ.get("TOWNHALL_FEED_TIMEOUT", 300))
+TOWNHALL_PUBLIC_MAX_AGE = int(os.environ.get("TOWNHALL_PUBLIC_MAX_AGE", 60))
+
+# Google Calendar busy periods: cache lifetime (seconds; also invalidated on
+# bookings and calendar changes) and how many days each fetch covers
+CALENDAR_BUSY_CACHE_TIMEOUT = int(os.environ.get("CALENDAR_BUSY_CACHE_TIMEOUT", 300))
+CALENDAR_BUSY_CACHE_DAYS = int(os.environ.get("CALENDAR_BUSY_CACHE_DAYS", 28))
+# Seconds a request waits for calendars before answering without them, the
+# fetches run concurrently per worker process, and the per-call HTTP timeout
+CALENDAR_BUSY_BUDGET = float(os.environ.get("CALENDAR_BUSY_BUDGET", 2.0))
+CALENDAR_FETCH_WORKERS = int(os.environ.get("CALENDAR_FETCH_WORKERS", 32))
+CALENDAR_HTTP_TIMEOUT = float(os.environ.get("CALENDAR_HTTP_TIMEOUT", 10))
+# Empty for Google; set to point the calendar API at a local fake
+GOOGLE_CALENDAR_API_ENDPOINT = os.environ.get("GOOGLE_CALENDAR_API_ENDPOINT", "")
+
 # JWT Settings
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(
@@ -3,6 +3,8 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from .event_stream import EventTicketView, event_stream
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/auth/", include("users.urls")),
@@ -10,6 +12,8 @@ urlpatterns = [
     path("api/", include("industries.urls")),
     path("api/", include("connections.urls")),
     path("api/office-hours/", include("office_hours.urls")),
+    path("api/events/ticket/", EventTicketView.as_view(), name="event-ticket"),
+    path("api/events/stream/", event_stream, name="event-stream"),
 ]
 
 if settings.DEBUG:
@@ -33,10 +33,21 @@ class UserAdmin(BaseUserAdmin):
 
     @admin.action(description="Approve selected mentors")
     def approve_mentors(self, request, queryset):
-        updated = queryset.filter(user_type="mentor").update(is_approved=True)
+        updated = self._set_approval(queryset, True)
         self.message_user(request, f"{updated} mentor(s) approved.")
 
     @admin.action(description="Reject selected mentors")
     def reject_mentors(self, request, queryset):
-        updated = queryset.filter(user_type="mentor").update(is_approved=False)
+        updated = self._set_approval(queryset, False)
         self.message_user(request, f"{updated} mentor(s) rejected.")
+
+    def _set_approval(self, queryset, is_approved):
+        # Saved one by one, not with queryset.update(): the post_save
+        # receivers refresh the mentors' cards, facet counts and match index,
+        # and updated_at backs the /auth/me/ validators
+        mentors = list(queryset.filter(user_type="mentor"))
+        for mentor in mentors:
+            if mentor.is_approved != is_approved:
+                mentor.is_approved = is_approved
+                mentor.save(update_fields=["is_approved", "updated_at"])
+        return len(mentors)
@@ -0,0 +1,433 @@
+"""
+Management command to generate a large synthetic dataset for performance work.
+Usage: python manage.py generate_synthetic_data [--founders 100000] [--mentors 10000]
+           [--connections 1000000] [--bookings 100000] [--seed 42] [--batch-size 5000]
+
+Rows are written with bulk_create and derived from --seed and the volumes, so
+a run is reproducible and re-running it only inserts what's missing.
+Synthetic accounts use @synthetic.sapan.io emails and the password
+'syntheticpassword123'. Reference data must be seeded first.
+"""
+import random
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from itertools import accumulate
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from connections.models import ConnectionRequest
+from connections.services.connection_graph import forget_graphs
+from connections.services.townhall import refresh_townhall_feed
+from industries.models import IndustrySubcategory, Objective
+from office_hours.models import AvailabilityRule, Booking
+from profiles.facets import bump_facet_version
+from profiles.filters import refresh_industry_keys
+from profiles.matching import mentor_match_index
+from profiles.models import FounderProfile, MentorProfile
+from profiles.search import rebuild_search_documents
+
+User = get_user_model()
+
+DOMAIN = 'synthetic.sapan.io'
+PASSWORD = 'syntheticpassword123'
+TIMEZONE = 'Asia/Bangkok'
+
+# Distributions
+STAGE_WEIGHTS = {'idea': 30, 'pre_seed': 30, 'seed': 25, 'series_a': 10, 'growth': 5}
+REQUEST_STATUS_WEIGHTS = {'accepted': 55, 'pending': 30, 'declined': 15}
+INTENT_WEIGHTS = {'mentor_me': 50, 'collaborate': 20, 'peer_network': 30}
+# (from, to) user types of connection requests
+REQUEST_DIRECTION_WEIGHTS = {
+    ('founder', 'mentor'): 70,
+    ('founder', 'founder'): 20,
+    ('mentor', 'founder'): 10,
+}
+MENTOR_APPROVAL_RATE = 0.9
+MENTOR_AVAILABILITY_RATE = 0.7
+# Popularity is Zipf-like: a few mentors/founders get most of the requests
+POPULARITY_EXPONENT = 1.1
+REQUEST_HISTORY_DAYS = 365
+BOOKING_PAST_DAYS = 90
+BOOKING_FUTURE_DAYS = 30
+
+FIRST_NAMES = [
+    'Anan', 'Ploy', 'Krit', 'Mali', 'Somchai', 'Nok', 'Arthit', 'Fah', 'Preecha',
+    'Dao', 'James', 'Maya', 'Sarah', 'David', 'Lisa', 'Michael', 'Anna', 'Tom',
+    'Wei', 'Mei', 'Hiro', 'Yuki', 'Priya', 'Arjun', 'Linh', 'Minh', 'Siti', 'Budi',
+]
+LAST_NAMES = [
+    'Srisuk', 'Chaiyaporn', 'Wongsa', 'Rattana', 'Suwan', 'Boonmee', 'Chen',
+    'Tanaka', 'Kumar', 'Nguyen', 'Santoso', 'Lee', 'Park', 'Wilson', 'Patel',
+    'Wong', 'Lim', 'Tan', 'Garcia', 'Smith',
+]
+COMPANIES = [
+    'Agoda', 'Grab', 'LINE', 'SCB 10X', 'Kasikorn Labs', 'Google', 'Sea Group',
+    'Ascend', 'Bitkub', 'Flash Express', 'Sequoia Capital', 'Openspace Ventures',
+    'Wongnai', 'LINE MAN', 'Pomelo', 'Omise',
+]
+ROLES = [
+    'CTO', 'CEO', 'Product Director', 'VP Engineering', 'Partner', 'Angel Investor',
+    'Head of Growth', 'CMO', 'Principal', 'Staff Engineer',
+]
+STARTUP_PREFIXES = ['Agri', 'Pay', 'Learn', 'Health', 'Farm', 'Ship', 'Data', 'Eco', 'Food', 'Smart']
+STARTUP_SUFFIXES = ['ly', 'Hub', 'Labs', 'Go', 'Base', 'Flow', 'Stack', 'Works', 'AI', 'Now']
+BIO_TOPICS = [
+    'fundraising', 'product-market fit', 'B2B sales', 'hiring', 'fintech',
+    'marketplaces', 'logistics', 'healthcare', 'AI products', 'growth marketing',
+    'developer tools', 'Southeast Asia expansion',
+]
+
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _zipf_cum_weights(count):
+    # Cumulative, so rng.choices() bisects instead of summing on every draw
+    return list(accumulate(1 / rank**POPULARITY_EXPONENT for rank in range(1, count + 1)))
+
+
+@contextmanager
+def _explicit_timestamps(model, *field_names):
+    """Let bulk_create keep the given auto_now/auto_now_add values."""
+    fields = [model._meta.get_field(name) for name in field_names]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Generates a large synthetic dataset with bulk inserts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--founders', type=int, default=100_000)
+        parser.add_argument('--mentors', type=int, default=10_000)
+        parser.add_argument('--connections', type=int, default=1_000_000)
+        parser.add_argument('--bookings', type=int, default=100_000)
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows per INSERT',
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now().replace(minute=0, second=0, microsecond=0)
+
+        self.subcategories = list(IndustrySubcategory.objects.values_list('id', flat=True))
+        self.objectives = list(Objective.objects.values_list('id', flat=True))
+        if not self.subcategories or not self.objectives:
+            self.stdout.write(self.style.ERROR(
+                'No industries found. Run migrations and seed reference data first.'
+            ))
+            return
+        # Some industries are far more common than others
+        self.rng.shuffle(self.subcategories)
+        self.subcategory_weights = _zipf_cum_weights(len(self.subcategories))
+
+        self.stdout.write('Creating users...')
+        mentors = self.create_users('mentor', options['mentors'])
+        founders = self.create_users('founder', options['founders'])
+
+        self.stdout.write('Creating profiles...')
+        self.create_mentor_profiles(mentors)
+        self.create_founder_profiles(founders)
+
+        self.stdout.write('Creating availability rules...')
+        rules = self.create_availability(mentors)
+
+        self.stdout.write('Creating connection requests...')
+        self.create_connections(mentors, founders, options['connections'])
+
+        self.stdout.write('Creating bookings...')
+        self.create_bookings(rules, founders, options['bookings'])
+
+        # bulk_create sends no signals; rebuild what the signals would maintain
+        self.stdout.write('Rebuilding search documents, profile cards and caches...')
+        rebuild_search_documents()
+        refresh_industry_keys('mentor')
+        refresh_industry_keys('founder')
+        call_command('rebuild_profile_cards', stdout=self.stdout)
+        bump_facet_version()
+        mentor_match_index.invalidate()
+        forget_graphs(user_id for user_id, _ in mentors + founders)
+        refresh_townhall_feed()
+
+        self.stdout.write(self.style.SUCCESS('Successfully generated synthetic data!'))
+
+    # ============ Users and profiles ============
+
+    def create_users(self, user_type, count):
+        """Create `count` users of `user_type`; returns [(user_id, is_approved)]."""
+        password = make_password(PASSWORD)
+        users = []
+        for i in range(count):
+            is_approved = user_type == 'founder' or self.rng.random() < MENTOR_APPROVAL_RATE
+            topics = self.rng.sample(BIO_TOPICS, 2)
+            users.append(User(
+                email=f'{user_type}{i}@{DOMAIN}',
+                username=f'{user_type}{i}.synthetic',
+                password=password,
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                user_type=user_type,
+                bio=f'Interested in {topics[0]} and {topics[1]}.',
+                is_approved=is_approved,
+                is_profile_complete=True,
+            ))
+        User.objects.bulk_create(users, batch_size=self.batch_size, ignore_conflicts=True)
+
+        ids = dict(
+            User.objects.filter(user_type=user_type, email__endswith=f'@{DOMAIN}')
+            .values_list('email', 'id')
+        )
+        self.stdout.write(f'  {user_type}s: {len(ids)}')
+        return [(ids[user.email], user.is_approved) for user in users]
+
+    def create_mentor_profiles(self, mentors):
+        profiles, expertise, help_with = [], [], []
+        for user_id, _ in mentors:
+            profiles.append(MentorProfile(
+                user_id=user_id,
+                company=self.rng.choice(COMPANIES),
+                role=self.rng.choice(ROLES),
+                years_of_experience=min(int(self.rng.lognormvariate(2.2, 0.5)), 40),
+            ))
+            expertise.append(self._sample_subcategories(self.rng.randint(1, 4)))
+            help_with.append(self.rng.sample(self.objectives, self.rng.randint(1, 3)))
+        MentorProfile.objects.bulk_create(
+            profiles, batch_size=self.batch_size, ignore_conflicts=True
+        )
+
+        profile_ids = dict(MentorProfile.objects.values_list('user_id', 'id'))
+        self._bulk_through(
+            MentorProfile.expertise_industries.through,
+            'mentorprofile_id',
+            'industrysubcategory_id',
+            [
+                (profile_ids[user_id], subcategory_ids)
+                for (user_id, _), subcategory_ids in zip(mentors, expertise)
+            ],
+        )
+        self._bulk_through(
+            MentorProfile.can_help_with.through,
+            'mentorprofile_id',
+            'objective_id',
+            [
+                (profile_ids[user_id], objective_ids)
+                for (user_id, _), objective_ids in zip(mentors, help_with)
+            ],
+        )
+
+    def create_founder_profiles(self, founders):
+        profiles, objectives = [], []
+        for user_id, _ in founders:
+            profiles.append(FounderProfile(
+                user_id=user_id,
+                startup_name=(
+                    self.rng.choice(STARTUP_PREFIXES) + self.rng.choice(STARTUP_SUFFIXES)
+                ),
+                industry_id=self._sample_subcategories(1)[0],
+                stage=_weighted(self.rng, STAGE_WEIGHTS),
+                about_startup=f'Building {self.rng.choice(BIO_TOPICS)} for SMEs.',
+            ))
+            objectives.append(self.rng.sample(self.objectives, self.rng.randint(1, 3)))
+        FounderProfile.objects.bulk_create(
+            profiles, batch_size=self.batch_size, ignore_conflicts=True
+        )
+
+        profile_ids = dict(FounderProfile.objects.values_list('user_id', 'id'))
+        self._bulk_through(
+            FounderProfile.objectives.through,
+            'founderprofile_id',
+            'objective_id',
+            [
+                (profile_ids[user_id], objective_ids)
+                for (user_id, _), objective_ids in zip(founders, objectives)
+            ],
+        )
+
+    def _sample_subcategories(self, count):
+        picked = set()
+        while len(picked) < min(count, len(self.subcategories)):
+            picked.add(self.rng.choices(
+                self.subcategories, cum_weights=self.subcategory_weights
+            )[0])
+        return sorted(picked)
+
+    def _bulk_through(self, through, source, target, rows):
+        through.objects.bulk_create(
+            [
+                through(**{source: profile_id, target: target_id})
+                for profile_id, target_ids in rows
+                for target_id in target_ids
+            ],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+
+    # ============ Availability and bookings ============
+
+    def create_availability(self, mentors):
+        """Returns the generated rules as (mentor_id, weekday, start, end, minutes)."""
+        rules = []
+        for user_id, is_approved in mentors:
+            if not is_approved or self.rng.random() >= MENTOR_AVAILABILITY_RATE:
+                continue
+            # Mostly weekdays
+            weekdays = set(self.rng.choices(range(7), weights=[5, 5, 5, 5, 5, 1, 1], k=3))
+            for weekday in sorted(weekdays):
+                start_hour = self.rng.randint(8, 17)
+                end_hour = min(start_hour + self.rng.randint(1, 4), 21)
+                minutes = self.rng.choice([30, 30, 45, 60])
+                rules.append((user_id, weekday, time(start_hour), time(end_hour), minutes))
+
+        existing = set(
+            AvailabilityRule.objects.filter(mentor__email__endswith=f'@{DOMAIN}')
+            .values_list('mentor_id', 'weekday', 'start_time')
+        )
+        AvailabilityRule.objects.bulk_create(
+            [
+                AvailabilityRule(
+                    mentor_id=mentor_id,
+                    weekday=weekday,
+                    start_time=start,
+                    end_time=end,
+                    slot_duration_minutes=minutes,
+                    timezone=TIMEZONE,
+                )
+                for mentor_id, weekday, start, end, minutes in rules
+                if (mentor_id, weekday, start) not in existing
+            ],
+            batch_size=self.batch_size,
+        )
+        self.stdout.write(f'  rules: {len(rules)}')
+        return rules
+
+    def create_bookings(self, rules, founders, count):
+        if not rules or not founders:
+            return
+        tz = ZoneInfo(TIMEZONE)
+        today = self.now.astimezone(tz).date()
+        founder_ids = [user_id for user_id, _ in founders]
+
+        bookings = {}
+        attempts = 0
+        while len(bookings) < count and attempts < count * 3:
+            attempts += 1
+            mentor_id, weekday, start, end, minutes = self.rng.choice(rules)
+            day = today + timedelta(
+                days=self.rng.randint(-BOOKING_PAST_DAYS, BOOKING_FUTURE_DAYS)
+            )
+            day += timedelta(days=(weekday - day.weekday()) % 7)
+            slots = (end.hour - start.hour) * 60 // minutes
+            if not slots:
+                continue
+            start_time = datetime.combine(day, start, tzinfo=tz) + timedelta(
+                minutes=minutes * self.rng.randrange(slots)
+            )
+            if (mentor_id, start_time) in bookings:
+                continue
+
+            if start_time < self.now:
+                status = _weighted(self.rng, {
+                    'completed': 85, 'cancelled_by_founder': 10, 'cancelled_by_mentor': 5,
+                })
+            else:
+                status = _weighted(self.rng, {
+                    'confirmed': 90, 'cancelled_by_founder': 6, 'cancelled_by_mentor': 4,
+                })
+            bookings[(mentor_id, start_time)] = Booking(
+                mentor_id=mentor_id,
+                founder_id=self.rng.choice(founder_ids),
+                start_time=start_time,
+                end_time=start_time + timedelta(minutes=minutes),
+                agenda=f'Talk about {self.rng.choice(BIO_TOPICS)}',
+                status=status,
+                reminder_sent=start_time < self.now,
+            )
+
+        existing = set(
+            Booking.objects.filter(mentor__email__endswith=f'@{DOMAIN}')
+            .values_list('mentor_id', 'start_time')
+        )
+        Booking.objects.bulk_create(
+            [booking for key, booking in bookings.items() if key not in existing],
+            batch_size=self.batch_size,
+        )
+        self.stdout.write(f'  bookings: {len(bookings)}')
+
+    # ============ Connections ============
+
+    def create_connections(self, mentors, founders, count):
+        users = {
+            'mentor': [user_id for user_id, is_approved in mentors if is_approved],
+            'founder': [user_id for user_id, _ in founders],
+        }
+        if not users['mentor'] or len(users['founder']) < 2:
+            return
+        # Who is popular is random, how popular follows the Zipf weights
+        popularity = {}
+        for user_type, ids in users.items():
+            ids = list(ids)
+            self.rng.shuffle(ids)
+            popularity[user_type] = (ids, _zipf_cum_weights(len(ids)))
+
+        # One request per pair of users, in either direction. Requests are
+        # inserted a batch at a time so only the pairs stay in memory
+        pairs = set()
+        batch = []
+        attempts = 0
+        while len(pairs) < count and attempts < count * 3:
+            attempts += 1
+            from_type, to_type = _weighted(self.rng, REQUEST_DIRECTION_WEIGHTS)
+            from_id = self.rng.choice(users[from_type])
+            ids, cum_weights = popularity[to_type]
+            to_id = self.rng.choices(ids, cum_weights=cum_weights)[0]
+            pair = (min(from_id, to_id), max(from_id, to_id))
+            if from_id == to_id or pair in pairs:
+                continue
+            pairs.add(pair)
+
+            created_at = self.now - timedelta(
+                minutes=self.rng.randint(0, REQUEST_HISTORY_DAYS * 24 * 60)
+            )
+            status = _weighted(self.rng, REQUEST_STATUS_WEIGHTS)
+            responded_at = None
+            if status != 'pending':
+                responded_at = min(
+                    created_at + timedelta(hours=self.rng.expovariate(1 / 36)), self.now
+                )
+            batch.append(ConnectionRequest(
+                from_user_id=from_id,
+                to_user_id=to_id,
+                message='Would love to connect!',
+                intent=_weighted(self.rng, INTENT_WEIGHTS),
+                status=status,
+                created_at=created_at,
+                responded_at=responded_at,
+            ))
+            if len(batch) == self.batch_size:
+                self._insert_connections(batch)
+                batch = []
+        self._insert_connections(batch)
+        self.stdout.write(f'  connection requests: {len(pairs)}')
+
+    def _insert_connections(self, requests):
+        with _explicit_timestamps(ConnectionRequest, 'created_at'):
+            ConnectionRequest.objects.bulk_create(
+                requests, batch_size=self.batch_size, ignore_conflicts=True
+            )
@@ -0,0 +1,103 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from profiles.models import MentorProfile
+
+User = get_user_model()
+
+
+class MentorApprovalActionTests(TestCase):
+    """
+    The admin approve/reject actions reach everything derived from
+    is_approved: the directory, detail and bulk endpoints.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            email="admin@example.com", username="admin", password="secret"
+        )
+        cls.viewer = User.objects.create_user(
+            email="founder@example.com",
+            username="founder",
+            password="secret",
+            user_type="founder",
+        )
+        cls.mentor = User.objects.create_user(
+            email="mentor@example.com",
+            username="mentor",
+            password="secret",
+            user_type="mentor",
+        )
+        cls.profile = MentorProfile.objects.create(
+            user=cls.mentor, company="Acme", role="CTO", years_of_experience=10
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+        self.api = APIClient()
+        self.api.force_authenticate(self.viewer)
+
+    def _run_action(self, action):
+        response = self.client.post(
+            reverse("admin:users_user_changelist"),
+            {"action": action, "_selected_action": [self.mentor.pk, self.viewer.pk]},
+        )
+        self.assertEqual(response.status_code, 302)
+
+    def _visibility(self):
+        listed = self.api.get("/api/profiles/mentors/").json()["results"]
+        detail = self.api.get(f"/api/profiles/mentors/{self.profile.pk}/")
+        bulk = self.api.get("/api/profiles/bulk/", {"mentor_ids": self.profile.pk})
+        return {
+            "list": [card["id"] for card in listed] == [self.profile.pk],
+            "detail": detail.status_code == 200,
+            "bulk": [card["id"] for card in bulk.json()["mentors"]]
+            == [self.profile.pk],
+        }
+
+    def test_approve_and_reject(self):
+        hidden = {"list": False, "detail": False, "bulk": False}
+        shown = {"list": True, "detail": True, "bulk": True}
+        # Warm the cards and facets the actions have to invalidate
+        self.assertEqual(self._visibility(), hidden)
+
+        self._run_action("approve_mentors")
+        self.mentor.refresh_from_db()
+        self.assertTrue(self.mentor.is_approved)
+        self.assertEqual(self._visibility(), shown)
+
+        self._run_action("reject_mentors")
+        self.mentor.refresh_from_db()
+        self.assertFalse(self.mentor.is_approved)
+        self.assertEqual(self._visibility(), hidden)
+
+
+class MeConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.mentor = User.objects.create_user(
+            email="mentor@example.com",
+            username="mentor",
+            password="secret",
+            user_type="mentor",
+        )
+
+    def _get(self, **headers):
+        # A fresh instance, as authentication loads one per request
+        client = APIClient()
+        client.force_authenticate(User.objects.get(pk=self.mentor.pk))
+        return client.get("/api/auth/me/", **headers)
+
+    def test_etag_changes_with_fields_updated_without_save(self):
+        etag = self._get()["ETag"]
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        User.objects.filter(pk=self.mentor.pk).update(is_approved=True)
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["is_approved"])
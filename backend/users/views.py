@@ -11,6 +11,8 @@ from allauth.socialaccount.providers.line.views import LineOAuth2Adapter
 from allauth.socialaccount.providers.oauth2.client import OAuth2Client
 from dj_rest_auth.registration.views import SocialLoginView
 
+from sapan.conditional import ConditionalGetMixin
+
 from .serializers import UserSerializer, UserUpdateSerializer, CompleteProfileSerializer
 
 User = get_user_model()
@@ -103,13 +105,20 @@ class LogoutView(APIView):
             )
 
 
-class MeView(generics.RetrieveUpdateAPIView):
+class MeView(ConditionalGetMixin, generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = UserSerializer
 
     def get_object(self):
         return self.request.user
 
+    def get_validators(self, request, *args, **kwargs):
+        # Every serialized value, not just updated_at: updates that skip
+        # save() (e.g. queryset.update(is_approved=...)) leave it unchanged
+        user = request.user
+        etag_parts = [str(getattr(user, field)) for field in UserSerializer.Meta.fields]
+        return etag_parts, user.updated_at
+
     def get_serializer_class(self):
         if self.request.method in ["PUT", "PATCH"]:
             return UserUpdateSerializer
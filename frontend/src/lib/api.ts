@@ -11,6 +11,7 @@ import type {
   ConnectionIntent,
   Connection,
   TownhallConnection,
+  UserWithProfile,
   PaginatedResponse,
   CalendarStatus,
   AvailabilityRule,
@@ -186,6 +187,8 @@ export const profileApi = {
 export const discoveryApi = {
   getMentors: async (params?: {
     expertise_industries__slug?: string;
+    industry?: string;
+    industry_category?: string;
     can_help_with__slug?: string;
     search?: string;
     page?: number;
@@ -201,6 +204,8 @@ export const discoveryApi = {
 
   getFounders: async (params?: {
     industry__slug?: string;
+    industry?: string;
+    industry_category?: string;
     stage?: string;
     objectives__slug?: string;
     search?: string;
@@ -262,6 +267,28 @@ export const connectionApi = {
     const response = await api.post(`/connections/request/${id}/decline/`);
     return response.data;
   },
+
+  // People you may know, most mutual connections first
+  getSuggestions: async (
+    limit?: number,
+  ): Promise<{ user: UserWithProfile; mutual_count: number }[]> => {
+    const response = await api.get("/connections/suggestions/", {
+      params: { limit },
+    });
+    return response.data;
+  },
+
+  // Answer up to 100 received requests at once
+  respondToRequests: async (
+    action: "accept" | "decline",
+    ids: number[],
+  ): Promise<{ results: { id: number; outcome: string }[] }> => {
+    const response = await api.post("/connections/requests/bulk/", {
+      action,
+      ids,
+    });
+    return response.data;
+  },
 };
 
 // Office Hours
@@ -331,13 +358,37 @@ export const officeHoursApi = {
   getMentorSlots: async (
     mentorId: number,
     params?: { date?: string; days?: number },
-  ): Promise<{ slots: TimeSlot[]; message?: string }> => {
+  ): Promise<{
+    slots: TimeSlot[];
+    message?: string;
+    calendar_checked?: boolean;
+  }> => {
     const response = await api.get(`/office-hours/mentors/${mentorId}/slots/`, {
       params,
     });
     return response.data;
   },
 
+  // Mentors with free slots in a window, soonest first
+  searchSlots: async (params?: {
+    start?: string;
+    end?: string;
+    industry?: string;
+    industry_category?: string;
+    can_help_with__slug?: string;
+    page?: number;
+  }): Promise<
+    PaginatedResponse<{
+      mentor: MentorProfile;
+      next_slot: TimeSlot;
+      slots: TimeSlot[];
+      calendar_checked: boolean;
+    }>
+  > => {
+    const response = await api.get("/office-hours/slots/search/", { params });
+    return response.data;
+  },
+
   // Bookings
   getBookings: async (): Promise<PaginatedResponse<Booking>> => {
     const response = await api.get("/office-hours/bookings/");
@@ -360,4 +411,54 @@ export const officeHoursApi = {
   },
 };
 
+// Server push
+const STREAM_EVENTS = [
+  "ready",
+  "resync",
+  "connection_request.created",
+  "connection_request.accepted",
+  "connection_request.declined",
+  "booking.created",
+  "booking.cancelled",
+];
+
+export const eventsApi = {
+  // Events only carry ids: refetch on "ready"/"resync" and on the events the
+  // page shows. Returns a function that closes the stream.
+  subscribe: (
+    onEvent: (type: string, data: Record<string, unknown>) => void,
+  ): (() => void) => {
+    let source: EventSource | null = null;
+    let closed = false;
+
+    const open = async () => {
+      // Tickets are short-lived, so every (re)connect gets a fresh one
+      const response = await api.post("/events/ticket/");
+      if (closed) return;
+      const ticket = encodeURIComponent(response.data.ticket);
+      source = new EventSource(`${API_URL}/events/stream/?ticket=${ticket}`);
+      STREAM_EVENTS.forEach((type) =>
+        source?.addEventListener(type, (event) =>
+          onEvent(type, JSON.parse((event as MessageEvent).data)),
+        ),
+      );
+      source.onerror = () => {
+        source?.close();
+        if (!closed) setTimeout(reconnect, 5000);
+      };
+    };
+    // Retries until the stream opens, including when the ticket request fails
+    const reconnect = () =>
+      open().catch(() => {
+        if (!closed) setTimeout(reconnect, 5000);
+      });
+
+    reconnect();
+    return () => {
+      closed = true;
+      source?.close();
+    };
+  },
+};
+
 export default api;
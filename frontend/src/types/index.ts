@@ -52,6 +52,7 @@ export interface FounderProfile {
   about_startup: string;
   is_connected?: boolean;
   connection_status?: "pending" | "accepted" | "declined" | null;
+  mutual_count?: number;
   created_at: string;
   updated_at: string;
 }
@@ -68,6 +69,7 @@ export interface MentorProfile {
   can_help_with_detail: Objective[];
   is_connected?: boolean;
   connection_status?: "pending" | "accepted" | "declined" | null;
+  mutual_count?: number;
   created_at: string;
   updated_at: string;
 }